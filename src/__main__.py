@@ -0,0 +1,8 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing the bot main function.
+from bot import main
+
+
+# Running the bot with 'python src', from the repository root.
+main()
@@ -6,26 +6,38 @@ from decouple import config
 # Importing telegram bot api, customer filters, and utilities.
 from telebot import TeleBot, custom_filters, util
 
-# Importing the channel updater function, to update channel content.
-from job_posts import channel_jobs_updater
-
 # Importing partial from functools
 from functools import partial
 
-# Importing the database cleaning function.
-from database import database_cleaner
+# Importing asyncio and threading to run the schedules on an event loop, in the asyncio runtime.
+import asyncio
+import threading
+
+# Importing os to exit right away if some work didn't stop within the shutdown.
+import os
+
+# Importing Callable for type hinting.
+from typing import Callable
+
+# Importing the database opener, the database cleaner runner, and the connections closer for the shutdown.
+from database import close_database, init_database, run_database_cleaner
 
 # Importing datetime & time for bot polling.
 from datetime import datetime
 import time
 
-# Importing chat handlers, filters and Scheduler.
+# Importing chat handlers, filters, Scheduler and the webhook server.
 from tgbot import (
     GroupMessageHandler,
+    InlineButtonHandler,
+    InlineModeHandler,
     IsOwner,
     NotSpammer,
     OwnerMessageHandler,
+    PrivateMessageHandler,
+    AsyncScheduler,
     Scheduler,
+    WebhookServer,
     MyChatMember,
     allow_chat,
     SpamMiddleware,
@@ -36,6 +48,20 @@ from tgbot.commands import group_commands as group_cmd
 from tgbot.commands import job_commands as job_cmd
 from tgbot.commands import owner_commands as owner_cmd
 
+# Importing the scheduler cores, to run the schedules in the asyncio runtime and stop them on shutdown.
+from tgbot.utilities.scheduler import async_scheduler_core, scheduler_core
+
+# Importing the bot lifecycle, to shut the bot down gracefully.
+from tgbot.utilities.lifecycle import lifecycle
+
+# Importing the channel mode settings, to schedule the channel posts, and the checkpointed posts resume.
+from job_posts.job_post_factory import (
+    CHANNEL_MODE,
+    CHANNEL_PREPARE_LEAD,
+    TRICKLE_INTERVAL,
+    resume_checkpointed_posts,
+)
+
 # ----- GLOBAL VARIABLES ----- #
 
 # Getting telegram bot token from .env file.
@@ -56,12 +82,56 @@ if config("POST_TIME_MINUTES") != '':
 else:
     POST_TIME_MINUTES: int = None
 
+# Getting the saved searches delivery interval in minutes (default = 6 hours).
+SUBSCRIPTIONS_INTERVAL = config("SUBSCRIPTIONS_INTERVAL", default=360, cast=int)
+
+# Getting the number of seconds a channel update can run before being cancelled (default = 2 hours).
+CHANNEL_JOB_TIMEOUT = config("CHANNEL_JOB_TIMEOUT", default=7200, cast=int)
+
+# Getting the number of seconds a saved searches delivery can run before being cancelled (default = 2 hours).
+SUBSCRIPTIONS_JOB_TIMEOUT = config("SUBSCRIPTIONS_JOB_TIMEOUT", default=7200, cast=int)
+
+# Getting what to do with the scheduled runs missed while the bot was down ('once' runs them once on start | 'skip').
+SCHEDULER_CATCH_UP = config("SCHEDULER_CATCH_UP", default="once").strip().lower()
+
+# Getting how late (in seconds) a missed run can be and still be caught up (default = 12 hours).
+SCHEDULER_CATCH_UP_GRACE = config("SCHEDULER_CATCH_UP_GRACE", default=43200, cast=int)
+
 # Getting days skipped.
 if config("DAYS_SKIPPED") != '':
     DAYS_SKIPPED: int = config("DAYS_SKIPPED")
 else:
     DAYS_SKIPPED = 1
 
+# Getting how the updates are received ('polling' | 'webhook', the webhook falls back to polling if it can't start).
+UPDATES_MODE = config("UPDATES_MODE", default="polling").strip().lower()
+
+# Getting the public https URL telegram posts the updates to, the webhook isn't registered if empty (eg. a second worker).
+WEBHOOK_URL = config("WEBHOOK_URL", default="")
+
+# Getting the secret token telegram sends with each update, required in the webhook mode.
+WEBHOOK_SECRET = config("WEBHOOK_SECRET", default="")
+
+# Getting the address, port and path the webhook server listens on.
+WEBHOOK_HOST = config("WEBHOOK_HOST", default="0.0.0.0")
+WEBHOOK_PORT = config("WEBHOOK_PORT", default=8443, cast=int)
+WEBHOOK_PATH = config("WEBHOOK_PATH", default="/webhook")
+
+# Getting the maximum number of received updates waiting for a worker, telegram retries the updates refused above it.
+WEBHOOK_QUEUE_SIZE = config("WEBHOOK_QUEUE_SIZE", default=1000, cast=int)
+
+# Getting the number of threads passing the received updates to the handlers.
+WEBHOOK_WORKERS = config("WEBHOOK_WORKERS", default=1, cast=int)
+
+# Getting the runtime of the scheduled jobs ('threads' | 'asyncio', the scrapes and sends run concurrently on an event loop).
+RUNTIME = config("RUNTIME", default="threads").strip().lower()
+
+# Getting the number of seconds the running jobs, searches and sends have to finish on shutdown (default = 1 minute).
+SHUTDOWN_TIMEOUT = config("SHUTDOWN_TIMEOUT", default=60, cast=int)
+
+# Getting the number of seconds the work still running past SHUTDOWN_TIMEOUT has to checkpoint once cancelled.
+SHUTDOWN_GRACE = config("SHUTDOWN_GRACE", default=10, cast=int)
+
 # ----- INITIATING OBJECTS ----- #
 
 
@@ -72,15 +142,26 @@ bot = TeleBot(BOT_TOKEN, num_threads=5, use_class_middlewares=True)
 owner_msg_handler = OwnerMessageHandler(bot)
 # Creating the group chat handler object and passing the bot instance.
 group_msg_handler = GroupMessageHandler(bot)
+# Creating the private chat handler object and passing the bot instance.
+private_msg_handler = PrivateMessageHandler(bot)
 # Creating the my chat member handler object and passing the bot instance.
 my_chat_member_handler = MyChatMember(bot)
+# Creating the inline buttons handler object and passing the bot instance.
+inline_button_handler = InlineButtonHandler(bot)
+# Creating the inline mode handler object and passing the bot instance.
+inline_mode_handler = InlineModeHandler(bot)
+
+# The webhook server receiving the updates, None while polling.
+webhook_server: WebhookServer = None
 
 
 # ----- REGISTERING JOB COMMAND HANDLERS  ----- #
 
 
 def job_commands(
-    owner_handler: OwnerMessageHandler, group_handler: GroupMessageHandler
+    owner_handler: OwnerMessageHandler,
+    group_handler: GroupMessageHandler,
+    private_handler: PrivateMessageHandler,
 ) -> None:
     """_summary_ : This function collects job commands.
 
@@ -90,6 +171,8 @@ def job_commands(
         _description_ : A messages handler object to register messages in private chat.
     group_handler : GroupMessageHandler
         _description_ A messages handler object to register messages in group chat.
+    private_handler : PrivateMessageHandler
+        _description_ A messages handler object to register messages in private chat with any user.
     """
     # /ljobs command in 'Private chat' for bot owner
     owner_handler.message_handler(func=job_cmd.ljobs, commands=["ljobs"])
@@ -101,6 +184,18 @@ def job_commands(
         group_admins=True,
     )
 
+    # /start command in 'Private chat' for any user, opened by the digest buttons to get a job's full post.
+    private_handler.message_handler(func=job_cmd.start, commands=["start"])
+
+    # Saved searches commands in 'Group chat', with admins filter, and in 'Private chat' for any user.
+    for command, func in (
+        ("subscribe", job_cmd.subscribe),
+        ("subscriptions", job_cmd.subscriptions),
+        ("unsubscribe", job_cmd.unsubscribe),
+    ):
+        group_handler.message_handler(func=func, commands=[command], group_admins=True)
+        private_handler.message_handler(func=func, commands=[command])
+
 
 # ----- REGISTERING OWNER COMMAND HANDLERS  ----- #
 
@@ -141,6 +236,24 @@ def owner_chat(chat_handler: OwnerMessageHandler) -> None:
         commands=["getgroup"],
     )
 
+    # /jobscache command in chat
+    chat_handler.message_handler(
+        func=owner_cmd.jobs_cache,
+        commands=["jobscache"],
+    )
+
+    # /runs command in chat
+    chat_handler.message_handler(
+        func=owner_cmd.runs,
+        commands=["runs"],
+    )
+
+    # /schedule command in chat
+    chat_handler.message_handler(
+        func=owner_cmd.schedule,
+        commands=["schedule"],
+    )
+
 
 # ----- REGISTERING GROUP COMMAND HANDLERS  ----- #
 
@@ -176,27 +289,164 @@ def my_chat_member(chat_handler: MyChatMember) -> None:
     chat_handler.my_chat_handler(func=allow_chat)
 
 
+# ----- REGISTERING INLINE BUTTON HANDLERS ----- #
+
+
+def inline_buttons(button_handler: InlineButtonHandler) -> None:
+    """_summary_ : This function collects the inline keyboard buttons handlers.
+
+    Parameters
+    ----------
+    button_handler : InlineButtonHandler
+        _description_ : An inline buttons handler to register the buttons callbacks.
+    """
+    # Handles the /ljobs result set Prev | Next buttons.
+    button_handler.callback_query_handler(func=job_cmd.ljobs_page, prefix="ljobs:")
+
+    # Handles the /ljobs search Cancel button.
+    button_handler.callback_query_handler(func=job_cmd.ljobs_cancel, prefix="ljobs_cancel:")
+
+
+# ----- REGISTERING INLINE MODE HANDLERS ----- #
+
+
+def inline_mode(mode_handler: InlineModeHandler) -> None:
+    """_summary_ : This function collects the inline mode handlers.
+
+    Parameters
+    ----------
+    mode_handler : InlineModeHandler
+        _description_ : An inline mode handler to register the inline queries callbacks.
+    """
+    # Handles '@bot job title location' in any chat, from the local jobs index.
+    mode_handler.inline_handler(func=job_cmd.ljobs_inline)
+
+
 # ----- SETTING SCHEDULES ----- #
 
 
+def create_schedules(scheduler: type[Scheduler], jobs: dict[str, Callable]) -> list[Scheduler]:
+    """_summary_ : This function creates the schedules of the channel and the saved searches.
+
+    Parameters
+    ----------
+    scheduler : type[Scheduler]
+        _description_ : Scheduler for the threads runtime, AsyncScheduler for the asyncio runtime.
+    jobs : dict[str, Callable]
+        _description_ : The 'channel', 'prepare', 'trickle' and 'subscriptions' jobs, sync or async as the scheduler.
+
+    Returns
+    -------
+    list[Scheduler]
+        _description_ : The schedules, to run.
+    """
+    schedules = []
+
+    if CHANNEL_MODE == "trickle":
+        # Setting the channel trickle scheduler
+        ## Every TRICKLE_INTERVAL minutes, the jobs posted in the last TRICKLE_WINDOW seconds the channel didn't get are posted.
+        trickle_schedule = scheduler(
+            minutes=TRICKLE_INTERVAL,
+            name="trickle",
+            timeout=CHANNEL_JOB_TIMEOUT,
+            catch_up=SCHEDULER_CATCH_UP,
+            catch_up_grace=SCHEDULER_CATCH_UP_GRACE,
+        )
+        trickle_schedule.set_schedule(jobs["trickle"])
+        schedules.append(trickle_schedule)
+    else:
+        # Setting the channel_updater scheduler
+        ## Every 24 hours
+        ## A single run at a time, cancelled after CHANNEL_JOB_TIMEOUT, and a post missed while the bot was down is caught up.
+        channel_schedule = scheduler(
+            days_skipped=DAYS_SKIPPED,
+            hour=POST_TIME_HOUR,
+            minutes=POST_TIME_MINUTES,
+            name="channel",
+            timeout=CHANNEL_JOB_TIMEOUT,
+            catch_up=SCHEDULER_CATCH_UP,
+            catch_up_grace=SCHEDULER_CATCH_UP_GRACE,
+        )
+        channel_schedule.set_schedule(jobs["channel"])
+        schedules.append(channel_schedule)
+
+        # Setting the channel prepare phase scheduler
+        ## CHANNEL_PREPARE_LEAD seconds before each post, the jobs are scrapped and rendered so the post only sends them.
+        ## A prepare missed while the bot was down is only caught up within the lead, later the post scraps by itself.
+        if CHANNEL_PREPARE_LEAD and not (POST_TIME_MINUTES and CHANNEL_PREPARE_LEAD >= int(POST_TIME_MINUTES) * 60):
+            prepare_schedule = scheduler(
+                days_skipped=DAYS_SKIPPED,
+                hour=POST_TIME_HOUR,
+                minutes=POST_TIME_MINUTES,
+                name="prepare",
+                timeout=CHANNEL_JOB_TIMEOUT,
+                catch_up=SCHEDULER_CATCH_UP,
+                catch_up_grace=CHANNEL_PREPARE_LEAD,
+                lead=CHANNEL_PREPARE_LEAD,
+            )
+            prepare_schedule.set_schedule(jobs["prepare"])
+            schedules.append(prepare_schedule)
+
+    # Setting the saved searches scheduler
+    ## Every SUBSCRIPTIONS_INTERVAL minutes, each distinct saved search is scrapped once for all its subscribers.
+    subscriptions_schedule = scheduler(
+        minutes=SUBSCRIPTIONS_INTERVAL,
+        name="subscriptions",
+        timeout=SUBSCRIPTIONS_JOB_TIMEOUT,
+        catch_up=SCHEDULER_CATCH_UP,
+        catch_up_grace=SCHEDULER_CATCH_UP_GRACE,
+    )
+    subscriptions_schedule.set_schedule(jobs["subscriptions"])
+    schedules.append(subscriptions_schedule)
+
+    return schedules
+
+
 def schedule() -> None:
     """This function collects the created schedules."""
-    # Setting the channel_updater scheduler
-    ## Every 24 hours
-    channel_schedule = Scheduler(days_skipped=DAYS_SKIPPED, hour=POST_TIME_HOUR, minutes=POST_TIME_MINUTES)
     ## Using 'partial' to pass the function with arguments without calling it.
-    channel_schedule.set_schedule(partial(channel_jobs_updater, bot))
+    ## The updates run on the search queue's priority lane, sharing the scrapping capacity with /ljobs.
+    schedules = create_schedules(
+        Scheduler,
+        {
+            "channel": partial(job_cmd.queued_channel_jobs_updater, bot),
+            "prepare": partial(job_cmd.queued_channel_jobs_preparer, bot),
+            "trickle": partial(job_cmd.queued_channel_jobs_trickle, bot),
+            "subscriptions": partial(job_cmd.queued_subscriptions_updater, bot),
+        },
+    )
 
-    # Setting the database_cleaner scheduler
-    ## Every 60 minutes (an hour).
-    database_cleaner_schedule = Scheduler(minutes=60)
-    # Setting the callable function to the database_cleaner.
-    database_cleaner_schedule.set_schedule(database_cleaner)
+    # Running the schedules.
+    for job_schedule in schedules:
+        job_schedule.run()
+
+
+async def async_schedule() -> None:
+    """This function runs the created schedules on the event loop, in the asyncio runtime."""
+    # Importing the async jobs here, so the threads runtime doesn't need aiohttp.
+    from telebot.async_telebot import AsyncTeleBot
+    from job_posts import async_factory
+
+    # The async bot sending the scheduled posts, the updates are still received by the bot.
+    async_bot = AsyncTeleBot(BOT_TOKEN)
+
+    core = async_scheduler_core.start()
+    schedules = create_schedules(
+        AsyncScheduler,
+        {
+            "channel": partial(async_factory.channel_jobs_updater_async, async_bot),
+            "prepare": partial(async_factory.channel_jobs_preparer_async, async_bot),
+            "trickle": partial(async_factory.channel_jobs_trickle_async, async_bot),
+            "subscriptions": partial(async_factory.subscriptions_updater_async, async_bot),
+        },
+    )
 
-    # Running the channel_updater schedule.
-    channel_schedule.run()
-    # Running the database_cleaner_schedule schedule.
-    database_cleaner_schedule.run()
+    # Running the schedules, their catch up reads the database on a worker thread.
+    for job_schedule in schedules:
+        await asyncio.to_thread(job_schedule.run)
+    # Returning once the core is stopped and its running jobs finished.
+    await core
+    await async_bot.close_session()
 
 
 # ----- SETTING CHAT HANDLERS ----- #
@@ -206,7 +456,7 @@ def chat_handlers() -> None:
     """This function collects all chat handlers."""
 
     # Adding the job commands chat handler for private | group chat.
-    job_commands(owner_msg_handler, group_msg_handler)
+    job_commands(owner_msg_handler, group_msg_handler, private_msg_handler)
 
     # Adding owner chat handlers.
     owner_chat(owner_msg_handler)
@@ -217,6 +467,12 @@ def chat_handlers() -> None:
     # Adding my chat member handler..
     my_chat_member(my_chat_member_handler)
 
+    # Adding inline buttons handlers.
+    inline_buttons(inline_button_handler)
+
+    # Adding inline mode handlers.
+    inline_mode(inline_mode_handler)
+
 
 # ----- SETTING CHAT FILTERS ----- #
 
@@ -236,32 +492,151 @@ def chat_filters() -> None:
 
 
 def middlewares() -> None:
-    # Setting up the spam middleware.
-    bot.setup_middleware(SpamMiddleware(bot=bot, limit=15))
+    # Setting up the spam middleware, the commands limits are set in the .env file.
+    bot.setup_middleware(SpamMiddleware(bot=bot))
+
+
+# ----- SETTING SHUTDOWN HOOKS ----- #
+
+
+def stop_updates() -> None:
+    """Stops receiving the updates, by long polling or on the webhook server."""
+    bot.stop_polling()
+    if webhook_server:
+        webhook_server.stop()
+
+
+def drain_handlers(deadline: float) -> bool:
+    """Waits for the received updates to be processed, the webhook's queued ones first, then the handler threads."""
+    if webhook_server and not webhook_server.drain(deadline):
+        return False
+
+    # Waiting for the queued updates to be taken, the stopped workers would leave them unprocessed.
+    pool = bot.worker_pool
+    while not pool.tasks.empty():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.1)
+
+    # Releasing the workers waiting after a handler raised, they wouldn't stop otherwise.
+    pool.clear_exceptions()
+    for worker in pool.workers:
+        worker.clear_exceptions()
+
+    # Stopping the workers, each one finishes the update it's processing.
+    closing = threading.Thread(target=pool.close, name="handlers-drain", daemon=True)
+    closing.start()
+    closing.join(max(0, deadline - time.monotonic()))
+    return not closing.is_alive()
+
+
+def shutdown_hooks() -> None:
+    """This function registers the shutdown steps, run in order on SIGTERM/SIGINT."""
+    # Stopping the intake: no more updates, scheduled runs or searches, the running ones go on.
+    lifecycle.on_shutdown("intake", "updates", lambda deadline: stop_updates())
+    lifecycle.on_shutdown("intake", "scheduler", lambda deadline: scheduler_core.stop())
+    lifecycle.on_shutdown("intake", "async scheduler", lambda deadline: async_scheduler_core.stop())
+    lifecycle.on_shutdown("intake", "search queue", lambda deadline: job_cmd.search_queue.close())
+
+    # Letting the handlers, the scheduled runs and the searches finish, and their sends flush, until the deadline.
+    lifecycle.on_shutdown("drain", "handlers", drain_handlers)
+    lifecycle.on_shutdown("drain", "scheduler", Scheduler.drain)
+    lifecycle.on_shutdown("drain", "search queue", job_cmd.search_queue.drain)
+
+    # Cancelling what's left, the scrapes stop and the senders checkpoint the posts they didn't send.
+    lifecycle.on_shutdown("abort", "scheduler", Scheduler.abort)
+    lifecycle.on_shutdown("abort", "search queue", job_cmd.search_queue.abort)
+
+    # Checkpointing the database write-ahead log and closing the connections.
+    lifecycle.on_shutdown("close", "database", lambda deadline: close_database())
+
+
+# ----- RECEIVING UPDATES ----- #
+
+
+def webhook() -> None:
+    """This function receives the updates on the webhook server, and blocks while it runs."""
+    global webhook_server
+    server = WebhookServer(
+        bot,
+        secret_token=WEBHOOK_SECRET,
+        host=WEBHOOK_HOST,
+        port=WEBHOOK_PORT,
+        path=WEBHOOK_PATH,
+        queue_size=WEBHOOK_QUEUE_SIZE,
+        workers=WEBHOOK_WORKERS,
+    )
+    server.start()
+    # The shutdown stops the server, the received updates are still processed.
+    webhook_server = server
+
+    # Registering the webhook, only one of the workers behind the endpoint needs to.
+    if WEBHOOK_URL:
+        try:
+            bot.set_webhook(url=WEBHOOK_URL, secret_token=WEBHOOK_SECRET, allowed_updates=util.update_types)
+        except Exception:
+            # Not receiving the updates twice once the polling fallback starts.
+            webhook_server = None
+            server.stop()
+            raise
+
+    server.wait()
+
+
+def polling() -> None:
+    """This function receives the updates with long polling, reconnecting on errors, until the bot is shut down."""
+    # Telegram refuses getUpdates while a webhook is set, only removing the one this worker registered (or none is wanted),
+    # a worker without WEBHOOK_URL falling back would stop the webhook the other workers receive the updates from.
+    if UPDATES_MODE == "polling" or WEBHOOK_URL:
+        bot.remove_webhook()
+    while not lifecycle.stopping.is_set():
+        try:
+            bot.polling(none_stop=True, timeout=180, allowed_updates=util.update_types)
+        except Exception as e:
+            print(datetime.now(), e)
+            time.sleep(5)
+            continue
 
 
 # ----- MAIN FUNCTION CODE ----- #
 
 # main function.
 def main() -> None:
-    """This function runs all collector functions."""
-    # Adding schedule
-    schedule()
+    """This function runs all collector functions, until the bot is shut down."""
+    # Opening and migrating the database, importing the bot doesn't touch it.
+    init_database()
+    # Shutting down gracefully on SIGTERM/SIGINT, the running work gets SHUTDOWN_TIMEOUT seconds to finish.
+    shutdown_hooks()
+    lifecycle.install_signal_handlers(timeout=SHUTDOWN_TIMEOUT, grace=SHUTDOWN_GRACE)
+    # Sending the posts the last shutdown checkpointed.
+    threading.Thread(target=resume_checkpointed_posts, args=(bot,), name="outbox", daemon=True).start()
+    # Adding schedule, on the event loop thread in the asyncio runtime.
+    if RUNTIME == "asyncio":
+        threading.Thread(target=asyncio.run, args=(async_schedule(),), name="asyncio-runtime", daemon=True).start()
+    else:
+        schedule()
+    # Running the database cleaner, it wakes up right when the next temporary ban expires instead of polling.
+    run_database_cleaner()
     # Adding chat handlers.
     chat_handlers()
     # Adding filters
     chat_filters()
     # Setting up middlewares.
     middlewares()
-    # Running the bot.
-    while True:
+    # Running the bot, on the webhook server if enabled.
+    if UPDATES_MODE == "webhook":
         try:
-            bot.polling(none_stop=True, timeout=180, allowed_updates=util.update_types)
+            webhook()
         except Exception as e:
-            print(datetime.now(), e)
-            time.sleep(5)
-            continue
+            print(datetime.now(), f"The webhook failed, falling back to polling: {e}")
+    if not lifecycle.stopping.is_set():
+        polling()
+
+    # Waiting for the shutdown, and exiting right away if some work didn't stop, it would block the exit.
+    if not lifecycle.wait():
+        os._exit(1)
 
 
-# Running main.
-main()
+# Running main, when the bot is run rather than imported (eg. by the startup benchmark).
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,39 @@ from .db_commands import (
     AddGroupToAllowListCommand,
     DeleteGroupCommand,
     DeleteUserCommand,
+    DeleteExpiredUsersCommand,
+    WaitForBanExpiryCommand,
     GetGroupCommand,
     GetUserCommand,
     AddUserCommand,
+    IsAllowedGroupCommand,
+    IsBlockedUserCommand,
+    AddJobsCommand,
+    GetJobCommand,
+    SearchJobsCommand,
+    GetSearchCoverageCommand,
+    InlineSearchJobsCommand,
+    AddSubscriptionCommand,
+    GetSubscriptionsCommand,
+    DeleteSubscriptionCommand,
+    DeliverJobsCommand,
+    ConfirmDeliveriesCommand,
+    GetDeliveredJobsCommand,
+    AddUsersCommand,
+    DeleteUsersCommand,
+    AddGroupsToAllowListCommand,
+    DeleteGroupsCommand,
+    AddPipelineRunCommand,
+    GetPipelineRunsCommand,
+    RegisterScheduledJobCommand,
+    RecordScheduledRunCommand,
+    CheckpointPostsCommand,
+    GetCheckpointedPostsCommand,
+    DeleteCheckpointedPostCommand,
+    transaction,
+    close_database,
+    init_database,
 )
-from .db_cleaner import database_cleaner
+from .db_cleaner import database_cleaner, run_database_cleaner
+from .migrations import migrate, schema_version
+from .subscriptions_persistence import SubscriptionLimitReached
@@ -0,0 +1,113 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing argparse to read the benchmark settings from the command line.
+import argparse
+
+# Importing os & tempfile to run the benchmark on a throwaway database.
+import os
+import tempfile
+
+# Importing random to pick the statements and the looked up rows.
+import random
+
+# Importing sqlite3 for the shared connection baseline.
+import sqlite3
+
+# Importing threading and time to run and measure the concurrent workers.
+import threading
+import time
+
+# Importing the database manger to benchmark it.
+from database.db_manger import DatabaseManger
+
+
+class SharedConnection:
+    """The baseline: a single connection shared by all the threads, as the database manger used to do."""
+
+    def __init__(self, database_filename: str) -> None:
+        self.connection = sqlite3.connect(database_filename, check_same_thread=False)
+
+    def query(self, statement: str, values: tuple = None) -> sqlite3.Cursor:
+        with self.connection:
+            cursor = self.connection.cursor()
+            cursor.execute(statement, values or [])
+            return cursor
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def worker(db, rows: int, write_ratio: float, deadline: float, results: list) -> None:
+    """Runs lookups and upserts until the deadline, and appends its (operations, errors) counts to the results."""
+    operations = errors = 0
+    while time.perf_counter() < deadline:
+        user_id = str(random.randrange(rows))
+        try:
+            if random.random() < write_ratio:
+                db.query(
+                    "INSERT INTO bot_users (user_id, block_type, date_added) VALUES (?, 'temp', 'now') "
+                    "ON CONFLICT(user_id) DO UPDATE SET date_added = excluded.date_added",
+                    (user_id,),
+                )
+            else:
+                db.query("SELECT * FROM bot_users WHERE user_id = ?", (user_id,)).fetchall()
+            operations += 1
+        except sqlite3.Error:
+            errors += 1
+    results.append((operations, errors))
+
+
+def run(name: str, db, threads: int, seconds: float, rows: int, write_ratio: float) -> None:
+    """Runs the workers against the database and prints the throughput."""
+    results = []
+    deadline = time.perf_counter() + seconds
+    workers = [
+        threading.Thread(target=worker, args=(db, rows, write_ratio, deadline, results))
+        for _ in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    operations = sum(result[0] for result in results)
+    errors = sum(result[1] for result in results)
+    print(f"{name:<20} {threads:>7} {operations / seconds:>12,.0f} {errors:>8}")
+
+
+def main() -> None:
+    """Benchmarks the shared connection baseline against the database manger, under the same concurrent load."""
+    parser = argparse.ArgumentParser(description="SQLite access layer contention benchmark.")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_filename = os.path.join(directory, "benchmark.sqlite")
+
+        # Creating and filling the benchmarked table.
+        setup = DatabaseManger(database_filename)
+        setup.create_table(
+            "bot_users",
+            {"user_id": "text primary key not null", "block_type": "text not null", "date_added": "text not null"},
+        )
+        with setup.connection:
+            setup.connection.executemany(
+                "INSERT INTO bot_users VALUES (?, 'temp', 'now')", ((str(row),) for row in range(args.rows))
+            )
+        setup.close()
+
+        print(f"{'access layer':<20} {'threads':>7} {'ops/s':>12} {'errors':>8}")
+        for threads in args.threads:
+            for name, db in (
+                ("shared connection", SharedConnection(database_filename)),
+                ("database manger", DatabaseManger(database_filename)),
+            ):
+                run(name, db, threads, args.seconds, args.rows, args.write_ratio)
+                db.close()
+
+
+if __name__ == "__main__":
+    main()
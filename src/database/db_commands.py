@@ -1,13 +1,121 @@
 # ----- IMPORTING REQUIRED MODULES ----- #
 
-# Importing protocol for commands interface creation
-from typing import Protocol
+# Importing threading to create each persistence layer once, whatever the thread using it first.
+import threading
+
+# Importing protocol for commands interface creation, and Any & Callable for type hinting
+from typing import Any, Callable, Protocol
 
 # Importing the users database persistence layer implementation
 from database.persistence import UsersDatabase
 
-# Creating user database as an implementation of the IPersistanceLayer
-persistence = UsersDatabase()
+# Importing the jobs database persistence layer implementation
+from database.jobs_persistence import JobsDatabase
+
+# Importing the subscriptions database persistence layer implementation
+from database.subscriptions_persistence import SubscriptionsDatabase
+
+# Importing the pipeline runs database persistence layer implementation
+from database.runs_persistence import RunsDatabase
+
+# Importing the scheduler database persistence layer implementation
+from database.scheduler_persistence import SchedulerDatabase
+
+# Importing the outbox database persistence layer implementation
+from database.outbox_persistence import OutboxDatabase
+
+# Importing the database manger to close the connections on shutdown
+from database.db_manger import DatabaseManger
+
+
+class LazyLayer:
+    """_summary_ : This class creates a persistence layer on its first use, so importing the commands doesn't open the database.
+
+    Creating a layer opens the bot database and migrates it, init_database() creates every layer up front on start.
+    """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        """_summary_ : This method stores the persistence layer factory.
+
+        Parameters
+        ----------
+        factory : Callable[[], Any]
+            _description_ : Creates the persistence layer (eg. the layer class).
+        """
+        self._factory = factory
+        self._layer = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """This method returns the persistence layer, created on its first use."""
+        if self._layer is None:
+            with self._lock:
+                if self._layer is None:
+                    self._layer = self._factory()
+        return self._layer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+# Creating user database as an implementation of the IPersistanceLayer, on first use
+persistence = LazyLayer(UsersDatabase)
+
+# Creating the jobs database holding the scrapped jobs full text index, on first use
+jobs_persistence = LazyLayer(JobsDatabase)
+
+# Creating the subscriptions database holding the chats saved searches, on first use
+subscriptions_persistence = LazyLayer(SubscriptionsDatabase)
+
+# Creating the pipeline runs database holding the runs history, on first use
+runs_persistence = LazyLayer(RunsDatabase)
+
+# Creating the scheduler database holding the scheduled jobs last runs, on first use
+scheduler_persistence = LazyLayer(SchedulerDatabase)
+
+# Creating the outbox database holding the posts interrupted by a shutdown, on first use
+outbox_persistence = LazyLayer(OutboxDatabase)
+
+
+def init_database() -> None:
+    """_summary_ : This function opens and migrates the bot database, it's the bot's first step on start.
+
+    The persistence layers are otherwise created on their first use, so a database error shows on start rather than
+    on the first command.
+    """
+    for layer in (
+        persistence,
+        jobs_persistence,
+        subscriptions_persistence,
+        runs_persistence,
+        scheduler_persistence,
+        outbox_persistence,
+    ):
+        layer.get()
+
+
+def transaction():
+    """_summary_ : This function returns a scope running the commands executed in it, by the current thread, in one transaction.
+
+    All the persistence layers share the bot database manager, so any commands can be grouped, they're committed
+    together when the scope exits, or rolled back if it raises.
+
+    Example
+    -------
+        >>> with transaction():
+        ...     DeleteGroupsCommand(group_ids=["-100", "-200"]).execute()
+        ...     AddUsersCommand(user_ids=["42"], block_type="perm").execute()
+    """
+    return persistence.db.transaction()
+
+
+def close_database() -> None:
+    """_summary_ : This function checkpoints and closes the bot database connections, it's the shutdown's last step.
+
+    A thread using the database afterwards opens a new connection, so a late writer doesn't fail.
+    """
+    DatabaseManger.close_all()
+
 
 # Defining the command interface
 class ICommand(Protocol):
@@ -41,6 +149,28 @@ class AddUserCommand(ICommand):
         persistence.add_user(self.user_id, self.block_type)
 
 
+class AddUsersCommand(ICommand):
+    """The command adds many users to the database, with a single 'INSERT INTO' statement and commit."""
+
+    def __init__(self, *, user_ids: list[str], block_type: str) -> None:
+        """_summary_ : This method gets the data to initiate the command to add users to the database.
+
+        Parameters
+        ----------
+        user_ids : list[str]
+            _description_ : Users ids.
+        block_type : str
+            _description_ : Users block type (temp | perm).
+        """
+        self.user_ids = user_ids
+        self.block_type = (block_type.lower()).strip()
+
+    def execute(self) -> None:
+        """This method executes the 'INSERT INTO' statement."""
+        # Calling the add_users method with the users ids and their block type.
+        persistence.add_users(self.user_ids, self.block_type)
+
+
 class GetUserCommand(ICommand):
     """This command sends a 'SELECT' query to the database returning with users in it."""
 
@@ -72,6 +202,25 @@ class GetUserCommand(ICommand):
         )
 
 
+class IsBlockedUserCommand(ICommand):
+    """This command checks if a user is in the block list, from the in-memory snapshot with no SQL."""
+
+    def __init__(self, *, user_id: str) -> None:
+        """_summary_ : This method gets the data to initiate the command to check a user.
+
+        Parameters
+        ----------
+        user_id : str
+            _description_ : User's user_id.
+        """
+        self.user_id = user_id
+
+    def execute(self) -> bool:
+        """This method checks the blocked users snapshot."""
+        # Calling the is_blocked method with the user's id.
+        return persistence.is_blocked(self.user_id)
+
+
 class EditUserCommand(ICommand):
     """This command edits user's record in the database"""
 
@@ -115,6 +264,43 @@ class DeleteUserCommand(ICommand):
         persistence.delete(self.user_id)
 
 
+class DeleteUsersCommand(ICommand):
+    """This command deletes many users records from the database, with a single 'DELETE' statement and commit."""
+
+    def __init__(self, *, user_ids: list[str]) -> None:
+        """_summary_ : This method gets the data to initiate the command to delete users from database.
+
+        Parameters
+        ----------
+        user_ids : list[str]
+            _description_ : Users ids.
+        """
+        self.user_ids = user_ids
+
+    def execute(self):
+        """This method deletes the users from the database."""
+        # Calling the delete_users method with the users ids.
+        persistence.delete_users(self.user_ids)
+
+
+class DeleteExpiredUsersCommand(ICommand):
+    """This command deletes the expired temporary bans from the database, with a single 'DELETE' statement."""
+
+    def execute(self) -> int:
+        """This method deletes the expired bans, and returns the next ban expiry unix time (None if no temporary bans)."""
+        # Calling the delete_expired method.
+        return persistence.delete_expired()
+
+
+class WaitForBanExpiryCommand(ICommand):
+    """This command blocks until the next temporary ban expires."""
+
+    def execute(self) -> None:
+        """This method waits for the next ban expiry, a new earlier ban shortens the wait."""
+        # Calling the wait_for_expiry method.
+        persistence.wait_for_expiry()
+
+
 class AddGroupToAllowListCommand(ICommand):
     """This command adds a group to the allow_list"""
 
@@ -134,6 +320,25 @@ class AddGroupToAllowListCommand(ICommand):
         persistence.add_to_allow_list(self.group_id)
 
 
+class AddGroupsToAllowListCommand(ICommand):
+    """This command adds many groups to the allow_list, with a single 'INSERT INTO' statement and commit."""
+
+    def __init__(self, *, group_ids: list[str]) -> None:
+        """_summary_ : This method gets the data to initiate the command to add groups to the bot's allow list.
+
+        Parameters
+        ----------
+        group_ids : list[str]
+            _description_ : The groups ids to allow.
+        """
+        self.group_ids = group_ids
+
+    def execute(self) -> None:
+        """This method adds the groups"""
+        # Calling the add_to_allow_list_many with the groups chat ids.
+        persistence.add_to_allow_list_many(self.group_ids)
+
+
 class GetGroupCommand(ICommand):
     """This command sends a 'SELECT' query to the allow_list database returning with group in it."""
 
@@ -155,7 +360,26 @@ class GetGroupCommand(ICommand):
     def execute(self) -> list:
         """This method executes the 'SELECT' statement."""
         # Calling the get_group method with the group's chat_id.
-        return persistence.get_group(group_id=self.group_id)
+        return persistence.get_group(group_id=self.group_id, order_by=self.order_by)
+
+
+class IsAllowedGroupCommand(ICommand):
+    """This command checks if a group is in the allow list, from the in-memory snapshot with no SQL."""
+
+    def __init__(self, *, group_id: str) -> None:
+        """_summary_ : This method gets the data to initiate the command to check a group.
+
+        Parameters
+        ----------
+        group_id : str
+            _description_ : group_id.
+        """
+        self.group_id = group_id
+
+    def execute(self) -> bool:
+        """This method checks the allowed groups snapshot."""
+        # Calling the is_allowed_group method with the group's chat_id.
+        return persistence.is_allowed_group(self.group_id)
 
 
 class DeleteGroupCommand(ICommand):
@@ -175,3 +399,441 @@ class DeleteGroupCommand(ICommand):
         """This method deletes the user from the database using the provided criteria."""
         # Calling the delete_group method with the group's chat_id.
         persistence.delete_group(self.group_id)
+
+
+class DeleteGroupsCommand(ICommand):
+    """This command deletes many groups from the allow list, with a single 'DELETE' statement and commit."""
+
+    def __init__(self, *, group_ids: list[str]) -> None:
+        """_summary_ : This method gets the data to initiate the command to delete groups from database.
+
+        Parameters
+        ----------
+        group_ids : list[str]
+            _description_ : Groups ids.
+        """
+        self.group_ids = group_ids
+
+    def execute(self):
+        """This method deletes the groups from the database."""
+        # Calling the delete_groups method with the groups chat ids.
+        persistence.delete_groups(self.group_ids)
+
+
+class AddJobsCommand(ICommand):
+    """This command stores the scrapped jobs in the jobs index, and records the search that scrapped them."""
+
+    def __init__(self, *, jobs: list[dict], query_key: str = None, max_age: float = None) -> None:
+        """_summary_ : This method gets the data to initiate the command to add jobs to the database.
+
+        Parameters
+        ----------
+        jobs : list[dict]
+            _description_ : The jobs formatted by the scrapper.
+        query_key : str, optional
+            _description_, by default None : The key of the search that scrapped the jobs.
+        max_age : float, optional
+            _description_, by default None : The number of seconds the jobs are kept after their last scrape.
+        """
+        self.jobs = jobs
+        self.query_key = query_key
+        self.max_age = max_age
+
+    def execute(self) -> None:
+        """This method executes the 'INSERT ... ON CONFLICT' and the aging out 'DELETE' statements."""
+        # Calling the add_jobs method with the jobs, the search key and the jobs retention.
+        jobs_persistence.add_jobs(self.jobs, query_key=self.query_key, max_age=self.max_age)
+
+
+class GetJobCommand(ICommand):
+    """This command sends a 'SELECT' query to the jobs index returning with a job by its id."""
+
+    def __init__(self, *, job_id: str) -> None:
+        """_summary_ : This method gets the data to initiate the command to get a stored job.
+
+        Parameters
+        ----------
+        job_id : str
+            _description_ : The job id, its LinkedIn job id.
+        """
+        self.job_id = job_id
+
+    def execute(self) -> dict:
+        """This method executes the 'SELECT' statement, returns None if the job isn't stored."""
+        # Calling the get_job method with the job id.
+        return jobs_persistence.get_job(self.job_id)
+
+
+class SearchJobsCommand(ICommand):
+    """This command sends a full text 'SELECT' query to the jobs index returning with the matching jobs."""
+
+    def __init__(
+        self, *, job_title: str, locations: list[str], posted_after: float, limit: int = 100
+    ) -> None:
+        """_summary_ : This method gets the data to initiate the command to search the jobs index.
+
+        Parameters
+        ----------
+        job_title : str
+            _description_ : The job title to search for.
+        locations : list[str]
+            _description_ : The locations to search in, empty for any location.
+        posted_after : float
+            _description_ : The unix timestamp the jobs must be posted after.
+        limit : int, optional
+            _description_, by default 100 : The maximum number of jobs to return.
+        """
+        self.job_title = job_title
+        self.locations = locations
+        self.posted_after = posted_after
+        self.limit = limit
+
+    def execute(self) -> list[dict]:
+        """This method executes the full text 'SELECT' statement."""
+        # Calling the search_jobs method with the search criteria.
+        return jobs_persistence.search_jobs(
+            self.job_title, self.locations, self.posted_after, limit=self.limit
+        )
+
+
+class InlineSearchJobsCommand(ICommand):
+    """This command sends a deadline bound prefix 'SELECT' query to the jobs index, for the inline mode."""
+
+    def __init__(
+        self, *, text: str, posted_after: float, limit: int = 100, deadline: float = 0.08
+    ) -> None:
+        """_summary_ : This method gets the data to initiate the command to search the jobs index as the user types.
+
+        Parameters
+        ----------
+        text : str
+            _description_ : The typed text, each word is matched as a prefix.
+        posted_after : float
+            _description_ : The unix timestamp the jobs must be posted after.
+        limit : int, optional
+            _description_, by default 100 : The maximum number of jobs to return.
+        deadline : float, optional
+            _description_, by default 0.08 : The number of seconds the search can take.
+        """
+        self.text = text
+        self.posted_after = posted_after
+        self.limit = limit
+        self.deadline = deadline
+
+    def execute(self) -> list[dict]:
+        """This method executes the prefix 'SELECT' statement, returns None if the deadline was hit."""
+        # Calling the inline_search method with the search criteria.
+        return jobs_persistence.inline_search(
+            self.text, self.posted_after, limit=self.limit, deadline=self.deadline
+        )
+
+
+class GetSearchCoverageCommand(ICommand):
+    """This command returns when a search was last scrapped into the jobs index."""
+
+    def __init__(self, *, query_key: str) -> None:
+        """_summary_ : This method gets the data to initiate the command to get a search coverage.
+
+        Parameters
+        ----------
+        query_key : str
+            _description_ : The key of the search.
+        """
+        self.query_key = query_key
+
+    def execute(self) -> float:
+        """This method executes the 'SELECT' statement."""
+        # Calling the get_coverage method with the search key.
+        return jobs_persistence.get_coverage(self.query_key)
+
+
+class AddSubscriptionCommand(ICommand):
+    """This command saves a search for a chat, using the INSERT INTO SQL statement."""
+
+    def __init__(
+        self, *, chat_id: str, job_title: str, location: str, max_per_chat: int = None, max_searches: int = None
+    ) -> None:
+        """_summary_ : This method gets the data to initiate the command to add a saved search to the database.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The subscribed chat id.
+        job_title : str
+            _description_ : The job title to search for.
+        location : str
+            _description_ : The location to search in.
+        max_per_chat : int, optional
+            _description_, by default None : The number of searches a chat can save, no limit if not provided.
+        max_searches : int, optional
+            _description_, by default None : The number of distinct searches all the chats can save, no limit if not provided.
+        """
+        self.chat_id = str(chat_id)
+        # Lowering the search and collapsing its spaces, so the same searches are deduped.
+        self.job_title = " ".join(job_title.lower().split())
+        self.location = " ".join(location.lower().split())
+        self.max_per_chat = max_per_chat
+        self.max_searches = max_searches
+
+    def execute(self) -> None:
+        """This method executes the 'INSERT INTO' statement, raising SubscriptionLimitReached over the limits."""
+        # Calling the add_subscription method with the chat id, the normalized search and the limits.
+        subscriptions_persistence.add_subscription(
+            self.chat_id, self.job_title, self.location, max_per_chat=self.max_per_chat, max_searches=self.max_searches
+        )
+
+
+class GetSubscriptionsCommand(ICommand):
+    """This command sends a 'SELECT' query to the subscriptions table returning with the saved searches."""
+
+    def __init__(self, *, chat_id: str = None) -> None:
+        """_summary_ : This method gets the data to initiate the command to get the saved searches.
+
+        Parameters
+        ----------
+        chat_id : str, optional
+            _description_, by default None : The chat to get the saved searches of, all the chats if not provided.
+        """
+        self.chat_id = str(chat_id) if chat_id else None
+
+    def execute(self) -> list:
+        """This method executes the 'SELECT' statement."""
+        # Calling the get_subscriptions method with the chat id.
+        return subscriptions_persistence.get_subscriptions(self.chat_id)
+
+
+class DeleteSubscriptionCommand(ICommand):
+    """This command deletes a chat's saved search from the database."""
+
+    def __init__(self, *, chat_id: str, subscription_id: int) -> None:
+        """_summary_ : This method gets the data to initiate the command to delete a saved search.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The subscribed chat id.
+        subscription_id : int
+            _description_ : The saved search id.
+        """
+        self.chat_id = str(chat_id)
+        self.subscription_id = subscription_id
+
+    def execute(self) -> bool:
+        """This method deletes the saved search from the database, returning False if the chat has no such saved search."""
+        # Calling the delete_subscription method with the chat id and the saved search id.
+        return subscriptions_persistence.delete_subscription(self.chat_id, self.subscription_id)
+
+
+class DeliverJobsCommand(ICommand):
+    """This command claims the jobs a chat didn't get yet, returning with them, ConfirmDeliveriesCommand settles the claims."""
+
+    def __init__(self, *, chat_id: str, jobs: list[dict]) -> None:
+        """_summary_ : This method gets the data to initiate the command to record the delivered jobs.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The subscribed chat id.
+        jobs : list[dict]
+            _description_ : The jobs matching the chat's saved searches.
+        """
+        self.chat_id = str(chat_id)
+        self.jobs = jobs
+
+    def execute(self) -> list[dict]:
+        """This method executes the 'INSERT OR IGNORE' statements."""
+        # Calling the deliver_jobs method with the chat id and the jobs.
+        return subscriptions_persistence.deliver_jobs(self.chat_id, self.jobs)
+
+
+class ConfirmDeliveriesCommand(ICommand):
+    """This command records the claimed jobs that were sent to a chat as delivered, and releases the others."""
+
+    def __init__(self, *, chat_id: str, claimed_links: list[str], sent_links: list[str]) -> None:
+        """_summary_ : This method gets the data to initiate the command to confirm the delivered jobs.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The subscribed chat id.
+        claimed_links : list[str]
+            _description_ : The apply links of the jobs DeliverJobsCommand claimed.
+        sent_links : list[str]
+            _description_ : The apply links of the claimed jobs that were sent.
+        """
+        self.chat_id = str(chat_id)
+        self.claimed_links = claimed_links
+        self.sent_links = sent_links
+
+    def execute(self) -> None:
+        """This method executes the 'UPDATE' and 'DELETE' statements."""
+        # Calling the confirm_deliveries method with the chat id, the claimed and the sent jobs.
+        subscriptions_persistence.confirm_deliveries(self.chat_id, self.claimed_links, self.sent_links)
+
+
+class GetDeliveredJobsCommand(ICommand):
+    """This command sends a 'SELECT' query to the delivered jobs, returning with the links a chat already got."""
+
+    def __init__(self, *, chat_id: str, apply_links: list[str]) -> None:
+        """_summary_ : This method gets the data to initiate the command to check the delivered jobs.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The chat id.
+        apply_links : list[str]
+            _description_ : The jobs apply links to check.
+        """
+        self.chat_id = str(chat_id)
+        self.apply_links = apply_links
+
+    def execute(self) -> set[str]:
+        """This method executes the 'SELECT' statement."""
+        # Calling the delivered_links method with the chat id and the apply links.
+        return subscriptions_persistence.delivered_links(self.chat_id, self.apply_links)
+
+
+class CheckpointPostsCommand(ICommand):
+    """This command stores the posts a shutdown interrupted the sending of, to send them on the next start."""
+
+    def __init__(self, *, chat_id: str, post_mode: str, posts: list[dict]) -> None:
+        """_summary_ : This method gets the data to initiate the command to checkpoint the posts.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The chat the posts are sent to.
+        post_mode : str
+            _description_ : The post mode the posts were created with ('full' | 'digest').
+        posts : list[dict]
+            _description_ : The posts left to send, in their sending order.
+        """
+        self.chat_id = str(chat_id)
+        self.post_mode = post_mode
+        self.posts = posts
+
+    def execute(self) -> None:
+        """This method executes the 'INSERT INTO' statement."""
+        # Calling the add_posts method with the chat id, the post mode and the posts.
+        outbox_persistence.add_posts(self.chat_id, self.post_mode, self.posts)
+
+
+class GetCheckpointedPostsCommand(ICommand):
+    """This command sends a 'SELECT' query to the outbox, returning with the checkpointed posts, the oldest first."""
+
+    def execute(self) -> list[dict]:
+        """This method executes the 'SELECT' statement."""
+        # Calling the get_posts method.
+        return outbox_persistence.get_posts()
+
+
+class DeleteCheckpointedPostCommand(ICommand):
+    """This command deletes a checkpointed post once it's sent."""
+
+    def __init__(self, *, post_id: int) -> None:
+        """_summary_ : This method gets the data to initiate the command to delete a checkpointed post.
+
+        Parameters
+        ----------
+        post_id : int
+            _description_ : The sent post id.
+        """
+        self.post_id = post_id
+
+    def execute(self) -> None:
+        """This method executes the 'DELETE' statement."""
+        # Calling the delete_post method with the post id.
+        outbox_persistence.delete_post(self.post_id)
+
+
+class AddPipelineRunCommand(ICommand):
+    """This command records a finished jobs pipeline run in the runs history."""
+
+    def __init__(self, *, run: dict) -> None:
+        """_summary_ : This method gets the data to initiate the command to record a run.
+
+        Parameters
+        ----------
+        run : dict
+            _description_ : The run, as returned by PipelineRun.to_row().
+        """
+        self.run = run
+
+    def execute(self) -> None:
+        """This method executes the 'INSERT INTO' statement."""
+        # Calling the add_run method with the run.
+        runs_persistence.add_run(self.run)
+
+
+class GetPipelineRunsCommand(ICommand):
+    """This command returns the latest jobs pipeline runs from the runs history."""
+
+    def __init__(self, *, trigger: str = None, limit: int = 100) -> None:
+        """_summary_ : This method gets the data to initiate the command to get the latest runs.
+
+        Parameters
+        ----------
+        trigger : str, optional
+            _description_, by default None : Only the runs with this trigger ('channel' | 'subscriptions' | 'ljobs').
+        limit : int, optional
+            _description_, by default 100 : The maximum number of runs.
+        """
+        self.trigger = trigger
+        self.limit = limit
+
+    def execute(self) -> list[dict]:
+        """This method executes the 'SELECT' statement."""
+        # Calling the get_runs method with the trigger and the limit.
+        return runs_persistence.get_runs(trigger=self.trigger, limit=self.limit)
+
+
+class RegisterScheduledJobCommand(ICommand):
+    """This command registers a scheduled job, and returns its last run."""
+
+    def __init__(self, *, name: str) -> None:
+        """_summary_ : This method gets the data to initiate the command to register a scheduled job.
+
+        Parameters
+        ----------
+        name : str
+            _description_ : The scheduled job name.
+        """
+        self.name = name
+
+    def execute(self) -> dict:
+        """This method executes the 'INSERT INTO' and 'SELECT' statements."""
+        # Calling the register method with the job's name.
+        return scheduler_persistence.register(self.name)
+
+
+class RecordScheduledRunCommand(ICommand):
+    """This command records a run of a scheduled job."""
+
+    def __init__(
+        self, *, name: str, status: str, started_at: float, finished_at: float = None, due_at: float = None
+    ) -> None:
+        """_summary_ : This method gets the data to initiate the command to record a scheduled run.
+
+        Parameters
+        ----------
+        name : str
+            _description_ : The scheduled job name.
+        status : str
+            _description_ : 'running' | 'ok' | 'timeout' | 'aborted' | 'checkpointed' | the exception name.
+        started_at : float
+            _description_ : The run's start unix time.
+        finished_at : float, optional
+            _description_, by default None : The run's end unix time, None while running.
+        due_at : float, optional
+            _description_, by default None : The unix time the run was due at, None for the runs started on demand.
+        """
+        self.name = name
+        self.status = status
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.due_at = due_at
+
+    def execute(self) -> None:
+        """This method executes the 'UPDATE' statement."""
+        # Calling the record_run method with the run.
+        scheduler_persistence.record_run(self.name, self.status, self.started_at, self.finished_at, self.due_at)
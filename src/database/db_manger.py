@@ -9,23 +9,153 @@ from pathlib import Path
 # Importing Cursor for type hinting.
 from sqlite3 import Cursor
 
+# Importing contextmanager to create the time limit and transaction contexts.
+from contextlib import contextmanager
+
+# Importing Iterable for type hinting.
+from typing import Iterable
+
+# Importing time to measure the time limit.
+import time
+
+# Importing threading & weakref to give each thread its own connection, and close it once the thread is gone.
+import threading
+import weakref
+
 
 class DatabaseManger:
-    """This class manges the connection to the sqlite database."""
+    """This class manges the connections to the sqlite database.
+
+    Each thread gets its own connection, opened on first use, so the bot worker threads, the middlewares and the
+    schedulers never share a connection or a cursor. The connections use WAL journaling, so readers don't block the
+    writer, and a busy timeout, so concurrent writers wait for each other instead of failing with 'database is locked'.
+    Each connection keeps its prepared statements cached, so repeated statements are only compiled once per thread.
+
+    Since every thread has its own connection, a ':memory:' database isn't shared between threads.
+    """
+
+    # Dict[database file: its shared manager], see shared().
+    _shared: dict = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, database_filename: Path) -> "DatabaseManger":
+        """_summary_ : This method returns the manager shared by all the persistence layers of a database file.
+
+        Sharing the manager shares the threads connections, so a transaction() groups the statements of every
+        persistence layer of the database.
+
+        Parameters
+        ----------
+        database_filename : Path
+            _description_ : A path to the database file.
 
-    def __init__(self, database_filename: Path) -> None:
-        """_summary_ : Initializing a connection with the database.
+        Returns
+        -------
+        DatabaseManger
+            _description_ : The database file's manager, created on first use.
+        """
+        with cls._shared_lock:
+            if database_filename not in cls._shared:
+                cls._shared[database_filename] = cls(database_filename)
+            return cls._shared[database_filename]
+
+    def __init__(
+        self,
+        database_filename: Path,
+        busy_timeout: int = 5000,
+        cache_size: int = -8000,
+        cached_statements: int = 256,
+    ) -> None:
+        """_summary_ : Initializing the connections manager, the connections are opened on first use in each thread.
 
         Parameters
         ----------
         database_filename : Path
             _description_ : A path to the database file to connect to, if doesn't exist, it will be created.
+        busy_timeout : int, optional
+            _description_, by default 5000 : The number of milliseconds a statement waits for a lock held by another connection.
+        cache_size : int, optional
+            _description_, by default -8000 : The page cache size of each connection, negative values are in KiB.
+        cached_statements : int, optional
+            _description_, by default 256 : The number of prepared statements each connection keeps compiled.
         """
-        self.connection = sqlite3.connect(database_filename, check_same_thread=False)
+        self.database_filename = database_filename
+        self.busy_timeout = busy_timeout
+        self.cache_size = cache_size
+        self.cached_statements = cached_statements
+        # The current thread's connection.
+        self._local = threading.local()
+        # The opened connections with their threads, to close them on shutdown or once their thread is gone.
+        self._connections: list[tuple[weakref.ref, sqlite3.Connection]] = []
+        self._lock = threading.Lock()
+        # The callbacks run after a transaction() is rolled back, eg. to reload the in-memory snapshots.
+        self._rollback_callbacks = []
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Returns the current thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
 
-    def __del__(self) -> None:
-        """_summary_ : This method closes the connection with the database."""
-        self.connection.close()
+    def _connect(self) -> sqlite3.Connection:
+        """Opens and tunes a new connection."""
+        connection = sqlite3.connect(
+            self.database_filename,
+            timeout=self.busy_timeout / 1000,
+            cached_statements=self.cached_statements,
+            # The connection is only used by its thread, but can be closed by the shutting down one.
+            check_same_thread=False,
+        )
+        # Write-ahead logging, the readers and the writer don't block each other (it's persisted in the database file).
+        connection.execute("PRAGMA journal_mode = WAL")
+        # In WAL mode NORMAL is safe from corruption, and only syncs on checkpoints instead of every commit.
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        connection.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        connection.execute("PRAGMA temp_store = MEMORY")
+
+        with self._lock:
+            # Closing the connections of the finished threads, eg. the background refreshes.
+            alive = []
+            for thread, opened in self._connections:
+                if thread() is not None and thread().is_alive():
+                    alive.append((thread, opened))
+                else:
+                    opened.close()
+            alive.append((weakref.ref(threading.current_thread()), connection))
+            self._connections = alive
+        return connection
+
+    def close(self) -> None:
+        """_summary_ : This method closes all the opened connections, the threads reopen one if they use the database again."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for _, connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """_summary_ : This method checkpoints the write-ahead log of every shared database, and closes their connections.
+
+        It's called once by the shutdown, so the database files are complete on their own (no '-wal' file to replay)
+        when the bot stops, instead of relying on the managers being garbage collected.
+        """
+        with cls._shared_lock:
+            managers = list(cls._shared.values())
+        for manager in managers:
+            try:
+                manager.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass
+            manager.close()
 
     def _execute(self, statement: str, values: tuple[str] = None) -> Cursor:
         """_summary_ : This method executes SQL statements and returns back a Cursor object containing the query result if any.
@@ -42,14 +172,104 @@ class DatabaseManger:
         Cursor
             _description_ : A Cursor object containing the result of the query.
         """
-        # Opening a connection to the database using a context manger to automatically close when done
-        with self.connection:
-            # Create the cursor object
-            cursor = self.connection.cursor()
-            # Executing the received statement
-            cursor.execute(statement, values or [])
-            # Returning the cursor object to extract returned data if any
-            return cursor
+        connection = self.connection
+        # Inside a transaction() scope, the statement is committed with the scope.
+        if getattr(self._local, "depth", 0):
+            return connection.execute(statement, values or [])
+        # Running the statement in a transaction, committed on success and rolled back on error.
+        with connection:
+            # Executing the received statement, its prepared statement is reused from the connection's cache
+            return connection.execute(statement, values or [])
+
+    def _execute_many(self, statement: str, values: Iterable[tuple]) -> Cursor:
+        """_summary_ : This method executes a SQL statement once per values tuple, in a single transaction (a single commit).
+
+        Parameters
+        ----------
+        statement : str
+            _description_ : The SQL statement to execute on the database.
+        values : Iterable[tuple]
+            _description_ : The values tuples to replace the placeholders with, one execution each.
+
+        Returns
+        -------
+        Cursor
+            _description_ : A Cursor object, its rowcount is the total number of changed rows.
+        """
+        connection = self.connection
+        if getattr(self._local, "depth", 0):
+            return connection.executemany(statement, values)
+        with connection:
+            return connection.executemany(statement, values)
+
+    @contextmanager
+    def transaction(self):
+        """_summary_ : This context manager groups the statements run in its scope by the current thread in one transaction.
+
+        The transaction is committed when the scope exits, or rolled back if it raises. The write lock is taken when
+        the scope starts, and nested scopes join the outer one.
+
+        Example
+        -------
+            >>> with db.transaction():
+            ...     db.add_many("allow_list", [{"group_id": "-100"}, {"group_id": "-200"}])
+            ...     db.delete("bot_users", {"user_id": "42"})
+        """
+        connection = self.connection
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            connection.execute("BEGIN IMMEDIATE")
+        self._local.depth = depth + 1
+        try:
+            yield
+        except BaseException:
+            self._local.depth = depth
+            if depth == 0:
+                connection.rollback()
+                for callback in self._rollback_callbacks:
+                    callback()
+            raise
+        else:
+            self._local.depth = depth
+            if depth == 0:
+                connection.commit()
+
+    def query(self, statement: str, values: tuple = None) -> Cursor:
+        """_summary_ : This method executes a raw SQL statement, for the statements the other methods can't build (eg. FTS, upserts, triggers).
+
+        Parameters
+        ----------
+        statement : str
+            _description_ : The SQL statement to execute on the database.
+        values : tuple, optional
+            _description_, by default None : The values to replace the statement placeholders with.
+
+        Returns
+        -------
+        Cursor
+            _description_ : A Cursor object containing the result of the query.
+        """
+        return self._execute(statement, values)
+
+    @contextmanager
+    def time_limit(self, seconds: float):
+        """_summary_ : This context manager interrupts the statements still running after the given time.
+
+        An interrupted statement raises sqlite3.OperationalError('interrupted'). The limit applies to the current
+        thread's connection only.
+
+        Parameters
+        ----------
+        seconds : float
+            _description_ : The number of seconds the statements can run.
+        """
+        deadline = time.monotonic() + seconds
+        # Checking the deadline every 1000 virtual machine instructions, a non-zero return interrupts the statement.
+        self.connection.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+        try:
+            yield
+        finally:
+            self.connection.set_progress_handler(None, 0)
 
     def create_table(self, table_name: str, columns: dict[str, str]) -> None:
         """_summary_ : This method creates a table in the database if the table is note existing.
@@ -102,6 +322,90 @@ class DatabaseManger:
             column_values,
         )
 
+    def on_rollback(self, callback) -> None:
+        """_summary_ : This method registers a callback to run after a transaction() is rolled back.
+
+        Parameters
+        ----------
+        callback : Callable[[], None]
+            _description_ : The function to call, with no arguments.
+        """
+        self._rollback_callbacks.append(callback)
+
+    def add_many(self, table_name: str, rows: list[dict[str, str]]) -> None:
+        """_summary_ : This method adds many rows with a single 'INSERT OR IGNORE INTO' statement run in one transaction.
+
+        Parameters
+        ----------
+        table_name : str
+            _description_ : Table name to perform the statement on.
+        rows : list[dict[str, str]]
+            _description_ : The rows to add, all with the same columns, the rows already existing are ignored.
+        """
+        if not rows:
+            return
+        columns = list(rows[0])
+        self._execute_many(
+            f"""
+            INSERT OR IGNORE INTO {table_name}
+            ({", ".join(columns)})
+            VALUES ({", ".join("?" * len(columns))})
+            """,
+            [tuple(row[column] for column in columns) for row in rows],
+        )
+
+    def upsert_many(
+        self, table_name: str, rows: list[dict[str, str]], conflict_columns: list[str], update_columns: list[str] = None
+    ) -> None:
+        """_summary_ : This method adds or updates many rows with a single 'INSERT ... ON CONFLICT DO UPDATE' statement run in one transaction.
+
+        Parameters
+        ----------
+        table_name : str
+            _description_ : Table name to perform the statement on.
+        rows : list[dict[str, str]]
+            _description_ : The rows to add or update, all with the same columns.
+        conflict_columns : list[str]
+            _description_ : The unique columns identifying an existing row.
+        update_columns : list[str], optional
+            _description_, by default None : The columns updated on existing rows, all the other columns if not provided.
+        """
+        if not rows:
+            return
+        columns = list(rows[0])
+        update_columns = update_columns or [column for column in columns if column not in conflict_columns]
+        self._execute_many(
+            f"""
+            INSERT INTO {table_name}
+            ({", ".join(columns)})
+            VALUES ({", ".join("?" * len(columns))})
+            ON CONFLICT({", ".join(conflict_columns)}) DO UPDATE SET
+            {", ".join(f"{column} = excluded.{column}" for column in update_columns)}
+            """,
+            [tuple(row[column] for column in columns) for row in rows],
+        )
+
+    def delete_many(self, table_name: str, criteria: list[dict[str, str]]) -> None:
+        """_summary_ : This method deletes many rows with a single 'DELETE' statement run in one transaction.
+
+        Parameters
+        ----------
+        table_name : str
+            _description_ : Table name to perform the statement on.
+        criteria : list[dict[str, str]]
+            _description_ : The criteria of each deleted row, all with the same columns => [{keys(criteria) : values(values)}]
+        """
+        if not criteria:
+            return
+        columns = list(criteria[0])
+        self._execute_many(
+            f"""
+            DELETE FROM {table_name}
+            WHERE {" AND ".join(f"{column} = ?" for column in columns)}
+            """,
+            [tuple(row[column] for column in columns) for row in criteria],
+        )
+
     def select(
         self, table_name: str, criteria: dict[str, str] = None, order_by: str = None
     ) -> Cursor:
@@ -176,7 +480,7 @@ class DatabaseManger:
             values,
         )
 
-    def delete(self, table_name: str, criteria: dict[str, str]) -> None:
+    def delete(self, table_name: str, criteria: dict[str, str]) -> Cursor:
         """_summary_ : This method deletes data from the database using the 'DELETE' statement.
 
         Parameters
@@ -185,6 +489,11 @@ class DatabaseManger:
             _description_ : Table name to perform the statement on.
         criteria : dict[str, str]
             _description_ : The criteria to use as a filter on the DELETE statement, passed as a dict => {keys(criteria) : values(values)}
+
+        Returns
+        -------
+        Cursor
+            _description_ : The statement's cursor, its rowcount is the number of deleted rows.
         """
         # Creating placeholders for the provided criteria
         placeholders = [
@@ -193,7 +502,7 @@ class DatabaseManger:
         # Joining the created placeholders with AND operator
         delete_criteria = " AND ".join(placeholders)
         # Executing the DELETE statement
-        self._execute(
+        return self._execute(
             f"""
             DELETE FROM {table_name}
             WHERE {delete_criteria}
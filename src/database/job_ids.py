@@ -0,0 +1,62 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing hashlib to create the ids of the links without a LinkedIn job id.
+import hashlib
+
+# Importing re to read the LinkedIn job id out of the links.
+import re
+
+# Importing urlsplit and urlunsplit to strip the tracking query of the links.
+from urllib.parse import urlsplit, urlunsplit
+
+# The LinkedIn job id ending the path of a job page link, eg. '/jobs/view/python-developer-at-acme-3812345678'.
+JOB_VIEW_ID = re.compile(r"/jobs/view/(?:[^/]*-)?(\d+)/?$")
+
+# The LinkedIn job id of a job search card urn, eg. 'urn:li:jobPosting:3812345678'.
+JOB_URN_ID = re.compile(r"^urn:li:jobPosting:(\d+)$")
+
+
+def canonical_job_link(url: str, entity_urn: str = None) -> str:
+    """_summary_ : This function returns the link of a job page without its country subdomain and tracking query.
+
+    The same job gets a new 'refId' and 'trackingId' query, and may get a country subdomain, on every scrape.
+
+    Parameters
+    ----------
+    url : str
+        _description_ : The job page link, as found in the search card.
+    entity_urn : str, optional
+        _description_, by default None : The search card 'data-entity-urn', used when the link has no job id.
+
+    Returns
+    -------
+    str
+        _description_ : The canonical job page link.
+    """
+    parts = urlsplit(url.strip())
+    # Getting every LinkedIn country subdomain (eg. 'de.linkedin.com') to the 'www' one.
+    host = "www.linkedin.com" if parts.netloc.endswith("linkedin.com") else parts.netloc
+    link = urlunsplit((parts.scheme or "https", host, parts.path, "", ""))
+
+    if not JOB_VIEW_ID.search(parts.path) and entity_urn and (match := JOB_URN_ID.match(entity_urn.strip())):
+        link = f"https://www.linkedin.com/jobs/view/{match.group(1)}"
+    return link
+
+
+def job_id(apply_link: str) -> str:
+    """_summary_ : This function returns the id a job is stored, delivered and skipped by.
+
+    Parameters
+    ----------
+    apply_link : str
+        _description_ : The job's apply link, with or without its tracking query.
+
+    Returns
+    -------
+    str
+        _description_ : The LinkedIn job id, or the hash of the canonical link if it has none.
+    """
+    link = canonical_job_link(apply_link)
+    if match := JOB_VIEW_ID.search(urlsplit(link).path):
+        return match.group(1)
+    return hashlib.sha1(link.encode()).hexdigest()
@@ -0,0 +1,275 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing re to extract the search terms.
+import re
+
+# Importing time to stamp the scrapes.
+import time
+
+# Importing sqlite3 to catch the interrupted inline searches.
+import sqlite3
+
+# Importing datetime to store the jobs posting time.
+from datetime import datetime
+
+# Importing the jobs ids, the same job gets a new tracking link on every scrape.
+from database.job_ids import job_id
+
+# Added the database manger (Receiver) to use it in the jobs persistence layer.
+from database.db_manger import DatabaseManger
+
+# Importing the migrations to create the jobs tables.
+from database.migrations import migrate
+
+
+def search_words(text: str) -> list[str]:
+    """_summary_ : This function extracts the lowered words of a search text, they are safe to quote in a FTS5 query.
+
+    Parameters
+    ----------
+    text : str
+        _description_ : The search text.
+
+    Returns
+    -------
+    list[str]
+        _description_ : The lowered words.
+    """
+    return re.findall(r"\w+", text.lower())
+
+
+def ago_text(posted_at: float) -> str:
+    """_summary_ : This function describes how long ago a job was posted, like linkedin does.
+
+    Parameters
+    ----------
+    posted_at : float
+        _description_ : The job posting unix timestamp.
+
+    Returns
+    -------
+    str
+        _description_ : eg. '5 minutes ago', '3 hours ago', '2 days ago'.
+    """
+    minutes = max(0, int((time.time() - posted_at) // 60))
+    if minutes < 60:
+        return f"{minutes} minutes ago"
+    if minutes < 60 * 24:
+        return f"{minutes // 60} hours ago"
+    return f"{minutes // (60 * 24)} days ago"
+
+
+class JobsDatabase:
+    """_summary_ : This class stores the scrapped jobs with a FTS5 full text index, so searches can be answered from local data."""
+
+    def __init__(self) -> None:
+        """_summary_ : This migrates the database to get the 'jobs' table, its 'jobs_fts' index, and the 'search_coverage' table."""
+        self.db = DatabaseManger.shared("bot_db.sqlite")
+
+        # Creating (or upgrading) the jobs tables and their full text index.
+        migrate(self.db)
+
+    @staticmethod
+    def job_id(apply_link: str) -> str:
+        """Returns the job's id, its LinkedIn job id (see database.job_ids)."""
+        return job_id(apply_link)
+
+    def add_jobs(self, jobs: list[dict], query_key: str = None, max_age: float = None) -> None:
+        """_summary_ : This method stores (or updates) the scrapped jobs, records the search coverage, and ages out the old jobs.
+
+        Parameters
+        ----------
+        jobs : list[dict]
+            _description_ : The jobs formatted by the scrapper.
+        query_key : str, optional
+            _description_, by default None : The key of the search that scrapped the jobs.
+        max_age : float, optional
+            _description_, by default None : Deletes the jobs and the searches coverage last scrapped more than ?? seconds ago,
+                nothing is deleted if not provided.
+        """
+        scraped_at = time.time()
+
+        rows = []
+        for job in jobs:
+            posted_at = job.get("posted_at")
+            rows.append(
+                {
+                    "job_id": self.job_id(job["apply_link"]),
+                    "job_title": job["job_title"],
+                    "job_company": job["job_company"],
+                    "job_location": job["job_location"],
+                    "about_job": job["about_job"],
+                    "ai_tags": job["ai_tags"] or "",
+                    "apply_link": job["apply_link"],
+                    "posted_at": posted_at.timestamp() if isinstance(posted_at, datetime) else scraped_at,
+                    "scraped_at": scraped_at,
+                }
+            )
+
+        # Storing the jobs and the coverage with a single commit, the posting time and link are kept on updates.
+        with self.db.transaction():
+            self.db.upsert_many(
+                "jobs",
+                rows,
+                conflict_columns=["job_id"],
+                update_columns=["job_title", "job_company", "job_location", "about_job", "ai_tags", "scraped_at"],
+            )
+            if query_key:
+                self.db.query(
+                    """
+                    INSERT INTO search_coverage (query_key, scraped_at) VALUES (?, ?)
+                    ON CONFLICT(query_key) DO UPDATE SET scraped_at = excluded.scraped_at
+                    """,
+                    (query_key, scraped_at),
+                )
+            if max_age:
+                # Aging the jobs out by their indexed scrape time, the delete trigger keeps the full text index in sync.
+                self.db.query("DELETE FROM jobs WHERE scraped_at < ?", (scraped_at - max_age,))
+                self.db.query("DELETE FROM search_coverage WHERE scraped_at < ?", (scraped_at - max_age,))
+
+    def get_coverage(self, query_key: str) -> float:
+        """_summary_ : This method returns when the search was last scrapped.
+
+        Parameters
+        ----------
+        query_key : str
+            _description_ : The key of the search.
+
+        Returns
+        -------
+        float
+            _description_ : The unix timestamp of the last scrape, None if never scrapped.
+        """
+        row = self.db.select("search_coverage", criteria={"query_key": query_key}).fetchone()
+        return row[1] if row else None
+
+    def get_job(self, job_id: str) -> dict:
+        """_summary_ : This method returns a stored job by its id.
+
+        Parameters
+        ----------
+        job_id : str
+            _description_ : The job id, see job_id().
+
+        Returns
+        -------
+        dict
+            _description_ : The job formatted like the scrapper does, None if it isn't stored (or was aged out).
+        """
+        row = self.db.query(
+            """
+            SELECT job_title, job_company, job_location, about_job, apply_link, posted_at, ai_tags
+            FROM jobs WHERE job_id = ?
+            """,
+            (job_id,),
+        ).fetchone()
+        return self.format_row(row) if row else None
+
+    def search_jobs(
+        self, job_title: str, locations: list[str], posted_after: float, limit: int = 100
+    ) -> list[dict]:
+        """_summary_ : This method searches the stored jobs matching the job title and one of the locations.
+
+        Parameters
+        ----------
+        job_title : str
+            _description_ : The job title words must all be in the job title or the job description.
+        locations : list[str]
+            _description_ : The job location must match one of the locations, empty for any location.
+        posted_after : float
+            _description_ : The unix timestamp the jobs must be posted after.
+        limit : int, optional
+            _description_, by default 100 : The maximum number of jobs to return.
+
+        Returns
+        -------
+        list[dict]
+            _description_ : The jobs formatted like the scrapper does, from the earliest to the latest posted.
+        """
+        # Building the FTS5 query => {job_title about_job} : ("python" "developer") AND job_location : ("berlin" OR "new york").
+        match = []
+        if title_words := search_words(job_title):
+            match.append("{job_title about_job} : (" + " ".join(f'"{word}"' for word in title_words) + ")")
+        if phrases := [" ".join(words) for place in locations if (words := search_words(place))]:
+            match.append("job_location : (" + " OR ".join(f'"{phrase}"' for phrase in phrases) + ")")
+
+        query = """
+            SELECT jobs.job_title, jobs.job_company, jobs.job_location, jobs.about_job,
+                   jobs.apply_link, jobs.posted_at, jobs.ai_tags
+            FROM jobs
+        """
+        values: tuple = ()
+        if match:
+            query += " JOIN jobs_fts ON jobs_fts.rowid = jobs.rowid WHERE jobs_fts MATCH ? AND"
+            values += (" AND ".join(match),)
+        else:
+            query += " WHERE"
+        query += " jobs.posted_at >= ? ORDER BY jobs.posted_at LIMIT ?"
+        values += (posted_after, limit)
+
+        return [self.format_row(row) for row in self.db.query(query, values).fetchall()]
+
+    def inline_search(
+        self, text: str, posted_after: float, limit: int = 100, deadline: float = 0.08
+    ) -> list[dict]:
+        """_summary_ : This method searches the stored jobs as the user types, each word matching as a prefix of any field.
+
+        Parameters
+        ----------
+        text : str
+            _description_ : The typed text, eg. 'pyth berl', empty for the latest jobs.
+        posted_after : float
+            _description_ : The unix timestamp the jobs must be posted after.
+        limit : int, optional
+            _description_, by default 100 : The maximum number of jobs to return.
+        deadline : float, optional
+            _description_, by default 0.08 : The number of seconds the search can take.
+
+        Returns
+        -------
+        list[dict]
+            _description_ : The jobs formatted like the scrapper does, from the latest to the earliest posted.
+                None if the search didn't finish before the deadline.
+        """
+        # Building the FTS5 prefix query => "pyth"* "berl"*.
+        match = " ".join(f'"{word}"*' for word in search_words(text))
+
+        query = """
+            SELECT jobs.job_title, jobs.job_company, jobs.job_location, jobs.about_job,
+                   jobs.apply_link, jobs.posted_at, jobs.ai_tags
+            FROM jobs
+        """
+        values: tuple = ()
+        if match:
+            query += " JOIN jobs_fts ON jobs_fts.rowid = jobs.rowid WHERE jobs_fts MATCH ? AND"
+            values += (match,)
+        else:
+            query += " WHERE"
+        query += " jobs.posted_at >= ? ORDER BY jobs.posted_at DESC LIMIT ?"
+        values += (posted_after, limit)
+
+        # The time limit only applies to this thread's connection.
+        try:
+            with self.db.time_limit(deadline):
+                rows = self.db.query(query, values).fetchall()
+        except sqlite3.OperationalError as e:
+            # Giving up on the interrupted search, any other error is a real one.
+            if "interrupted" not in str(e):
+                raise
+            return None
+
+        return [self.format_row(row) for row in rows]
+
+    @staticmethod
+    def format_row(row: tuple) -> dict:
+        """Formats a selected job row like the scrapper does."""
+        return {
+            "job_title": row[0],
+            "job_company": row[1],
+            "job_location": row[2],
+            "about_job": row[3],
+            "apply_link": row[4],
+            "timestamp": ago_text(row[5]),
+            "posted_at": datetime.fromtimestamp(row[5]).astimezone(),
+            "ai_tags": row[6],
+        }
@@ -0,0 +1,383 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing datetime to stamp the applied migrations and log them.
+from datetime import datetime
+
+# Importing dataclass to create the migration dataclass.
+from dataclasses import dataclass
+
+# Importing threading to run the migrations once per process.
+import threading
+
+# Importing Callable for type hinting.
+from typing import Callable
+
+# Importing the database manger to type hint the migrated database.
+from database.db_manger import DatabaseManger
+
+# Importing the jobs ids, to rekey the jobs stored by their tracking links.
+from database.job_ids import canonical_job_link, job_id
+
+
+@dataclass(slots=True, frozen=True)
+class Migration:
+    """_summary_ : This data class holds a schema migration, applied once to each database, in its version order."""
+
+    # The schema version the migration upgrades to.
+    version: int
+    # What the migration does, logged when it's applied.
+    description: str
+    # The function applying the migration to the database, it runs inside a transaction.
+    apply: Callable[[DatabaseManger], None]
+
+
+# The ordered schema migrations, never edit or reorder an applied one, add a new one instead.
+MIGRATIONS: list[Migration] = []
+
+# The temporary bans duration used to backfill the expiry of the bans added before it was stored.
+TEMP_BAN_DURATION = 3600
+
+# The database files already migrated by this process.
+_migrated: set = set()
+_lock = threading.Lock()
+
+
+def migration(version: int, description: str) -> Callable:
+    """_summary_ : This decorator registers a function as the migration to a schema version.
+
+    Parameters
+    ----------
+    version : int
+        _description_ : The schema version the migration upgrades to, it must follow the last registered one.
+    description : str
+        _description_ : What the migration does.
+
+    Raises
+    ------
+    ValueError
+        _description_ : If the version doesn't follow the last registered one.
+    """
+
+    def register(apply: Callable[[DatabaseManger], None]) -> Callable[[DatabaseManger], None]:
+        expected = MIGRATIONS[-1].version + 1 if MIGRATIONS else 1
+        if version != expected:
+            raise ValueError(f"Migration {version} ({description}) must be version {expected}.")
+        MIGRATIONS.append(Migration(version, description, apply))
+        return apply
+
+    return register
+
+
+def columns(db: DatabaseManger, table_name: str) -> set[str]:
+    """Returns the columns names of a table."""
+    return {column[1] for column in db.query(f"PRAGMA table_info({table_name})")}
+
+
+# ----- MIGRATIONS ----- #
+
+
+@migration(1, "Create the blocked users and allowed groups tables")
+def users_tables(db: DatabaseManger) -> None:
+    db.create_table(
+        "bot_users",
+        {
+            "user_id": "text primary key not null",
+            "block_type": "text not null",
+            "date_added": "text not null",
+        },
+    )
+    db.create_table("allow_list", {"group_id": "text primary key not null"})
+
+
+@migration(2, "Store the temporary bans expiry")
+def bans_expiry(db: DatabaseManger) -> None:
+    # The databases created before the migrations may already have the column.
+    if "expires_at" not in columns(db, "bot_users"):
+        db.query("ALTER TABLE bot_users ADD COLUMN expires_at integer")
+    # Backfilling the expiry of the temporary bans, out of the time they were added.
+    for user_id, date_added in db.query(
+        "SELECT user_id, date_added FROM bot_users WHERE block_type = 'temp' AND expires_at IS NULL"
+    ).fetchall():
+        banned_at = datetime.strptime(date_added, "%Y/%m/%d, %H:%M:%S").timestamp()
+        db.update("bot_users", {"user_id": user_id}, {"expires_at": int(banned_at) + TEMP_BAN_DURATION})
+    # Indexing the bans expiry, so the expired bans are deleted without scanning the table.
+    db.query("CREATE INDEX IF NOT EXISTS bot_users_expires_at ON bot_users (expires_at)")
+
+
+@migration(3, "Create the jobs table and its full text index")
+def jobs_tables(db: DatabaseManger) -> None:
+    db.create_table(
+        "jobs",
+        {
+            "job_id": "text primary key not null",
+            "job_title": "text not null",
+            "job_company": "text not null",
+            "job_location": "text not null",
+            "about_job": "text not null",
+            "ai_tags": "text not null",
+            "apply_link": "text not null",
+            "posted_at": "real not null",
+            "scraped_at": "real not null",
+        },
+    )
+
+    # The full text index over the 'jobs' table, kept in sync by the triggers below.
+    db.query(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            job_title, job_company, job_location, about_job, ai_tags,
+            content='jobs', content_rowid='rowid'
+        );
+        """
+    )
+    db.query(
+        """
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, job_title, job_company, job_location, about_job, ai_tags)
+            VALUES (new.rowid, new.job_title, new.job_company, new.job_location, new.about_job, new.ai_tags);
+        END;
+        """
+    )
+    db.query(
+        """
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, job_title, job_company, job_location, about_job, ai_tags)
+            VALUES ('delete', old.rowid, old.job_title, old.job_company, old.job_location, old.about_job, old.ai_tags);
+        END;
+        """
+    )
+    db.query(
+        """
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, job_title, job_company, job_location, about_job, ai_tags)
+            VALUES ('delete', old.rowid, old.job_title, old.job_company, old.job_location, old.about_job, old.ai_tags);
+            INSERT INTO jobs_fts(rowid, job_title, job_company, job_location, about_job, ai_tags)
+            VALUES (new.rowid, new.job_title, new.job_company, new.job_location, new.about_job, new.ai_tags);
+        END;
+        """
+    )
+
+    # The table recording when each search was last scrapped.
+    db.create_table(
+        "search_coverage",
+        {
+            "query_key": "text primary key not null",
+            "scraped_at": "real not null",
+        },
+    )
+
+
+@migration(4, "Create the saved searches and delivered jobs tables")
+def subscriptions_tables(db: DatabaseManger) -> None:
+    # A chat can't save the same search twice.
+    db.query(
+        """
+        CREATE TABLE IF NOT EXISTS subscriptions (
+            subscription_id integer primary key autoincrement,
+            chat_id text not null,
+            job_title text not null,
+            location text not null,
+            date_added text not null,
+            UNIQUE (chat_id, job_title, location)
+        );
+        """
+    )
+    # A job is only delivered once to each chat.
+    db.query(
+        """
+        CREATE TABLE IF NOT EXISTS delivered_jobs (
+            chat_id text not null,
+            job_id text not null,
+            delivered_at real not null,
+            PRIMARY KEY (chat_id, job_id)
+        );
+        """
+    )
+
+
+@migration(5, "Store when the groups were allowed")
+def allow_list_date_added(db: DatabaseManger) -> None:
+    # The groups allowed before are left undated, they're listed first.
+    db.query("ALTER TABLE allow_list ADD COLUMN date_added text")
+
+
+@migration(6, "Index the hot queries")
+def hot_queries_indexes(db: DatabaseManger) -> None:
+    # /getusers filters by the block type and sorts by the date added.
+    db.query("CREATE INDEX IF NOT EXISTS bot_users_block_type ON bot_users (block_type, date_added)")
+    # The groups are listed by the date added.
+    db.query("CREATE INDEX IF NOT EXISTS allow_list_date_added ON allow_list (date_added)")
+    # The searches filter the jobs by their posting time and sort by it.
+    db.query("CREATE INDEX IF NOT EXISTS jobs_posted_at ON jobs (posted_at)")
+    # The jobs are aged out by their scrape time.
+    db.query("CREATE INDEX IF NOT EXISTS jobs_scraped_at ON jobs (scraped_at)")
+    # The old deliveries are pruned by their time on every subscriptions run.
+    db.query("CREATE INDEX IF NOT EXISTS delivered_jobs_delivered_at ON delivered_jobs (delivered_at)")
+
+
+@migration(7, "Create the pipeline runs history table")
+def pipeline_runs_table(db: DatabaseManger) -> None:
+    db.query(
+        """
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+            run_id integer primary key autoincrement,
+            trigger text not null,
+            query text not null,
+            status text not null,
+            started_at real not null,
+            duration real not null,
+            cards_found integer not null,
+            details_fetched integer not null,
+            cache_hits integer not null,
+            gemini_calls integer not null,
+            messages_sent integer not null,
+            rate_limited integer not null,
+            stages text not null
+        );
+        """
+    )
+    # The reports read the latest runs of a trigger, and the old runs are pruned by their time.
+    db.query("CREATE INDEX IF NOT EXISTS pipeline_runs_trigger ON pipeline_runs (trigger, started_at)")
+    db.query("CREATE INDEX IF NOT EXISTS pipeline_runs_started_at ON pipeline_runs (started_at)")
+
+
+@migration(8, "Create the scheduled jobs state table")
+def scheduled_jobs_table(db: DatabaseManger) -> None:
+    # The last run of each scheduled job, so a restart can tell the runs it missed.
+    db.create_table(
+        "scheduled_jobs",
+        {
+            "name": "text primary key not null",
+            "registered_at": "real not null",
+            "last_started": "real",
+            "last_finished": "real",
+            "last_status": "text",
+        },
+    )
+
+
+@migration(9, "Store when the scheduled jobs runs were due")
+def scheduled_jobs_last_due(db: DatabaseManger) -> None:
+    db.query("ALTER TABLE scheduled_jobs ADD COLUMN last_due real")
+
+
+@migration(10, "Create the checkpointed posts outbox table")
+def outbox_table(db: DatabaseManger) -> None:
+    # The posts a shutdown interrupted the sending of, they're sent first on the next start.
+    db.query(
+        """
+        CREATE TABLE IF NOT EXISTS outbox (
+            post_id integer primary key autoincrement,
+            chat_id text not null,
+            post_mode text not null,
+            post text not null,
+            queued_at real not null
+        );
+        """
+    )
+
+
+@migration(11, "Mark the deliveries pending until their jobs are sent")
+def pending_deliveries(db: DatabaseManger) -> None:
+    # The jobs claimed for a chat are pending until they're sent, the deliveries recorded before were sent.
+    db.query("ALTER TABLE delivered_jobs ADD COLUMN pending integer not null default 0")
+
+
+@migration(12, "Key the stored jobs by their LinkedIn job id")
+def canonical_job_ids(db: DatabaseManger) -> None:
+    # The jobs were keyed by their tracking links, the same job was stored once per scrape, only its last scrape is kept.
+    # The old deliveries can't be rekeyed (only their hash is stored), they're aged out.
+    kept = {}
+    for rowid, apply_link in db.query("SELECT rowid, apply_link FROM jobs ORDER BY scraped_at DESC").fetchall():
+        new_id = job_id(apply_link)
+        if new_id in kept:
+            db.query("DELETE FROM jobs WHERE rowid = ?", (rowid,))
+        else:
+            kept[new_id] = (rowid, apply_link)
+
+    # Rekeying once the duplicates are deleted, so a new id never collides with an old one.
+    for new_id, (rowid, apply_link) in kept.items():
+        db.query(
+            "UPDATE jobs SET job_id = ?, apply_link = ? WHERE rowid = ?",
+            (new_id, canonical_job_link(apply_link), rowid),
+        )
+
+
+# ----- RUNNING THE MIGRATIONS ----- #
+
+
+def schema_version(db: DatabaseManger) -> int:
+    """_summary_ : This function returns the database schema version.
+
+    Parameters
+    ----------
+    db : DatabaseManger
+        _description_ : The database.
+
+    Returns
+    -------
+    int
+        _description_ : The last applied migration version, 0 for a new database.
+    """
+    db.create_table(
+        "schema_version",
+        {
+            "version": "integer primary key not null",
+            "description": "text not null",
+            "applied_at": "text not null",
+        },
+    )
+    return db.query("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(db: DatabaseManger) -> int:
+    """_summary_ : This function upgrades the database schema to the latest version, it's a no-op once done.
+
+    Each migration runs in its own transaction with its version record, so a failed migration leaves the database
+    at the previous version, and concurrent bot processes can't apply a migration twice.
+
+    Parameters
+    ----------
+    db : DatabaseManger
+        _description_ : The database to migrate.
+
+    Returns
+    -------
+    int
+        _description_ : The database schema version.
+
+    Raises
+    ------
+    RuntimeError
+        _description_ : If the database was migrated by a newer bot version, its schema is unknown to this one.
+    """
+    latest = MIGRATIONS[-1].version
+    with _lock:
+        if db.database_filename in _migrated:
+            return latest
+
+        version = schema_version(db)
+        if version > latest:
+            raise RuntimeError(
+                f"The database {db.database_filename} schema is version {version}, "
+                f"this bot only knows up to version {latest}."
+            )
+
+        for pending in MIGRATIONS[version:]:
+            with db.transaction():
+                # Another process may have applied it since the version was read, the transaction holds the write lock.
+                if schema_version(db) >= pending.version:
+                    continue
+                pending.apply(db)
+                db.add(
+                    "schema_version",
+                    {
+                        "version": pending.version,
+                        "description": pending.description,
+                        "applied_at": datetime.now().strftime("%Y/%m/%d, %H:%M:%S"),
+                    },
+                )
+            print(datetime.now(), f"Applied the database migration {pending.version}: {pending.description}")
+
+        _migrated.add(db.database_filename)
+        return latest
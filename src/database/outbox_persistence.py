@@ -0,0 +1,69 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing json to store the posts.
+import json
+
+# Importing time to stamp the checkpointed posts.
+import time
+
+# Added the database manger (Receiver) to use it in the outbox persistence layer.
+from database.db_manger import DatabaseManger
+
+# Importing the migrations to create the outbox table.
+from database.migrations import migrate
+
+
+class OutboxDatabase:
+    """_summary_ : This class stores the posts a shutdown interrupted the sending of, until they're sent on the next start."""
+
+    def __init__(self) -> None:
+        """_summary_ : This migrates the database to get the 'outbox' table."""
+        self.db = DatabaseManger.shared("bot_db.sqlite")
+
+        # Creating (or upgrading) the 'outbox' table.
+        migrate(self.db)
+
+    def add_posts(self, chat_id: str, post_mode: str, posts: list[dict]) -> None:
+        """_summary_ : This method stores the posts left to send to a chat, in their sending order.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The chat the posts are sent to.
+        post_mode : str
+            _description_ : The post mode the posts were created with ('full' | 'digest').
+        posts : list[dict]
+            _description_ : The posts left to send.
+        """
+        queued_at = time.time()
+        self.db.add_many(
+            "outbox",
+            [
+                {"chat_id": str(chat_id), "post_mode": post_mode, "post": json.dumps(post), "queued_at": queued_at}
+                for post in posts
+            ],
+        )
+
+    def get_posts(self) -> list[dict]:
+        """_summary_ : This method returns the stored posts, the oldest first.
+
+        Returns
+        -------
+        list[dict]
+            _description_ : The 'post_id', 'chat_id', 'post_mode' and 'post' of each stored post.
+        """
+        rows = self.db.query("SELECT post_id, chat_id, post_mode, post FROM outbox ORDER BY post_id").fetchall()
+        return [
+            {"post_id": post_id, "chat_id": chat_id, "post_mode": post_mode, "post": json.loads(post)}
+            for post_id, chat_id, post_mode, post in rows
+        ]
+
+    def delete_post(self, post_id: int) -> None:
+        """_summary_ : This method deletes a sent post.
+
+        Parameters
+        ----------
+        post_id : int
+            _description_ : The sent post id.
+        """
+        self.db.delete("outbox", {"post_id": post_id})
@@ -4,9 +4,24 @@ from abc import ABC, abstractmethod
 # Adding datetime and timezone to add the time the user was added to the database
 from datetime import datetime
 
+# Importing Condition to keep the in-memory snapshots in step with the database writes, and wake the cleaner
+from threading import Condition
+
+# Importing contextmanager to create the writes context
+from contextlib import contextmanager
+
+# Importing heapq to keep the temporary bans ordered by expiry
+import heapq
+
+# Importing time to stamp the bans expiry
+import time
+
 # Added the database manger (Receiver) to use it in the PersistanceLayer Implementation
 from database.db_manger import DatabaseManger
 
+# Importing the migrations to create the users tables.
+from database.migrations import migrate
+
 # from db_manger import DatabaseManger
 
 
@@ -43,30 +58,56 @@ class IPersistenceLayer(ABC):
 class UsersDatabase(IPersistenceLayer):
     """This class sits between the database commands and the database manger class"""
 
-    def __init__(self) -> None:
-        """_summary_ : This creates the 2 tables 'users' and 'allow_list'"""
+    def __init__(self, temp_ban_duration: int = 3600) -> None:
+        """_summary_ : This migrates the database to get the 2 tables 'users' and 'allow_list'
+
+        Parameters
+        ----------
+        temp_ban_duration : int, optional
+            _description_, by default 3600 : The number of seconds a temporary ban lasts.
+        """
         # Table name to be created if not existing
         self.table_name = "bot_users"
+        # The temporary bans duration
+        self.temp_ban_duration = temp_ban_duration
         # Initiating the data base users
-        self.db = DatabaseManger("bot_db.sqlite")
-
-        # Creating the table 'bot_users' in the database
-        self.db.create_table(
-            self.table_name,
-            {
-                # "id": "integer primary key autoincrement",
-                "user_id": "text primary key not null",
-                "block_type": "text not null",
-                "date_added": "text not null",
-            },
-        )
-        # Creating the allowlist table
-        self.db.create_table(
-            "allow_list",
-            {
-                "group_id": "text primary key not null",
-            },
-        )
+        self.db = DatabaseManger.shared("bot_db.sqlite")
+
+        # Creating (or upgrading) the 'bot_users' and 'allow_list' tables, with their indexes.
+        migrate(self.db)
+
+        # In-memory snapshots of the blocked users and the allowed groups ids, kept up to date by the write methods,
+        ## so the per-update checks are lookups with no SQL.
+        self._lock = Condition()
+        self.load_snapshots()
+        # The snapshots are reloaded if a transaction() grouping the write methods is rolled back.
+        self.db.on_rollback(self.load_snapshots)
+
+    def load_snapshots(self) -> None:
+        """This method (re)loads the blocked users and the allowed groups snapshots from the database."""
+        with self._lock:
+            # Dict[user id: ban expiry unix time, None for the permanent bans].
+            self._blocked_users = {
+                row[0]: row[1]
+                for row in self.db.query(f"SELECT user_id, expires_at FROM {self.table_name}").fetchall()
+            }
+            # Heap[(ban expiry, user id)] of the temporary bans, entries no longer matching the snapshot are skipped.
+            self._expiries = [
+                (expires_at, user_id) for user_id, expires_at in self._blocked_users.items() if expires_at
+            ]
+            heapq.heapify(self._expiries)
+            self._allowed_groups = {row[0] for row in self.db.select("allow_list").fetchall()}
+            self._lock.notify_all()
+
+    @contextmanager
+    def _write(self):
+        """Runs a write and its snapshots update, holding the database write lock, then the snapshots lock.
+
+        A transaction() scope grouping the write methods takes the database write lock first, so every writer takes
+        the locks in that order, a writer holding the snapshots lock never waits for the database.
+        """
+        with self.db.transaction(), self._lock:
+            yield
 
     def add_user(self, user_id: str, block_type: str) -> None:
         """_summary_ : This methods adds users to the database.
@@ -80,11 +121,31 @@ class UsersDatabase(IPersistenceLayer):
         """
         # Getting the current date to be added as an attribute to the user record
         date = datetime.now().strftime("%Y/%m/%d, %H:%M:%S")
-        # Added the user to the database
-        self.db.add(
-            self.table_name,
-            {"user_id": user_id, "block_type": block_type, "date_added": date},
-        )
+        expires_at = self.expiry(block_type)
+        # Added the user to the database, replacing an expired ban not cleaned yet, and to the blocked users snapshot
+        with self._write():
+            self.db.query(
+                f"""
+                INSERT INTO {self.table_name} (user_id, block_type, date_added, expires_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    block_type = excluded.block_type,
+                    date_added = excluded.date_added,
+                    expires_at = excluded.expires_at
+                """,
+                (str(user_id), block_type, date, expires_at),
+            )
+            self._set_blocked(str(user_id), expires_at)
+
+    def expiry(self, block_type: str) -> int:
+        """Returns the expiry unix time of a ban starting now, None for the permanent bans."""
+        return int(time.time()) + self.temp_ban_duration if block_type == "temp" else None
+
+    def _set_blocked(self, user_id: str, expires_at: int) -> None:
+        """Updates the blocked users snapshot, and wakes the cleaner up, must be called with the lock held."""
+        self._blocked_users[user_id] = expires_at
+        if expires_at:
+            heapq.heappush(self._expiries, (expires_at, user_id))
+            self._lock.notify_all()
 
     def add_to_allow_list(self, group_id: str) -> None:
         """_summary_ : This methods adds users to the database.
@@ -94,11 +155,53 @@ class UsersDatabase(IPersistenceLayer):
         group_id : str
             _description_ : group_id to allow
         """
-        # Adds the user to the database
-        self.db.add(
-            "allow_list",
-            {"group_id": group_id},
-        )
+        date = datetime.now().strftime("%Y/%m/%d, %H:%M:%S")
+        # Adds the group to the database, and to the allowed groups snapshot
+        with self._write():
+            self.db.add(
+                "allow_list",
+                {"group_id": group_id, "date_added": date},
+            )
+            self._allowed_groups.add(str(group_id))
+
+    def add_users(self, user_ids: list[str], block_type: str) -> None:
+        """_summary_ : This methods adds many users to the database, with a single commit.
+
+        Parameters
+        ----------
+        user_ids : list[str]
+            _description_ : users ids.
+        block_type : str
+            _description_ : 'perm' for permanently block | 'temp' for temporary block
+        """
+        date = datetime.now().strftime("%Y/%m/%d, %H:%M:%S")
+        expires_at = self.expiry(block_type)
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        with self._write():
+            self.db.upsert_many(
+                self.table_name,
+                [
+                    {"user_id": user_id, "block_type": block_type, "date_added": date, "expires_at": expires_at}
+                    for user_id in user_ids
+                ],
+                conflict_columns=["user_id"],
+            )
+            for user_id in user_ids:
+                self._set_blocked(user_id, expires_at)
+
+    def add_to_allow_list_many(self, group_ids: list[str]) -> None:
+        """_summary_ : This methods adds many groups to the allow list, with a single commit.
+
+        Parameters
+        ----------
+        group_ids : list[str]
+            _description_ : groups ids to allow
+        """
+        date = datetime.now().strftime("%Y/%m/%d, %H:%M:%S")
+        group_ids = list(dict.fromkeys(str(group_id) for group_id in group_ids))
+        with self._write():
+            self.db.add_many("allow_list", [{"group_id": group_id, "date_added": date} for group_id in group_ids])
+            self._allowed_groups.update(group_ids)
 
     def get_user(
         self, user_id: str = None, block_type: str = None, order_by: str = None
@@ -162,10 +265,14 @@ class UsersDatabase(IPersistenceLayer):
         block_type : str
             _description_ : The block type of the user perm for permanent | temp for temporary
         """
-        # Sending the update statement to the database
-        self.db.update(
-            self.table_name, {"user_id": user_id}, {"block_type": block_type}
-        )
+        expires_at = self.expiry(block_type)
+        # Sending the update statement to the database, a ban turned temporary ends after the usual duration
+        with self._write():
+            self.db.update(
+                self.table_name, {"user_id": user_id}, {"block_type": block_type, "expires_at": expires_at}
+            )
+            if str(user_id) in self._blocked_users:
+                self._set_blocked(str(user_id), expires_at)
 
     def delete(self, user_id: str):
         """_summary_ : This method deletes user from the database using his user_id as a criteria.
@@ -175,8 +282,10 @@ class UsersDatabase(IPersistenceLayer):
         user_id : str
             _description_ : user's user_id.
         """
-        # Deleting the user record using his user_id as a filter criteria
-        self.db.delete(self.table_name, {"user_id": user_id})
+        # Deleting the user record using his user_id as a filter criteria, and from the blocked users snapshot
+        with self._write():
+            self.db.delete(self.table_name, {"user_id": user_id})
+            self._blocked_users.pop(str(user_id), None)
 
     def delete_group(self, group_id: str):
         """_summary_ : This method deletes group from the database using his group_id as a criteria.
@@ -186,5 +295,97 @@ class UsersDatabase(IPersistenceLayer):
         group_id : str
             _description_ : group's id.
         """
-        # Deleting the user record using his user_id as a filter criteria
-        self.db.delete("allow_list", {"group_id": group_id})
+        # Deleting the group record using its group_id as a filter criteria, and from the allowed groups snapshot
+        with self._write():
+            self.db.delete("allow_list", {"group_id": group_id})
+            self._allowed_groups.discard(str(group_id))
+
+    def delete_users(self, user_ids: list[str]) -> None:
+        """_summary_ : This method deletes many users from the database, with a single commit.
+
+        Parameters
+        ----------
+        user_ids : list[str]
+            _description_ : users ids.
+        """
+        user_ids = [str(user_id) for user_id in user_ids]
+        with self._write():
+            self.db.delete_many(self.table_name, [{"user_id": user_id} for user_id in user_ids])
+            for user_id in user_ids:
+                self._blocked_users.pop(user_id, None)
+
+    def delete_groups(self, group_ids: list[str]) -> None:
+        """_summary_ : This method deletes many groups from the allow list, with a single commit.
+
+        Parameters
+        ----------
+        group_ids : list[str]
+            _description_ : groups ids.
+        """
+        group_ids = [str(group_id) for group_id in group_ids]
+        with self._write():
+            self.db.delete_many("allow_list", [{"group_id": group_id} for group_id in group_ids])
+            self._allowed_groups.difference_update(group_ids)
+
+    def is_blocked(self, user_id: str) -> bool:
+        """_summary_ : This method checks if a user is blocked, from the in-memory snapshot.
+
+        Parameters
+        ----------
+        user_id : str
+            _description_ : user's user_id.
+
+        Returns
+        -------
+        bool
+            _description_ : True if the user is in the block list.
+        """
+        # The lookup is lazy about expiry, a ban not cleaned yet stops blocking right when it expires.
+        expires_at = self._blocked_users.get(str(user_id), 0)
+        return expires_at is None or expires_at > time.time()
+
+    def _next_expiry(self) -> int:
+        """Returns the next ban expiry, None if there are no temporary bans, must be called with the lock held."""
+        # Dropping the heap entries of the bans deleted or changed since.
+        while self._expiries and self._blocked_users.get(self._expiries[0][1]) != self._expiries[0][0]:
+            heapq.heappop(self._expiries)
+        return self._expiries[0][0] if self._expiries else None
+
+    def delete_expired(self) -> int:
+        """_summary_ : This method deletes the expired temporary bans, with a single indexed 'DELETE'.
+
+        Returns
+        -------
+        int
+            _description_ : The next ban expiry unix time, None if there are no temporary bans left.
+        """
+        now = int(time.time())
+        with self._write():
+            self.db.query(f"DELETE FROM {self.table_name} WHERE expires_at <= ?", (now,))
+            # Popping only the expired bans from the snapshot, the cost doesn't grow with the bans count.
+            while (expires_at := self._next_expiry()) is not None and expires_at <= now:
+                _, user_id = heapq.heappop(self._expiries)
+                del self._blocked_users[user_id]
+            return self._next_expiry()
+
+    def wait_for_expiry(self) -> None:
+        """_summary_ : This method blocks until the next ban expires, an earlier new ban shortens the wait."""
+        with self._lock:
+            while (expires_at := self._next_expiry()) is None or expires_at > time.time():
+                # Waiting until the expiry, or until a new ban wakes the cleaner up.
+                self._lock.wait(None if expires_at is None else expires_at - time.time())
+
+    def is_allowed_group(self, group_id: str) -> bool:
+        """_summary_ : This method checks if a group is allowed, from the in-memory snapshot.
+
+        Parameters
+        ----------
+        group_id : str
+            _description_ : group's id.
+
+        Returns
+        -------
+        bool
+            _description_ : True if the group is in the allow list.
+        """
+        return str(group_id) in self._allowed_groups
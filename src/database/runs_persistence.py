@@ -0,0 +1,89 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing json to store the stages durations.
+import json
+
+# Importing time to prune the old runs.
+import time
+
+# Added the database manger (Receiver) to use it in the pipeline runs persistence layer.
+from database.db_manger import DatabaseManger
+
+# Importing the migrations to create the pipeline runs table.
+from database.migrations import migrate
+
+
+# The pipeline runs table columns, in order.
+RUN_COLUMNS = (
+    "run_id",
+    "trigger",
+    "query",
+    "status",
+    "started_at",
+    "duration",
+    "cards_found",
+    "details_fetched",
+    "cache_hits",
+    "gemini_calls",
+    "messages_sent",
+    "rate_limited",
+    "stages",
+)
+
+
+class RunsDatabase:
+    """_summary_ : This class stores the history of the jobs pipeline runs (channel updates, saved searches, /ljobs)."""
+
+    def __init__(self, keep_for: int = 2592000) -> None:
+        """_summary_ : This migrates the database to get the 'pipeline_runs' table.
+
+        Parameters
+        ----------
+        keep_for : int, optional
+            _description_, by default 2592000 (30 days) : The number of seconds a run is kept in the history.
+        """
+        self.keep_for = keep_for
+        self.db = DatabaseManger.shared("bot_db.sqlite")
+
+        # Creating (or upgrading) the 'pipeline_runs' table.
+        migrate(self.db)
+
+    def add_run(self, run: dict) -> None:
+        """_summary_ : This method records a finished run, and forgets the runs older than 'keep_for'.
+
+        Parameters
+        ----------
+        run : dict
+            _description_ : The run columns values (but the run id), the 'stages' as a dict of durations.
+        """
+        row = dict(run, stages=json.dumps(run["stages"]))
+        with self.db.transaction():
+            self.db.add("pipeline_runs", row)
+            self.db.query("DELETE FROM pipeline_runs WHERE started_at < ?", (time.time() - self.keep_for,))
+
+    def get_runs(self, trigger: str = None, limit: int = 100) -> list[dict]:
+        """_summary_ : This method returns the latest runs.
+
+        Parameters
+        ----------
+        trigger : str, optional
+            _description_, by default None : Only the runs with this trigger, all of them if not provided.
+        limit : int, optional
+            _description_, by default 100 : The maximum number of runs.
+
+        Returns
+        -------
+        list[dict]
+            _description_ : The runs, the latest first, the 'stages' as a dict of durations.
+        """
+        where, values = ("WHERE trigger = ?", (trigger,)) if trigger else ("", ())
+        rows = self.db.query(
+            f"SELECT * FROM pipeline_runs {where} ORDER BY started_at DESC LIMIT ?", (*values, limit)
+        ).fetchall()
+
+        runs = []
+        for row in rows:
+            run = dict(zip(RUN_COLUMNS, row))
+            run["stages"] = json.loads(run["stages"])
+            runs.append(run)
+        return runs
@@ -0,0 +1,75 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing time to stamp the registrations.
+import time
+
+# Added the database manger (Receiver) to use it in the scheduler persistence layer.
+from database.db_manger import DatabaseManger
+
+# Importing the migrations to create the scheduled jobs table.
+from database.migrations import migrate
+
+
+class SchedulerDatabase:
+    """_summary_ : This class stores the last run of each scheduled job, it outlives the bot restarts."""
+
+    def __init__(self) -> None:
+        """_summary_ : This migrates the database to get the 'scheduled_jobs' table."""
+        self.db = DatabaseManger.shared("bot_db.sqlite")
+
+        # Creating (or upgrading) the 'scheduled_jobs' table.
+        migrate(self.db)
+
+    def register(self, name: str) -> dict:
+        """_summary_ : This method registers a scheduled job, and returns its state.
+
+        Parameters
+        ----------
+        name : str
+            _description_ : The scheduled job name, it must stay the same across restarts.
+
+        Returns
+        -------
+        dict
+            _description_ : The job's 'registered_at', 'last_started', 'last_finished' and 'last_status'.
+        """
+        self.db.add("scheduled_jobs", {"name": name, "registered_at": time.time()})
+        row = self.db.query(
+            "SELECT registered_at, last_started, last_finished, last_status FROM scheduled_jobs WHERE name = ?",
+            (name,),
+        ).fetchone()
+        return dict(zip(("registered_at", "last_started", "last_finished", "last_status"), row))
+
+    def record_run(
+        self, name: str, status: str, started_at: float, finished_at: float = None, due_at: float = None
+    ) -> None:
+        """_summary_ : This method records a run of a scheduled job, registering it if needed.
+
+        Parameters
+        ----------
+        name : str
+            _description_ : The scheduled job name.
+        status : str
+            _description_ : 'running' | 'ok' | 'timeout' | 'aborted' | 'checkpointed' | the exception name.
+        started_at : float
+            _description_ : The run's start unix time.
+        finished_at : float, optional
+            _description_, by default None : The run's end unix time, None while running.
+        due_at : float, optional
+            _description_, by default None : The unix time the run was due at, None for the runs started on demand.
+        """
+        self.db.upsert_many(
+            "scheduled_jobs",
+            [
+                {
+                    "name": name,
+                    "registered_at": started_at,
+                    "last_started": started_at,
+                    "last_finished": finished_at,
+                    "last_status": status,
+                    "last_due": due_at,
+                }
+            ],
+            conflict_columns=["name"],
+            update_columns=["last_started", "last_finished", "last_status", "last_due"],
+        )
@@ -0,0 +1,233 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing datetime to add the time the subscription was added to the database.
+from datetime import datetime
+
+# Importing time to stamp and prune the delivered jobs.
+import time
+
+# Importing the jobs ids, the same job gets a new tracking link on every scrape.
+from database.job_ids import job_id
+
+# Added the database manger (Receiver) to use it in the subscriptions persistence layer.
+from database.db_manger import DatabaseManger
+
+# Importing the migrations to create the subscriptions tables.
+from database.migrations import migrate
+
+
+class SubscriptionLimitReached(Exception):
+    """Raised when saving a search would go over the saved searches limits, its message can be shown to the user."""
+
+
+class SubscriptionsDatabase:
+    """_summary_ : This class stores the chats saved searches, and the jobs already delivered to each chat."""
+
+    def __init__(self) -> None:
+        """_summary_ : This migrates the database to get the 'subscriptions' and 'delivered_jobs' tables."""
+        self.db = DatabaseManger.shared("bot_db.sqlite")
+
+        # Creating (or upgrading) the 'subscriptions' and 'delivered_jobs' tables.
+        migrate(self.db)
+
+    def add_subscription(
+        self, chat_id: str, job_title: str, location: str, max_per_chat: int = None, max_searches: int = None
+    ) -> None:
+        """_summary_ : This method saves a search for a chat, within the saved searches limits.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The subscribed chat id.
+        job_title : str
+            _description_ : The normalized job title.
+        location : str
+            _description_ : The normalized location.
+        max_per_chat : int, optional
+            _description_, by default None : The number of searches a chat can save, no limit if not provided.
+        max_searches : int, optional
+            _description_, by default None : The number of distinct searches all the chats can save, each one is
+                scrapped every run, no limit if not provided.
+
+        Raises
+        ------
+        SubscriptionLimitReached
+            _description_ : If the chat or the bot has too many saved searches.
+        """
+        # Getting the current date to be added as an attribute to the subscription record.
+        date = datetime.now().strftime("%Y/%m/%d, %H:%M:%S")
+
+        # Checking the limits and saving the search with a single commit, so concurrent saves can't go over them.
+        with self.db.transaction():
+            # Saving a search the chat already has changes nothing, it doesn't count against the limits.
+            if self.db.query(
+                "SELECT 1 FROM subscriptions WHERE chat_id = ? AND job_title = ? AND location = ?",
+                (chat_id, job_title, location),
+            ).fetchone():
+                return
+
+            if max_per_chat:
+                count = self.db.query("SELECT count(*) FROM subscriptions WHERE chat_id = ?", (chat_id,)).fetchone()[0]
+                if count >= max_per_chat:
+                    raise SubscriptionLimitReached(
+                        f"This chat already has {max_per_chat} saved searches, remove one with /unsubscribe first."
+                    )
+
+            # A search another chat saved doesn't cost another scrape, only the new distinct searches are limited.
+            if max_searches and not self.db.query(
+                "SELECT 1 FROM subscriptions WHERE job_title = ? AND location = ?", (job_title, location)
+            ).fetchone():
+                count = self.db.query(
+                    "SELECT count(*) FROM (SELECT DISTINCT job_title, location FROM subscriptions)"
+                ).fetchone()[0]
+                if count >= max_searches:
+                    raise SubscriptionLimitReached(
+                        "The bot can't follow more searches for now, please try again later or subscribe to an existing one."
+                    )
+
+            self.db.add(
+                "subscriptions",
+                {"chat_id": chat_id, "job_title": job_title, "location": location, "date_added": date},
+            )
+
+    def get_subscriptions(self, chat_id: str = None) -> list:
+        """_summary_ : This method selects the saved searches.
+
+        Parameters
+        ----------
+        chat_id : str, optional
+            _description_, by default None : The chat to get the saved searches of, all the chats if not provided.
+
+        Returns
+        -------
+        list
+            _description_ : A list of tuples (subscription_id, chat_id, job_title, location, date_added).
+        """
+        select_criteria = {"chat_id": chat_id} if chat_id else None
+        return self.db.select(
+            "subscriptions", criteria=select_criteria, order_by="subscription_id"
+        ).fetchall()
+
+    def delete_subscription(self, chat_id: str, subscription_id: int) -> bool:
+        """_summary_ : This method deletes a chat's saved search.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The subscribed chat id, a chat can only delete its own saved searches.
+        subscription_id : int
+            _description_ : The saved search id.
+
+        Returns
+        -------
+        bool
+            _description_ : True if the saved search was deleted, False if the chat has no saved search with this id.
+        """
+        return self.db.delete("subscriptions", {"chat_id": chat_id, "subscription_id": subscription_id}).rowcount > 0
+
+    @staticmethod
+    def job_id(apply_link: str) -> str:
+        """Returns the job's id, its LinkedIn job id (see database.job_ids)."""
+        return job_id(apply_link)
+
+    def deliver_jobs(
+        self, chat_id: str, jobs: list[dict], keep_for: int = 604800, claim_for: int = 3600
+    ) -> list[dict]:
+        """_summary_ : This method claims the jobs a chat didn't get yet, and returns them.
+
+        The claimed deliveries are pending until confirm_deliveries() records the sent jobs, and releases the others.
+        A claim never confirmed (eg. the bot crashed while sending) is released after claim_for seconds.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The subscribed chat id.
+        jobs : list[dict]
+            _description_ : The jobs matching the chat's saved searches.
+        keep_for : int, optional
+            _description_, by default 604800 (a week) : The number of seconds a delivery is remembered,
+                it must be longer than the scrapper's fetch interval.
+        claim_for : int, optional
+            _description_, by default 3600 (an hour) : The number of seconds a pending delivery is kept.
+
+        Returns
+        -------
+        list[dict]
+            _description_ : The jobs never delivered to the chat before, in the given order.
+        """
+        date = time.time()
+
+        # Checking and claiming the deliveries with a single commit, so a concurrent run can't deliver them twice.
+        with self.db.transaction():
+            # Forgetting the old deliveries, the scrapper won't find these jobs again.
+            self.db.query("DELETE FROM delivered_jobs WHERE delivered_at < ?", (date - keep_for,))
+            # Releasing the claims left by a run that never confirmed them.
+            self.db.query("DELETE FROM delivered_jobs WHERE pending = 1 AND delivered_at < ?", (date - claim_for,))
+            delivered = {
+                row[0] for row in self.db.query("SELECT job_id FROM delivered_jobs WHERE chat_id = ?", (chat_id,))
+            }
+
+            new_jobs = []
+            for job in jobs:
+                job_id = self.job_id(job["apply_link"])
+                if job_id not in delivered:
+                    delivered.add(job_id)
+                    new_jobs.append((job_id, job))
+
+            self.db.add_many(
+                "delivered_jobs",
+                [{"chat_id": chat_id, "job_id": job_id, "delivered_at": date, "pending": 1} for job_id, _ in new_jobs],
+            )
+        return [job for _, job in new_jobs]
+
+    def confirm_deliveries(self, chat_id: str, claimed_links: list[str], sent_links: list[str]) -> None:
+        """_summary_ : This method records the claimed jobs that were sent as delivered, and releases the others.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The subscribed chat id.
+        claimed_links : list[str]
+            _description_ : The apply links of the jobs deliver_jobs() claimed.
+        sent_links : list[str]
+            _description_ : The apply links of the claimed jobs that were sent, the others are sent again next run.
+        """
+        sent = {self.job_id(link) for link in sent_links}
+        released = {self.job_id(link) for link in claimed_links} - sent
+
+        with self.db.transaction():
+            if sent:
+                self.db.query(
+                    f"UPDATE delivered_jobs SET pending = 0, delivered_at = ? "
+                    f"WHERE chat_id = ? AND job_id IN ({', '.join('?' * len(sent))})",
+                    (time.time(), chat_id, *sent),
+                )
+            if released:
+                self.db.query(
+                    f"DELETE FROM delivered_jobs WHERE pending = 1 AND chat_id = ? AND job_id IN ({', '.join('?' * len(released))})",
+                    (chat_id, *released),
+                )
+
+    def delivered_links(self, chat_id: str, apply_links: list[str]) -> set[str]:
+        """_summary_ : This method returns the apply links of the jobs delivered (or being delivered) to a chat, among the given ones.
+
+        Parameters
+        ----------
+        chat_id : str
+            _description_ : The chat id.
+        apply_links : list[str]
+            _description_ : The jobs apply links.
+
+        Returns
+        -------
+        set[str]
+            _description_ : The apply links already delivered to the chat.
+        """
+        ids = {self.job_id(link): link for link in apply_links}
+        if not ids:
+            return set()
+        rows = self.db.query(
+            f"SELECT job_id FROM delivered_jobs WHERE chat_id = ? AND job_id IN ({', '.join('?' * len(ids))})",
+            (chat_id, *ids),
+        ).fetchall()
+        return {ids[row[0]] for row in rows}
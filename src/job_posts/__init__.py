@@ -1 +1 @@
-from .job_post_factory import channel_jobs_updater
+from .job_post_factory import channel_jobs_preparer, channel_jobs_trickle, channel_jobs_updater, resume_checkpointed_posts
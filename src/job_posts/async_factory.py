@@ -0,0 +1,286 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing asyncio to run the scrapes and the sends concurrently.
+import asyncio
+
+# Importing time to measure the top-up window.
+import time
+
+# Importing datetime to log the failed scrapes and deliveries.
+from datetime import datetime
+
+# Importing Callable for type hinting.
+from typing import Callable
+
+# Importing the async bot for type hinting.
+from telebot.async_telebot import AsyncTeleBot
+
+# Importing the jobs index and subscriptions commands, they run on worker threads to keep the event loop free.
+from database import (
+    AddJobsCommand,
+    ConfirmDeliveriesCommand,
+    DeliverJobsCommand,
+    GetDeliveredJobsCommand,
+    GetSubscriptionsCommand,
+)
+
+# Importing the async scrapper.
+from .async_scrapper import AsyncLinkedinScrapper
+
+# Importing the async senders.
+from .async_sender import send_digest_posts_async, send_job_posts_async
+
+# Importing the jobs factory settings and helpers shared with the threads runtime.
+from .job_post_factory import (
+    CHANNEL_ID,
+    CHANNEL_PREPARE_LEAD,
+    JOBS_RETENTION,
+    POST_MODE,
+    POST_MODES,
+    TRICKLE_WINDOW,
+    channel_batch,
+    coverage_key,
+    post_creator,
+    post_links,
+    search_cache,
+    search_key,
+)
+
+# Importing the prepared batch to render the channel posts ahead of the post time.
+from .prepared_batch import PreparedBatch
+
+# Importing the pipeline run recorder to record the runs and time the stages.
+from .pipeline_runs import pipeline_run, stage
+
+# Importing the subscription matcher to plan the saved searches scrapes and route their jobs.
+from .subscription_matcher import Subscription, SubscriptionMatcher
+
+
+# Mapping each post mode to its async post sender.
+ASYNC_POST_SENDERS = {
+    "full": send_job_posts_async,
+    "digest": send_digest_posts_async,
+}
+
+
+async def scrape_async(
+    search_params: tuple[str, str] = None,
+    fetch_interval: int = None,
+    skip_known: Callable[[list[str]], set[str]] = None,
+) -> list[dict]:
+    """_summary_ : This function scraps linkedin with the async scrapper, like job_scrapper.
+
+    Parameters
+    ----------
+    search_params : tuple[str, str], optional
+        _description_, by default None : The (job title, location) to search for, the defaults are used if not provided.
+    fetch_interval : int, optional
+        _description_, by default None : Only the jobs posted in the last ?? seconds, FETCH_JOBS_INTERVAL if not provided.
+    skip_known : Callable[[list[str]], set[str]], optional
+        _description_, by default None : Returns the apply links to skip among the found ones, before fetching their details.
+
+    Returns
+    -------
+    list[dict]
+        _description_ : A list of dicts containing the scrapped jobs data for linkedin.
+    """
+    scrapper = AsyncLinkedinScrapper()
+    if search_params:
+        scrapper.set_search_params(*search_params)
+    if fetch_interval:
+        scrapper.set_fetch_interval(fetch_interval)
+    scrapper.skip_known = skip_known
+
+    await scrapper.scrape_jobs_async()
+    return scrapper.formatted_data
+
+
+async def index_jobs(jobs: list[dict], query_key: str = None) -> None:
+    """Stores the jobs in the local jobs index, a failing index must not lose the scrape."""
+    try:
+        with stage("index"):
+            await asyncio.to_thread(AddJobsCommand(jobs=jobs, query_key=query_key, max_age=JOBS_RETENTION).execute)
+    except Exception as e:
+        print(datetime.now(), f"Indexing the scrapped jobs failed: {e}")
+
+
+async def fetch_jobs_async(search_params: tuple[str, str] = None) -> list[dict]:
+    """_summary_ : This function scraps the jobs of the search, indexes them and warms the search cache, like fetch_jobs(refresh=True).
+
+    Parameters
+    ----------
+    search_params : tuple[str, str], optional
+        _description_, by default None : The (job title, location) to search for, the defaults are used if not provided.
+
+    Returns
+    -------
+    list[dict]
+        _description_ : A list of dicts containing the scrapped jobs data for linkedin.
+    """
+    key = search_key(search_params)
+    jobs = await scrape_async(search_params)
+    await index_jobs(jobs, query_key=coverage_key(key))
+    search_cache.put(key, jobs)
+    return jobs
+
+
+async def publish_job_posts_async(
+    posts: list[dict],
+    bot: AsyncTeleBot,
+    msg=None,
+    channel_id: str = None,
+    post_mode: str = POST_MODE,
+    on_delivered: Callable[[list[dict]], None] = None,
+) -> None:
+    """This function sends the posts using the async sender of the post mode, like publish_job_posts."""
+    await ASYNC_POST_SENDERS[post_mode](posts, bot, msg=msg, channel_id=channel_id, on_delivered=on_delivered)
+
+
+async def deliver_jobs_async(jobs: list[dict], bot: AsyncTeleBot, chat_id: str) -> None:
+    """This function sends a chat the jobs it didn't get yet like deliver_jobs, they're recorded as delivered once sent."""
+    with stage("deliver"):
+        new_jobs = await asyncio.to_thread(DeliverJobsCommand(chat_id=chat_id, jobs=jobs).execute)
+    if not new_jobs:
+        return
+
+    sent_links = []
+    try:
+        with stage("send"):
+            await publish_job_posts_async(
+                post_creator(new_jobs, POST_MODES[POST_MODE][0]),
+                bot,
+                channel_id=chat_id,
+                on_delivered=lambda posts: sent_links.extend(link for post in posts for link in post_links(post)),
+            )
+    finally:
+        # Settling the claims even if the run was cancelled, the sent and checkpointed jobs aren't sent again.
+        with stage("deliver"):
+            await asyncio.to_thread(
+                ConfirmDeliveriesCommand(
+                    chat_id=chat_id, claimed_links=[job["apply_link"] for job in new_jobs], sent_links=sent_links
+                ).execute
+            )
+
+
+async def channel_jobs_preparer_async(bot: AsyncTeleBot) -> None:
+    """_summary_ : This function prepares the channel batch ahead of the post time, like channel_jobs_preparer.
+
+    Parameters
+    ----------
+    bot : AsyncTeleBot
+        _description_ : The async bot instance, unused, the scheduled updaters share their signature.
+    """
+    channel_batch.start()
+    batch = None
+    try:
+        with pipeline_run("prepare", coverage_key(search_key())):
+            started_at = time.time()
+            with stage("fetch"):
+                jobs = await fetch_jobs_async()
+            with stage("posts"):
+                posts = post_creator(data=jobs, creator=POST_MODES[POST_MODE][0])
+            batch = PreparedBatch(posts=posts, links={job["apply_link"] for job in jobs}, started_at=started_at)
+    finally:
+        # A failed prepare phase still wakes up the publish phase, which then scraps by itself.
+        channel_batch.put(batch)
+
+
+async def channel_jobs_updater_async(bot: AsyncTeleBot) -> None:
+    """_summary_ : This function updates the job posting in the channel, like channel_jobs_updater.
+
+    Parameters
+    ----------
+    bot : AsyncTeleBot
+        _description_ : The async bot instance.
+    """
+    with pipeline_run("channel", coverage_key(search_key())):
+        # Waiting for a prepare phase still running on a worker thread, the event loop keeps running meanwhile.
+        batch = None
+        if CHANNEL_PREPARE_LEAD:
+            batch = await asyncio.to_thread(
+                channel_batch.take, max_age=CHANNEL_PREPARE_LEAD * 2, wait=CHANNEL_PREPARE_LEAD
+            )
+
+        if batch is None:
+            with stage("fetch"):
+                jobs = await fetch_jobs_async()
+            with stage("posts"):
+                posts = post_creator(data=jobs, creator=POST_MODES[POST_MODE][0])
+            with stage("send"):
+                await publish_job_posts_async(posts, bot, channel_id=CHANNEL_ID)
+            return
+
+        # Sending the prepared jobs to the channel right away.
+        with stage("send"):
+            await publish_job_posts_async(batch.posts, bot, channel_id=CHANNEL_ID)
+
+        # Sending the jobs posted while the batch was prepared, a failing top-up doesn't fail the published batch.
+        try:
+            with stage("top_up"):
+                jobs = await scrape_async(
+                    fetch_interval=time.time() - batch.started_at + 60,
+                    skip_known=lambda links: batch.links.intersection(links),
+                )
+                await index_jobs(jobs)
+            new_jobs = [job for job in jobs if job["apply_link"] not in batch.links]
+            if new_jobs:
+                with stage("send"):
+                    await publish_job_posts_async(post_creator(new_jobs, POST_MODES[POST_MODE][0]), bot, channel_id=CHANNEL_ID)
+        except Exception as e:
+            print(datetime.now(), f"The channel top-up scrape failed: {e}")
+
+
+async def channel_jobs_trickle_async(bot: AsyncTeleBot) -> None:
+    """_summary_ : This function posts the jobs of the last TRICKLE_WINDOW seconds the channel didn't get, like channel_jobs_trickle.
+
+    Parameters
+    ----------
+    bot : AsyncTeleBot
+        _description_ : The async bot instance.
+    """
+    with pipeline_run("trickle", coverage_key(search_key())):
+        with stage("fetch"):
+            jobs = await scrape_async(
+                fetch_interval=TRICKLE_WINDOW,
+                skip_known=lambda links: GetDeliveredJobsCommand(chat_id=CHANNEL_ID, apply_links=links).execute(),
+            )
+            await index_jobs(jobs)
+
+        # Claiming the jobs before sending them, so an overlapping window never posts them twice.
+        await deliver_jobs_async(jobs, bot, CHANNEL_ID)
+
+
+async def subscriptions_updater_async(bot: AsyncTeleBot) -> None:
+    """_summary_ : This function delivers the saved searches jobs like subscriptions_updater, every search and chat at once.
+
+    Parameters
+    ----------
+    bot : AsyncTeleBot
+        _description_ : The async bot instance.
+    """
+    with pipeline_run("subscriptions", "saved searches"):
+        rows = await asyncio.to_thread(GetSubscriptionsCommand().execute)
+        matcher = SubscriptionMatcher([Subscription.from_row(row) for row in rows])
+
+        # Scrapping every distinct search at once, whatever the number of its subscribers.
+        queries = matcher.queries()
+        with stage("fetch"):
+            results = await asyncio.gather(*(fetch_jobs_async(query) for query in queries), return_exceptions=True)
+
+        found_jobs = {}
+        for search_params, found in zip(queries, results):
+            if isinstance(found, Exception):
+                print(datetime.now(), f"Scrapping the saved search {search_params} failed: {found}")
+                continue
+            found_jobs[search_params] = found
+
+        async def deliver(chat_id: str, chat_jobs: list[dict]) -> None:
+            # Sending each chat only the jobs it didn't get yet, the chats are sent to concurrently.
+            try:
+                await deliver_jobs_async(chat_jobs, bot, chat_id)
+            except Exception as e:
+                print(datetime.now(), f"Delivering the saved searches jobs to {chat_id} failed: {e}")
+
+        await asyncio.gather(
+            *(deliver(chat_id, chat_jobs) for chat_id, chat_jobs in matcher.route(found_jobs).items())
+        )
@@ -0,0 +1,185 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing asyncio to fetch the pages and tag the jobs concurrently.
+import asyncio
+
+# Importing dataclass to create the async linkedin dataclass.
+from dataclasses import dataclass
+
+# Importing datetime to log the failed fetches and Gemini calls.
+from datetime import datetime
+
+# Importing aiohttp to send the requests to linkedin without blocking the event loop.
+import aiohttp
+
+# Importing decouple to get the concurrency limits from the .env file.
+from decouple import config
+
+# Importing the linkedin scrapper, the async scrapper shares its parsing, ranking, formatting and Gemini configuration.
+from .job_scrapper import LinkedinScrapper, gemini
+
+# Importing the pipeline run recorder to count the scrapped jobs and time the scrapping stages.
+from .pipeline_runs import record, stage
+
+
+# Getting the maximum number of concurrent requests to linkedin per scrape.
+ASYNC_FETCH_LIMIT = config("ASYNC_FETCH_LIMIT", default=100, cast=int)
+
+# Getting the maximum number of concurrent Gemini calls per scrape, kept low for the API rate limits.
+ASYNC_GEMINI_LIMIT = config("ASYNC_GEMINI_LIMIT", default=4, cast=int)
+
+# Getting the number of seconds a linkedin request can take.
+ASYNC_FETCH_TIMEOUT = config("ASYNC_FETCH_TIMEOUT", default=30, cast=int)
+
+# The job search cards class.
+CARD_CLASS = "base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card"
+
+
+@dataclass(slots=True)
+class AsyncLinkedinScrapper(LinkedinScrapper):
+    """_summary_ : This data class scraps linkedin like LinkedinScrapper, with the requests and Gemini calls running concurrently.
+
+    The search pages of every location are fetched at once, then the details of every new job, with at most
+    ASYNC_FETCH_LIMIT requests in flight, and the kept jobs are tagged with at most ASYNC_GEMINI_LIMIT calls in flight.
+    scrape_jobs() still runs the whole scrape for the sync callers.
+    """
+
+    def scrape_jobs(self) -> None:
+        """This method runs the async scrape to completion, for the sync callers."""
+        asyncio.run(self.scrape_jobs_async())
+
+    async def scrape_jobs_async(self) -> None:
+        """This method start the scrapping process."""
+        connector = aiohttp.TCPConnector(limit=ASYNC_FETCH_LIMIT)
+        timeout = aiohttp.ClientTimeout(total=ASYNC_FETCH_TIMEOUT)
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"}
+        ) as session:
+            # Stopping if every search waiting for this scrape was cancelled.
+            self.progress.raise_if_cancelled()
+
+            # Collecting the search pages of every location at once.
+            with stage("collect"):
+                await self.collect_data_async(session)
+
+            # Fetching the details of the new jobs at once.
+            with stage("details"):
+                await self.parse_data_async(session)
+
+        # Keeping the most relevant jobs, before spending any Gemini call on them, off the event loop.
+        with stage("rank"):
+            await asyncio.to_thread(self.rank_data)
+
+        # Tagging the kept jobs.
+        with stage("tag"):
+            await self.tag_data_async()
+
+        # Formatting the data.
+        with stage("format"):
+            self.format_data()
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        """This Method returns the page content, empty if the request failed."""
+        try:
+            async with session.get(url) as response:
+                return await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(datetime.now(), f"Fetching {url} failed: {e!r}")
+            return b""
+
+    async def collect_data_async(self, session: aiohttp.ClientSession) -> None:
+        """This Method gets the job cards of every searched location."""
+        urls = [
+            f"https://www.linkedin.com/jobs/search?keywords={self._job_tile}&location={location.strip()}&f_TPR=r{self._fetch_jobs_interval}"
+            for location in self._location.split(",")
+        ]
+        pages = await asyncio.gather(*(self.fetch(session, url) for url in urls))
+
+        # Parsing the pages off the event loop, the other scrapes and the bot updates go on meanwhile.
+        self.raw_data = await asyncio.to_thread(self.find_cards, pages)
+
+        # Reporting the number of job cards found.
+        self.progress.advance("cards_found", len(self.raw_data))
+        record("cards_found", len(self.raw_data))
+
+    def find_cards(self, pages: list[bytes]) -> list:
+        """This Method returns the job cards of the search pages."""
+        # Importing BeautifulSoup here, so the bot starts without loading it.
+        from bs4 import BeautifulSoup
+
+        cards = []
+        for page in pages:
+            cards.extend(BeautifulSoup(page, "html.parser").find_all("div", class_=CARD_CLASS))
+        return cards
+
+    def unique_cards(self) -> dict[str, tuple[str, str, str, str]]:
+        """This Method returns the parsed job cards by their apply link, the jobs found twice are kept once."""
+        cards = {}
+        for job in self.raw_data:
+            card = self.parse_card(job)
+            cards.setdefault(card[3], card)
+        return cards
+
+    async def parse_data_async(self, session: aiohttp.ClientSession) -> None:
+        """This Method fetches the details of the found jobs, but the known ones and the ones found twice."""
+        cards = await asyncio.to_thread(self.unique_cards)
+
+        # Skipping the known jobs, with a single lookup for every location, off the event loop (it may query the database).
+        if self.skip_known:
+            for apply_link in await asyncio.to_thread(self.skip_known, list(cards)):
+                del cards[apply_link]
+
+        async def details(card: tuple[str, str, str, str]) -> tuple:
+            page_source = await self.fetch(session, card[3])
+            # Stopping if every search waiting for this scrape was cancelled.
+            self.progress.raise_if_cancelled()
+            self.progress.advance("details_fetched")
+            record("details_fetched")
+            # Parsing the page off the event loop, the other pages are fetched meanwhile.
+            job_description_md, timestamp, ago_text = await asyncio.to_thread(self.parse_details, page_source)
+            job_title, job_company, job_location, apply_link = card
+            return job_title, job_company, job_location, job_description_md, apply_link, timestamp.astimezone(), ago_text
+
+        # Keeping the cards order, the ranker breaks its ties with it.
+        self.candidates.extend(await asyncio.gather(*(details(card) for card in cards.values())))
+
+    async def tag_data_async(self) -> None:
+        """This Method gets the AI tags of the ranked candidates."""
+        semaphore = asyncio.Semaphore(ASYNC_GEMINI_LIMIT)
+
+        async def tag(candidate: tuple) -> tuple:
+            job_title, job_company, job_location, job_description_md, apply_link, timestamp, ago_text = candidate
+            async with semaphore:
+                # Stopping if every search waiting for this scrape was cancelled.
+                self.progress.raise_if_cancelled()
+                ai_tags = await self.get_ai_tags_async(job_title, job_company, job_location, job_description_md)
+            self.progress.advance("tagged")
+            return job_title, job_company, job_location, self.replace_md_spaces(job_description_md), apply_link, timestamp, ago_text, ai_tags
+
+        self.parsed_data.extend(await asyncio.gather(*(tag(candidate) for candidate in self.candidates)))
+
+    async def get_ai_tags_async(self, job_title, job_company, job_location, job_description_md) -> str:
+        """This Method gets the AI tags of a job, like get_ai_tags() without blocking the event loop."""
+        # Importing the Gemini API exceptions here, with google.generativeai.
+        from google.api_core.exceptions import ResourceExhausted, TooManyRequests
+
+        model = gemini().GenerativeModel("gemini-1.5-flash-latest")
+        prompt = self.ai_tags_prompt(job_title, job_company, job_location, job_description_md)
+        try:
+            record("gemini_calls")
+            response = await model.generate_content_async(prompt)
+            if len(response.parts) == 0:
+                return ""
+            return self.split_response_to_tags(response.parts[0].text)
+        except ResourceExhausted:
+            record("rate_limited")
+            print(datetime.now(), "Gemini Resource Exhausted, switching tokens")
+            self.switchGeminiToken()
+        except TooManyRequests:
+            record("rate_limited")
+            retry_after = 60
+            print(datetime.now(), f"Too many requests to Gemini API, sleeping for {retry_after} seconds")
+            await asyncio.sleep(retry_after)
+        except Exception as e:
+            print(datetime.now(), f"An unexpected error occurred while getting AI Tags: {e}")
+        return ""
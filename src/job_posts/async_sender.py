@@ -0,0 +1,206 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing asyncio to send the posts without blocking the event loop.
+import asyncio
+
+# Importing datetime to log the rate limits and the skipped messages.
+from datetime import datetime
+
+# Importing Awaitable & Callable for type hinting.
+from typing import Awaitable, Callable
+
+# Importing the async bot and its API exception.
+from telebot.async_telebot import AsyncTeleBot
+from telebot.asyncio_helper import ApiTelegramException
+
+# Importing telegram API Message object for type hinting.
+from telebot.types import Message
+
+# Importing the inline keyboards of the job posts and digests.
+from tgbot import jobs_digest_inline_kb, jobs_post_inline_kb
+
+# Importing the bot lifecycle, the posts left past the shutdown deadline are checkpointed instead of sent.
+from tgbot.utilities.lifecycle import lifecycle
+
+# Importing the current scheduled run, a run aborted once its posts are checkpointed isn't caught up.
+from tgbot.utilities.scheduler import current_scheduled_run
+
+# Importing the Markdown splitter, the digest details store and the checkpoint shared with the sync senders.
+from .job_post_sender import checkpoint_posts, job_details_store, split_markdown
+
+# Importing the pipeline run recorder to count the sent messages and the rate limits.
+from .pipeline_runs import record
+
+
+# Delay in seconds between two messages to the same chat.
+DELAY_BETWEEN_MESSAGES = 1
+
+# Dict[chat id: lock], a chat gets its posts one at a time and in order, while the chats are sent to concurrently.
+_chat_locks: dict[str, asyncio.Lock] = {}
+
+
+def chat_lock(chat_id: str) -> asyncio.Lock:
+    """Returns the lock of a chat, created on its first send."""
+    return _chat_locks.setdefault(str(chat_id), asyncio.Lock())
+
+
+async def send_message(bot: AsyncTeleBot, retry: bool = False, **kwargs) -> bool:
+    """_summary_ : This function sends a message, waiting out the rate limits.
+
+    Parameters
+    ----------
+    bot : AsyncTeleBot
+        _description_ : The async bot instance.
+    retry : bool, optional
+        _description_, by default False : True to send the message again after a rate limit, False to skip it.
+    kwargs : dict
+        _description_ : The send_message arguments.
+
+    Returns
+    -------
+    bool
+        _description_ : True if the message was sent.
+    """
+    while True:
+        try:
+            await bot.send_message(parse_mode="Markdown", disable_web_page_preview=True, **kwargs)
+            record("messages_sent")
+            await asyncio.sleep(DELAY_BETWEEN_MESSAGES)
+            return True
+        except ApiTelegramException as e:
+            if e.error_code == 429:
+                record("rate_limited")
+                # Extract retry-after time from the exception and wait
+                retry_after = int(e.result_json["parameters"]["retry_after"])
+                print(datetime.now(), f"Rate limited, sleeping for {retry_after} seconds")
+                await asyncio.sleep(retry_after)
+                if not retry:
+                    return False
+            elif e.error_code == 400:
+                print(datetime.now(), "Formatting error, skipping message")
+                return False
+            else:
+                raise e
+
+
+async def send_posts(
+    posts: list[dict],
+    chat_id: str,
+    post_mode: str,
+    send_post: Callable[[dict], Awaitable[None]],
+    on_delivered: Callable[[list[dict]], None] = None,
+) -> None:
+    """_summary_ : This function sends the posts one after the other, and checkpoints the posts left on shutdown.
+
+    Past the shutdown deadline, the posts left are stored instead of sent. A send cancelled by the shutdown (the
+    scheduled run is aborted) still finishes the post it's sending, so no post is cut or sent twice on restart.
+
+    Parameters
+    ----------
+    posts : list[dict]
+        _description_ : The posts to send.
+    chat_id : str
+        _description_ : The chat the posts are sent to.
+    post_mode : str
+        _description_ : The post mode the posts were created with ('full' | 'digest').
+    send_post : Callable[[dict], Awaitable[None]]
+        _description_ : Sends a post.
+    on_delivered : Callable[[list[dict]], None], optional
+        _description_, by default None : Called with the posts sent, skipped for a formatting error, or checkpointed.
+    """
+    for index, post in enumerate(posts):
+        # Past the shutdown deadline, storing the posts left instead of sending them.
+        if lifecycle.expired.is_set():
+            await asyncio.to_thread(checkpoint_posts, chat_id, post_mode, posts[index:])
+            if on_delivered:
+                on_delivered(posts[index:])
+            return
+
+        sending = asyncio.ensure_future(send_post(post))
+        try:
+            await asyncio.shield(sending)
+        except asyncio.CancelledError:
+            await sending
+            await asyncio.to_thread(checkpoint_posts, chat_id, post_mode, posts[index + 1 :])
+            if on_delivered:
+                on_delivered(posts[index:])
+            if run := current_scheduled_run():
+                run.checkpointed = True
+            raise
+
+        if on_delivered:
+            on_delivered([post])
+
+
+async def send_job_posts_async(
+    posts: list[dict],
+    bot: AsyncTeleBot,
+    msg: Message = None,
+    channel_id: str = None,
+    on_delivered: Callable[[list[dict]], None] = None,
+) -> None:
+    """Loops over the provided job post list and send each post in a separate message, like send_job_posts.
+
+    Parameters
+    ----------
+    posts : list[dict]
+        The list of job posts created by the telegram post creator.
+    bot : AsyncTeleBot
+        The async bot instance.
+    msg : Message
+        The Message Object.
+    channel_id : str, optional
+        The channel id, by default None.
+    on_delivered : Callable[[list[dict]], None], optional
+        Called with the posts sent, skipped for a formatting error, or checkpointed for the next start, by default None.
+    """
+    chat_id = channel_id or msg.chat.id
+
+    async def send_post(post: dict) -> None:
+        chunks = split_markdown(post["job_details"])
+        async with chat_lock(chat_id):
+            for index, chunk in enumerate(chunks):
+                # Only the last chunk gets the apply button.
+                reply_markup = jobs_post_inline_kb(post["job_link"]) if index == len(chunks) - 1 else None
+                # Sending the same chunk again after a rate limit, so the post isn't cut.
+                await send_message(bot, retry=True, chat_id=chat_id, text=chunk, reply_markup=reply_markup)
+
+    await send_posts(posts, chat_id, "full", send_post, on_delivered=on_delivered)
+
+
+async def send_digest_posts_async(
+    posts: list[dict],
+    bot: AsyncTeleBot,
+    msg: Message = None,
+    channel_id: str = None,
+    on_delivered: Callable[[list[dict]], None] = None,
+) -> None:
+    """Sends each digest post in a single message like send_digest_posts, retrying it after a rate limit.
+
+    Parameters
+    ----------
+    posts : list[dict]
+        The list of digest posts created by the telegram digest creator.
+    bot : AsyncTeleBot
+        The async bot instance.
+    msg : Message
+        The Message Object.
+    channel_id : str, optional
+        The channel id, by default None.
+    on_delivered : Callable[[list[dict]], None], optional
+        Called with the posts sent, skipped for a formatting error, or checkpointed for the next start, by default None.
+    """
+    chat_id = channel_id or msg.chat.id
+    # The async bot only knows its user while polling.
+    username = (bot.user or await bot.get_me()).username
+
+    async def send_post(post: dict) -> None:
+        # Storing the full posts, so the digest buttons can request them later.
+        for job in post["jobs"]:
+            job_details_store.set(job["job_key"], job)
+
+        reply_markup = jobs_digest_inline_kb(username, [job["job_key"] for job in post["jobs"]])
+        async with chat_lock(chat_id):
+            await send_message(bot, retry=True, chat_id=chat_id, text=post["job_details"], reply_markup=reply_markup)
+
+    await send_posts(posts, chat_id, "digest", send_post, on_delivered=on_delivered)
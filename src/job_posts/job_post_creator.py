@@ -9,6 +9,44 @@ from dataclasses import dataclass, field
 # Importing Any for type hinting.
 from typing import Any
 
+# Importing re to escape markdown characters.
+import re
+
+# Importing the jobs ids, the same job gets a new tracking link on every scrape.
+from database.job_ids import job_id
+
+
+def job_key(apply_link: str) -> str:
+    """_summary_ : This function creates a stable key for a job out of its apply link, its job id in the jobs index.
+
+    Parameters
+    ----------
+    apply_link : str
+        _description_ : The job's apply link.
+
+    Returns
+    -------
+    str
+        _description_ : The LinkedIn job id, or a 40 characters long hex key if the link has none.
+    """
+    return job_id(apply_link)
+
+
+def escape_markdown(text: str) -> str:
+    """_summary_ : This function escapes the characters that have a meaning in telegram's Markdown parse mode.
+
+    Parameters
+    ----------
+    text : str
+        _description_ : The text to escape.
+
+    Returns
+    -------
+    str
+        _description_ : The escaped text.
+    """
+    return re.sub(r"([_*`\[])", r"\\\1", text)
+
 
 # Creating the abstract base class for the post creator
 class TgPost(ABC):
@@ -73,3 +111,96 @@ class TgJobPost(TgPost):
             # Adding the formatted job into the 'self.posts' list of the class.
             self.posts.append(post)
             #! break <= Uncomment for testing.
+
+
+@dataclass(slots=True)
+class TgJobDigest(TgPost):
+    """_summary_ : This data class packs several condensed jobs into as few digest posts as the message length limit allows."""
+
+    # This is the template that will be used for each job entry in the digest.
+    entry_template: str = (
+        "*{}. {}*\n"
+        "🏢 {} · 📍 {}\n"
+        "{}[Apply]({})"
+    )
+
+    # This is the template for the digest header, filled with the page number and the pages count.
+    header_template: str = "💼 *Jobs digest* ({}/{})\n\n"
+
+    # Telegram's maximum message length.
+    max_length: int = 4096
+
+    # The maximum number of jobs in a single digest, each job gets an inline button.
+    max_entries: int = 10
+
+    # This is the full post creator, used to create the descriptions available on demand.
+    full_post_creator: type = TgJobPost
+
+    # This is a list that will hold the final posts.
+    posts: list = field(default_factory=list)
+
+    def create_posts(self, jobs_data: list[dict]) -> list[dict]:
+        """_summary_ : This method loop over the jobs_data list and packs the condensed jobs entries into digest posts.
+
+        Parameters
+        ----------
+        jobs_data : list[dict]
+            _description_ : This is the list of jobs data that will be used to create the posts.
+
+        Returns
+        -------
+        list[dict]
+            _description_ : A list of dicts that contain the 'job_details' digest text and the full 'jobs' posts it covers.
+        """
+        # Creating the full posts, each digest entry links to one of them.
+        full_posts = self.full_post_creator()
+        full_posts.create_posts(jobs_data)
+
+        # Reserving room for the header, the pages count is only known after packing.
+        header_room = len(self.header_template.format(999, 999))
+
+        # Each page is a list of (entry text, full post) tuples.
+        pages: list[list[tuple[str, dict]]] = [[]]
+        page_length = header_room
+
+        for job, full_post in zip(jobs_data, full_posts.posts):
+            # Adding the job key to the full post, so it can be requested on demand.
+            full_post["job_key"] = job_key(job["apply_link"])
+
+            # The entry fields, escaped so the job's text doesn't break the digest's markdown.
+            ## The title is inside a bold entity where escaping isn't allowed, so only its closing character is dropped.
+            fields = (
+                job["job_title"].replace("*", ""),
+                escape_markdown(job["job_company"]),
+                escape_markdown(job["job_location"]),
+                f"{job['ai_tags']} · " if job["ai_tags"] else "",
+                job["apply_link"],
+            )
+            entry = self.entry_template.format(len(pages[-1]) + 1, *fields)
+
+            # Starting a new page if the entry doesn't fit in the current one.
+            if pages[-1] and (
+                page_length + len(entry) + 2 > self.max_length
+                or len(pages[-1]) >= self.max_entries
+            ):
+                pages.append([])
+                page_length = header_room
+                # Numbering the entry as the first one of the new page.
+                entry = self.entry_template.format(1, *fields)
+
+            pages[-1].append((entry, full_post))
+            page_length += len(entry) + 2
+
+        # Dropping the empty page if there were no jobs.
+        pages = [page for page in pages if page]
+
+        for number, page in enumerate(pages, start=1):
+            self.posts.append(
+                {
+                    # The digest text, made of the header and the entries separated by an empty line.
+                    "job_details": self.header_template.format(number, len(pages))
+                    + "\n\n".join(entry for entry, _ in page),
+                    # The full posts of the jobs in this digest, in the same order as the entries.
+                    "jobs": [full_post for _, full_post in page],
+                }
+            )
@@ -6,22 +6,186 @@ from decouple import config
 # Importing TeleBot for Type hinting.
 from telebot import TeleBot
 
-# Importing the telegram job post dataclass.
-from .job_post_creator import TgJobPost
+# Importing the telegram job post & digest dataclasses.
+from .job_post_creator import TgJobDigest, TgJobPost
 
-# Importing the scrapper
-from .job_scrapper import LinkedinScrapper
+# Importing partial to pass the scrapper function with arguments without calling it.
+from functools import partial
 
-# Importing the send_job_posts function to send posts.
-from .job_post_sender import send_job_posts
+# Importing the scrapper, its default search parameters and its fetch interval.
+from .job_scrapper import DEFAULT_JOB_TITLE, DEFAULT_LOCATION, FETCH_JOBS_INTERVAL, LinkedinScrapper
+
+# Importing time to age the local jobs index coverage.
+import time
+
+# Importing the jobs index commands to store the scrapped jobs and answer searches from them.
+# Importing the subscriptions commands to deliver the saved searches jobs.
+# Importing the outbox commands to send the posts checkpointed by the last shutdown.
+from database import (
+    AddJobsCommand,
+    ConfirmDeliveriesCommand,
+    DeleteCheckpointedPostCommand,
+    DeliverJobsCommand,
+    GetCheckpointedPostsCommand,
+    GetDeliveredJobsCommand,
+    GetSearchCoverageCommand,
+    GetSubscriptionsCommand,
+    SearchJobsCommand,
+)
+
+# Importing the subscription matcher to plan the saved searches scrapes and route their jobs.
+from .subscription_matcher import Subscription, SubscriptionMatcher
+
+# Importing single flight to coalesce concurrent identical searches.
+from .single_flight import SingleFlight
+
+# Importing the query result cache to answer repeated searches without scrapping.
+from .result_cache import QueryResultCache
+
+# Importing the search progress shared by the searches waiting for a scrape.
+from .search_progress import SearchProgress
+
+# Importing the prepared batch to render the channel posts ahead of the post time.
+from .prepared_batch import BatchSlot, PreparedBatch
+
+# Importing the pipeline run recorder to record the runs, count the cache hits and time the stages.
+from .pipeline_runs import pipeline_run, record, stage
+
+# Importing datetime to log the indexing failures.
+from datetime import datetime
+
+# Importing Callable for type hinting.
+from typing import Callable
+
+# Importing the send_job_posts & send_digest_posts functions to send posts.
+from .job_post_sender import send_digest_posts, send_job_posts
+
+# Importing the bot lifecycle, to stop resuming the checkpointed posts on shutdown.
+from tgbot.utilities.lifecycle import lifecycle
 
 
 # Getting the CHANNEL_ID for channel_update from the .env file.
 CHANNEL_ID = config("CHANNEL_ID")
 
+# Getting the post mode, 'full' sends a message per job, 'digest' packs several condensed jobs per message.
+POST_MODE = config("POST_MODE", default="full").strip().lower()
+
+# Mapping each post mode to its (post creator, post sender).
+POST_MODES = {
+    "full": (TgJobPost, send_job_posts),
+    "digest": (TgJobDigest, send_digest_posts),
+}
+
+# Failing early on a typo in the .env file, instead of on the first scheduled post.
+if POST_MODE not in POST_MODES:
+    raise ValueError(f"POST_MODE must be one of {list(POST_MODES)}, got '{POST_MODE}'")
+
+# Getting how long (in seconds) a search result is fresh (default = 15 minutes).
+JOBS_CACHE_TTL = config("JOBS_CACHE_TTL", default=900, cast=int)
+
+# Getting how long (in seconds) after that a stale result is still served while refreshed (default = 1 hour).
+JOBS_CACHE_STALE = config("JOBS_CACHE_STALE", default=3600, cast=int)
+
+# Getting the maximum number of cached search results.
+JOBS_CACHE_SIZE = config("JOBS_CACHE_SIZE", default=32, cast=int)
+
+# Getting if searches are answered from the local jobs index when it covers them (default = yes).
+LJOBS_LOCAL_FIRST = config("LJOBS_LOCAL_FIRST", default=True, cast=bool)
+
+# Getting how old (in seconds) the last scrape of a search can be to answer it from the local index (default = 1 hour).
+LOCAL_INDEX_MAX_AGE = config("LOCAL_INDEX_MAX_AGE", default=3600, cast=int)
+
+# Getting how long (in seconds) the local jobs index keeps a job after its last scrape (default = 7 days).
+JOBS_RETENTION = config("JOBS_RETENTION", default=604800, cast=int)
+
+# Getting how long (in seconds) before the post time the channel posts are scrapped and rendered (default = 15 minutes, 0 = at post time).
+CHANNEL_PREPARE_LEAD = config("CHANNEL_PREPARE_LEAD", default=900, cast=int)
+
+# Getting the channel mode, 'batch' posts once per POST_TIME_HOUR | POST_TIME_MINUTES, 'trickle' posts the new jobs as they appear.
+CHANNEL_MODE = config("CHANNEL_MODE", default="batch").strip().lower()
+
+# Failing early on a typo in the .env file, instead of on the first scheduled post.
+if CHANNEL_MODE not in ("batch", "trickle"):
+    raise ValueError(f"CHANNEL_MODE must be one of ['batch', 'trickle'], got '{CHANNEL_MODE}'")
+
+# Getting how often (in minutes) the trickle mode scraps the channel search (default = 10 minutes).
+TRICKLE_INTERVAL = config("TRICKLE_INTERVAL", default=10, cast=int)
+
+# Getting the posting window (in seconds) of each trickle scrape, longer than the interval for LinkedIn's late listings (default = 1 hour).
+TRICKLE_WINDOW = config("TRICKLE_WINDOW", default=3600, cast=int)
+
+# The in-flight scrapes, concurrent searches with the same normalized parameters share a single scrape.
+search_flights = SingleFlight()
+
+# The search results cache, keyed by the normalized search parameters.
+search_cache = QueryResultCache(
+    ttl=JOBS_CACHE_TTL, stale_ttl=JOBS_CACHE_STALE, max_size=JOBS_CACHE_SIZE
+)
+
+# The channel batch prepared ahead of the post time, waiting for the publish phase.
+channel_batch = BatchSlot()
+
+
+def search_key(search_params: tuple[str, str] = None) -> tuple[str, tuple[str, ...]]:
+    """_summary_ : This function normalizes the search parameters into a key identifying identical searches.
+
+    Parameters
+    ----------
+    search_params : tuple[str, str], optional
+        _description_, by default None : The (job title, location) to search for, the defaults are used if not provided.
+
+    Returns
+    -------
+    tuple[str, tuple[str, ...]]
+        _description_ : The lowered job title with single spaces, and the sorted lowered locations.
+    """
+    job_title, location = search_params or (DEFAULT_JOB_TITLE, DEFAULT_LOCATION)
+
+    # Lowering the job title and collapsing its spaces.
+    title_key = " ".join(job_title.lower().split())
+
+    # The scrapper searches each comma separated location, so their order doesn't matter.
+    locations_key = tuple(
+        sorted({" ".join(place.lower().split()) for place in location.split(",")} - {""})
+    )
+
+    return title_key, locations_key
+
+
+def coverage_key(key: tuple[str, tuple[str, ...]]) -> str:
+    """Returns the search key as stored in the jobs index coverage table, eg. 'python developer|berlin,new york'."""
+    return f"{key[0]}|{','.join(key[1])}"
+
+
+def local_jobs(key: tuple[str, tuple[str, ...]]) -> list[dict]:
+    """_summary_ : This function answers a search from the local jobs index, if a recent enough scrape covers it.
+
+    Parameters
+    ----------
+    key : tuple[str, tuple[str, ...]]
+        _description_ : The normalized search key.
+
+    Returns
+    -------
+    list[dict]
+        _description_ : The indexed jobs posted within the fetch interval, None if the index doesn't cover the search.
+    """
+    scraped_at = GetSearchCoverageCommand(query_key=coverage_key(key)).execute()
+    if scraped_at is None or time.time() - scraped_at > LOCAL_INDEX_MAX_AGE:
+        return None
+
+    # Matching the same posting window the scrapper searches.
+    return SearchJobsCommand(
+        job_title=key[0], locations=list(key[1]), posted_after=time.time() - int(FETCH_JOBS_INTERVAL)
+    ).execute()
+
 
 def job_scrapper(
-    scrapper: LinkedinScrapper, search_params: tuple[str, str] = None
+    scrapper: LinkedinScrapper,
+    search_params: tuple[str, str] = None,
+    progress: SearchProgress = None,
+    fetch_interval: int = None,
+    skip_known: Callable[[list[str]], set[str]] = None,
 ) -> list[dict]:
     """_summary_ : This function creates the linkedin scrapper object and retrieves the formatted data.
 
@@ -29,6 +193,14 @@ def job_scrapper(
     ----------
     scrapper : LinkedinScrapper
         _description_ : The linkedin scrapper object.
+    search_params : tuple[str, str], optional
+        _description_, by default None : The (job title, location) to search for, the defaults are used if not provided.
+    progress : SearchProgress, optional
+        _description_, by default None : The progress to report the scrape to.
+    fetch_interval : int, optional
+        _description_, by default None : Only the jobs posted in the last ?? seconds, FETCH_JOBS_INTERVAL if not provided.
+    skip_known : Callable[[list[str]], set[str]], optional
+        _description_, by default None : Returns the apply links to skip among the found ones, before fetching their details.
 
     Returns
     -------
@@ -38,11 +210,23 @@ def job_scrapper(
     # Creating the scrapper object.
     scrapper = scrapper()
 
+    # Reporting to the shared progress if provided.
+    if progress:
+        scrapper.progress = progress
+
     # If search parameters were provided unpack them and pass them to the scrapper object.
     if search_params:
         # Setting up the search parameters tuple(job title, location).
         scrapper.set_search_params(*search_params)
 
+    # Narrowing the posting window if provided.
+    if fetch_interval:
+        scrapper.set_fetch_interval(fetch_interval)
+
+    # Skipping the known jobs if provided.
+    if skip_known:
+        scrapper.skip_known = skip_known
+
     # Starting the scrapping process
     scrapper.scrape_jobs()
 
@@ -50,6 +234,102 @@ def job_scrapper(
     return scrapper.formatted_data
 
 
+def scrape_and_index(search_params: tuple[str, str] = None, progress: SearchProgress = None) -> list[dict]:
+    """_summary_ : This function scraps the jobs of the search, and stores them in the local jobs index.
+
+    Parameters
+    ----------
+    search_params : tuple[str, str], optional
+        _description_, by default None : The (job title, location) to search for, the defaults are used if not provided.
+    progress : SearchProgress, optional
+        _description_, by default None : The progress to report the scrape to.
+
+    Returns
+    -------
+    list[dict]
+        _description_ : A list of dicts containing the scrapped jobs data for linkedin.
+    """
+    jobs = job_scrapper(LinkedinScrapper, search_params=search_params, progress=progress)
+
+    # Indexing the jobs, a failing index must not lose the scrape.
+    try:
+        with stage("index"):
+            AddJobsCommand(
+                jobs=jobs, query_key=coverage_key(search_key(search_params)), max_age=JOBS_RETENTION
+            ).execute()
+    except Exception as e:
+        print(datetime.now(), f"Indexing the scrapped jobs failed: {e}")
+
+    return jobs
+
+
+def fetch_jobs(
+    search_params: tuple[str, str] = None,
+    refresh: bool = False,
+    on_progress: Callable[[SearchProgress], None] = None,
+) -> list[dict]:
+    """_summary_ : This function returns the cached jobs of the search, or scraps them joining the in-flight scrape of an identical search if any.
+
+    Parameters
+    ----------
+    search_params : tuple[str, str], optional
+        _description_, by default None : The (job title, location) to search for, the defaults are used if not provided.
+    refresh : bool, optional
+        _description_, by default False : True to skip the cache and scrape, the result still warms the cache.
+    on_progress : Callable[[SearchProgress], None], optional
+        _description_, by default None : Called with the progress of the scrape once joined, the caller can cancel it.
+            Not called on cache hits.
+
+    Returns
+    -------
+    list[dict]
+        _description_ : A list of dicts containing the scrapped jobs data for linkedin, shared by the coalesced callers.
+    """
+    key = search_key(search_params)
+
+    def loader(on_progress: Callable[[SearchProgress], None] = None) -> list[dict]:
+        """Scraps through the single flight, so a cache miss and a background refresh of the same search share a scrape."""
+        # Answering from the local jobs index if it covers the search, the forced refreshes (channel run) always scrape.
+        if LJOBS_LOCAL_FIRST and not refresh and (jobs := local_jobs(key)) is not None:
+            record("cache_hits")
+            return jobs
+
+        progress = SearchProgress()
+
+        def join(progress: SearchProgress) -> bool:
+            # Every caller joins the scrape, only the ones given the progress can cancel their part.
+            ## A scrape cancelled by all of its searches can't be joined, the caller starts a new one.
+            if not progress.join():
+                return False
+            if on_progress:
+                on_progress(progress)
+            return True
+
+        return search_flights.do(
+            key,
+            partial(scrape_and_index, search_params=search_params, progress=progress),
+            state=progress,
+            on_join=join,
+        )
+
+    if refresh:
+        jobs = loader(on_progress)
+        search_cache.put(key, jobs)
+        return jobs
+
+    # The loader only runs on cache misses, in the caller's thread.
+    loaded = []
+
+    def load() -> list[dict]:
+        loaded.append(True)
+        return loader(on_progress)
+
+    jobs = search_cache.get_or_load(key, load, refresher=loader)
+    if not loaded:
+        record("cache_hits")
+    return jobs
+
+
 def post_creator(data: list[dict], creator: TgJobPost) -> list[dict]:
     """_summary_ : This function creates the telegram job post creator objects to create job posts for the telegram channel.
 
@@ -76,36 +356,325 @@ def post_creator(data: list[dict], creator: TgJobPost) -> list[dict]:
     return creator.posts
 
 
-def jobs_factory(search_params: tuple[str, str] = None) -> list[dict]:
+def jobs_factory(
+    search_params: tuple[str, str] = None,
+    post_mode: str = POST_MODE,
+    refresh: bool = False,
+    on_progress: Callable[[SearchProgress], None] = None,
+) -> list[dict]:
     """_summary_ : This function creates the scrapper object and the post creator objects.
 
+    Parameters
+    ----------
+    search_params : tuple[str, str], optional
+        _description_, by default None : The (job title, location) to search for, the defaults are used if not provided.
+    post_mode : str, optional
+        _description_, by default POST_MODE : The post mode to create the posts for ('full' | 'digest').
+    refresh : bool, optional
+        _description_, by default False : True to scrape even if the search result is cached.
+    on_progress : Callable[[SearchProgress], None], optional
+        _description_, by default None : Called with the progress of the scrape once joined, the caller can cancel it.
+
     Returns
     -------
     list[dict]
         _description_ : A list of dict containing the formatted posts ready to send to telegram chat.
     """
-    # If search parameters were passed as an argument pass them into the scrapper.
-    if search_params:
-        # Passing the scrapper to the job_scrapper function with the search parameters if provided.
-        jobs = job_scrapper(scrapper=LinkedinScrapper, search_params=search_params)
-    else:
-        # If no search parameters were provided, only pass the scrapper (will scrap for the default values)
-        jobs = job_scrapper(scrapper=LinkedinScrapper)
+    # Scrapping the jobs, the default values are used if no search parameters were provided.
+    with stage("fetch"):
+        jobs = fetch_jobs(search_params, refresh=refresh, on_progress=on_progress)
 
     # Returning the created posts.
-    return post_creator(data=jobs, creator=TgJobPost)
+    with stage("posts"):
+        return post_creator(data=jobs, creator=POST_MODES[post_mode][0])
+
+
+def publish_job_posts(
+    posts: list[dict],
+    bot: TeleBot,
+    msg=None,
+    channel_id: str = None,
+    post_mode: str = POST_MODE,
+    on_delivered: Callable[[list[dict]], None] = None,
+) -> None:
+    """_summary_ : This function sends the posts created by the jobs factory using the sender of the post mode.
+
+    Parameters
+    ----------
+    posts : list[dict]
+        _description_ : The posts created by the jobs factory with the same post mode.
+    bot : TeleBot
+        _description_ : bot instance
+    msg : Message, optional
+        _description_, by default None : The message to reply in its chat.
+    channel_id : str, optional
+        _description_, by default None : The channel to send the posts to.
+    post_mode : str, optional
+        _description_, by default POST_MODE : The post mode the posts were created with ('full' | 'digest').
+    on_delivered : Callable[[list[dict]], None], optional
+        _description_, by default None : Called with the posts sent, skipped for a formatting error, or checkpointed.
+    """
+    POST_MODES[post_mode][1](posts, bot, msg=msg, channel_id=channel_id, on_delivered=on_delivered)
+
+
+def post_links(post: dict) -> list[str]:
+    """Returns the apply links of the jobs in a post, a digest post holds several jobs."""
+    return [job["job_link"] for job in post["jobs"]] if "jobs" in post else [post["job_link"]]
+
+
+def deliver_jobs(jobs: list[dict], bot: TeleBot, chat_id: str) -> None:
+    """_summary_ : This function sends a chat the jobs it didn't get yet, they're recorded as delivered once sent.
+
+    The new jobs are claimed before being sent, so an overlapping run doesn't send them too, and the claims of the
+    jobs that failed to send are released, so the next run sends them again.
+
+    Parameters
+    ----------
+    jobs : list[dict]
+        _description_ : The jobs for the chat, the ones it already got are skipped.
+    bot : TeleBot
+        _description_ : bot instance
+    chat_id : str
+        _description_ : The chat (or channel) to send the jobs to.
+    """
+    with stage("deliver"):
+        new_jobs = DeliverJobsCommand(chat_id=chat_id, jobs=jobs).execute()
+    if not new_jobs:
+        return
+
+    sent_links = []
+    try:
+        with stage("send"):
+            publish_job_posts(
+                post_creator(new_jobs, POST_MODES[POST_MODE][0]),
+                bot,
+                channel_id=chat_id,
+                on_delivered=lambda posts: sent_links.extend(link for post in posts for link in post_links(post)),
+            )
+    finally:
+        with stage("deliver"):
+            ConfirmDeliveriesCommand(
+                chat_id=chat_id, claimed_links=[job["apply_link"] for job in new_jobs], sent_links=sent_links
+            ).execute()
+
+
+# Channel preparer function, this function will be called by the schedule CHANNEL_PREPARE_LEAD seconds before the post time.
+def channel_jobs_preparer(bot: TeleBot, on_progress: Callable[[SearchProgress], None] = None) -> None:
+    """_summary_ : This function scraps, tags and renders the channel posts ahead of the post time, for channel_jobs_updater to send.
+
+    Parameters
+    ----------
+    bot : TeleBot
+        _description_ : bot instance, unused, the scheduled updaters share their signature.
+    on_progress : Callable[[SearchProgress], None], optional
+        _description_, by default None : Called with the progress of the scrape once joined, the caller can cancel it.
+    """
+    channel_batch.start()
+    batch = None
+    try:
+        with pipeline_run("prepare", coverage_key(search_key())):
+            started_at = time.time()
+            # Scrapping fresh jobs for the channel, which also warms the cache for the default /ljobs search.
+            with stage("fetch"):
+                jobs = fetch_jobs(refresh=True, on_progress=on_progress)
+            with stage("posts"):
+                posts = post_creator(data=jobs, creator=POST_MODES[POST_MODE][0])
+            batch = PreparedBatch(posts=posts, links={job["apply_link"] for job in jobs}, started_at=started_at)
+    finally:
+        # A failed prepare phase still wakes up the publish phase, which then scraps by itself.
+        channel_batch.put(batch)
+
+
+def scrape_window(
+    window: float,
+    on_progress: Callable[[SearchProgress], None] = None,
+    skip_known: Callable[[list[str]], set[str]] = None,
+) -> list[dict]:
+    """_summary_ : This function scraps the channel search jobs posted in a short window, and stores them in the local jobs index.
+
+    Parameters
+    ----------
+    window : float
+        _description_ : Only the jobs posted in the last ?? seconds.
+    on_progress : Callable[[SearchProgress], None], optional
+        _description_, by default None : Called with the progress of the scrape once joined, the caller can cancel it.
+    skip_known : Callable[[list[str]], set[str]], optional
+        _description_, by default None : Returns the apply links to skip among the found ones, before fetching their details.
+
+    Returns
+    -------
+    list[dict]
+        _description_ : A list of dicts containing the scrapped jobs data for linkedin.
+    """
+    progress = SearchProgress()
+    progress.join()
+    if on_progress:
+        on_progress(progress)
+
+    jobs = job_scrapper(LinkedinScrapper, progress=progress, fetch_interval=window, skip_known=skip_known)
+
+    # Indexing the jobs without recording a coverage, the search covered a shorter window than the others.
+    try:
+        with stage("index"):
+            AddJobsCommand(jobs=jobs, max_age=JOBS_RETENTION).execute()
+    except Exception as e:
+        print(datetime.now(), f"Indexing the {int(window)}s window jobs failed: {e}")
+
+    return jobs
+
+
+def top_up_jobs(batch: PreparedBatch, on_progress: Callable[[SearchProgress], None] = None) -> list[dict]:
+    """_summary_ : This function scraps the jobs posted since the batch scrape started, and returns the ones not in the batch.
+
+    Parameters
+    ----------
+    batch : PreparedBatch
+        _description_ : The published batch.
+    on_progress : Callable[[SearchProgress], None], optional
+        _description_, by default None : Called with the progress of the scrape once joined, the caller can cancel it.
+
+    Returns
+    -------
+    list[dict]
+        _description_ : The new jobs, they're stored in the local jobs index too.
+    """
+    # Only searching the lead window, with a minute of margin for the LinkedIn posting times.
+    jobs = scrape_window(
+        time.time() - batch.started_at + 60,
+        on_progress=on_progress,
+        skip_known=lambda links: batch.links.intersection(links),
+    )
+    return [job for job in jobs if job["apply_link"] not in batch.links]
 
 
 # Job updater function, this function will be called by the schedule to update the job postings in channel
-def channel_jobs_updater(bot: TeleBot) -> None:
+def channel_jobs_updater(bot: TeleBot, on_progress: Callable[[SearchProgress], None] = None) -> None:
     """_summary_ : This function updates the job posting in the channel using the CHANNEL_ID variable from .env file
 
+    The batch prepared by channel_jobs_preparer is sent right at the post time, then a quick top-up scrape sends
+    the jobs posted meanwhile. Without a fresh batch (eg. the prepare phase failed or is disabled), the jobs are
+    scrapped at the post time.
+
     Parameters
     ----------
     bot : TeleBot
         _description_ : bot instance
+    on_progress : Callable[[SearchProgress], None], optional
+        _description_, by default None : Called with the progress of the scrape once joined, the caller can cancel it.
     """
-    # Creating jobs using the jobs factory
-    jobs = jobs_factory()
-    # Sending jobs to the channel
-    send_job_posts(jobs, bot, channel_id=CHANNEL_ID)
+    with pipeline_run("channel", coverage_key(search_key())):
+        # Waiting up to the lead time for a prepare phase still running, its batch is too old after twice the lead.
+        batch = None
+        if CHANNEL_PREPARE_LEAD:
+            batch = channel_batch.take(max_age=CHANNEL_PREPARE_LEAD * 2, wait=CHANNEL_PREPARE_LEAD)
+
+        if batch is None:
+            # Scrapping fresh jobs for the channel, which also warms the cache for the default /ljobs search.
+            jobs = jobs_factory(refresh=True, on_progress=on_progress)
+            # Sending jobs to the channel
+            with stage("send"):
+                publish_job_posts(jobs, bot, channel_id=CHANNEL_ID)
+            return
+
+        # Sending the prepared jobs to the channel right away.
+        with stage("send"):
+            publish_job_posts(batch.posts, bot, channel_id=CHANNEL_ID)
+
+        # Sending the jobs posted while the batch was prepared, a failing top-up doesn't fail the published batch.
+        try:
+            with stage("top_up"):
+                new_jobs = top_up_jobs(batch, on_progress=on_progress)
+            if new_jobs:
+                with stage("send"):
+                    publish_job_posts(post_creator(new_jobs, POST_MODES[POST_MODE][0]), bot, channel_id=CHANNEL_ID)
+        except Exception as e:
+            print(datetime.now(), f"The channel top-up scrape failed: {e}")
+
+
+# Trickle updater function, this function will be called by the schedule every TRICKLE_INTERVAL minutes in trickle mode.
+def channel_jobs_trickle(bot: TeleBot, on_progress: Callable[[SearchProgress], None] = None) -> None:
+    """_summary_ : This function scraps the channel search's last TRICKLE_WINDOW seconds, and posts the jobs the channel didn't get yet.
+
+    The jobs already posted are skipped before their details are fetched, so each run only spends LinkedIn requests
+    and Gemini calls on the new jobs, spreading the load evenly across the day.
+
+    Parameters
+    ----------
+    bot : TeleBot
+        _description_ : bot instance
+    on_progress : Callable[[SearchProgress], None], optional
+        _description_, by default None : Called with the progress of the scrape once joined, the caller can cancel it.
+    """
+    with pipeline_run("trickle", coverage_key(search_key())):
+        with stage("fetch"):
+            jobs = scrape_window(
+                TRICKLE_WINDOW,
+                on_progress=on_progress,
+                skip_known=lambda links: GetDeliveredJobsCommand(chat_id=CHANNEL_ID, apply_links=links).execute(),
+            )
+
+        # Claiming the jobs before sending them, so an overlapping window never posts them twice.
+        deliver_jobs(jobs, bot, CHANNEL_ID)
+
+
+# Subscriptions updater function, this function will be called by the schedule to deliver the saved searches jobs.
+def subscriptions_updater(bot: TeleBot, on_progress: Callable[[SearchProgress], None] = None) -> None:
+    """_summary_ : This function scraps every distinct saved search once, and sends each chat its matching new jobs.
+
+    Parameters
+    ----------
+    bot : TeleBot
+        _description_ : bot instance
+    on_progress : Callable[[SearchProgress], None], optional
+        _description_, by default None : Called with the progress of each scrape once joined, the caller can cancel
+            them, the jobs scrapped before are still delivered.
+    """
+    with pipeline_run("subscriptions", "saved searches"):
+        matcher = SubscriptionMatcher(
+            [Subscription.from_row(row) for row in GetSubscriptionsCommand().execute()]
+        )
+
+        # Scrapping each distinct search once, whatever the number of its subscribers.
+        results = {}
+        for search_params in matcher.queries():
+            try:
+                with stage("fetch"):
+                    results[search_params] = fetch_jobs(search_params, refresh=True, on_progress=on_progress)
+            except Exception as e:
+                print(datetime.now(), f"Scrapping the saved search {search_params} failed: {e}")
+
+        # Routing the jobs to the chats, and sending each chat only the jobs it didn't get yet.
+        for chat_id, chat_jobs in matcher.route(results).items():
+            try:
+                deliver_jobs(chat_jobs, bot, chat_id)
+            except Exception as e:
+                print(datetime.now(), f"Delivering the saved searches jobs to {chat_id} failed: {e}")
+
+
+def resume_checkpointed_posts(bot: TeleBot) -> None:
+    """_summary_ : This function sends the posts the last shutdown checkpointed, in their sending order.
+
+    Each post is deleted once sent, so a shutdown during the resume leaves the posts it didn't send for the next
+    start. A post failing to send is dropped after being logged, so it doesn't fail every start.
+
+    Parameters
+    ----------
+    bot : TeleBot
+        _description_ : bot instance
+    """
+    try:
+        checkpointed = GetCheckpointedPostsCommand().execute()
+    except Exception as e:
+        print(datetime.now(), f"Reading the checkpointed posts failed: {e}")
+        return
+
+    if checkpointed:
+        print(datetime.now(), f"Sending the {len(checkpointed)} posts checkpointed by the last shutdown.")
+    for row in checkpointed:
+        if lifecycle.stopping.is_set():
+            return
+        try:
+            publish_job_posts([row["post"]], bot, channel_id=row["chat_id"], post_mode=row["post_mode"])
+        except Exception as e:
+            print(datetime.now(), f"Sending the checkpointed post {row['post_id']} to {row['chat_id']} failed: {e}")
+        DeleteCheckpointedPostCommand(post_id=row["post_id"]).execute()
@@ -7,12 +7,36 @@ import time
 from datetime import datetime
 from threading import Lock
 
+# Importing Callable for type hinting.
+from typing import Callable
+
+# Importing decouple to get the digest settings from the .env file.
+from decouple import config
+
 # Importing the inline keyboard markup and button to create inline button for the job links
-from tgbot import jobs_post_inline_kb
+from tgbot import jobs_digest_inline_kb, jobs_post_inline_kb
+
+# Importing the expiring store to keep the full job posts available on demand.
+from tgbot.utilities.expiring_store import ExpiringStore
+
+# Importing the bot lifecycle, the posts left past the shutdown deadline are checkpointed instead of sent.
+from tgbot.utilities.lifecycle import lifecycle
+
+# Importing the checkpoint command to store the posts left.
+from database import CheckpointPostsCommand
+
+# Importing the pipeline run recorder to count the sent messages and the rate limits.
+from .pipeline_runs import record
 
 # Initialize a lock for synchronization
 message_lock = Lock()
 
+# Getting how long (in seconds) the full descriptions of digest jobs stay available (default = 7 days).
+DIGEST_DETAILS_TTL = config("DIGEST_DETAILS_TTL", default=604800, cast=int)
+
+# Full job posts of the sent digests, keyed by their job key, the ones it lost are created again out of the jobs index.
+job_details_store = ExpiringStore(ttl=DIGEST_DETAILS_TTL, max_size=5000)
+
 def get_unclosed_tag(text: str) -> list:
     tags = ["```", "`", "*", "_"]
     stack = []
@@ -82,7 +106,21 @@ def split_markdown(markdown: str, max_length: int = 4096) -> list:
 
     return chunks
 
-def send_job_posts(posts: list[dict], bot: TeleBot, msg: Message = None, channel_id: str = None) -> None:
+def checkpoint_posts(chat_id: str, post_mode: str, posts: list[dict]) -> None:
+    """Stores the posts left to send once the shutdown deadline passed, they're sent first on the next start."""
+    if not posts:
+        return
+    CheckpointPostsCommand(chat_id=chat_id, post_mode=post_mode, posts=posts).execute()
+    print(datetime.now(), f"Checkpointed {len(posts)} posts to {chat_id}, they're sent on the next start.")
+
+
+def send_job_posts(
+    posts: list[dict],
+    bot: TeleBot,
+    msg: Message = None,
+    channel_id: str = None,
+    on_delivered: Callable[[list[dict]], None] = None,
+) -> None:
     """Loops over the provided job post list and send each post in a separate message.
     
     Parameters
@@ -95,6 +133,8 @@ def send_job_posts(posts: list[dict], bot: TeleBot, msg: Message = None, channel
         The Message Object.
     channel_id : str, optional
         The channel id, by default None.
+    on_delivered : Callable[[list[dict]], None], optional
+        Called with the posts sent, skipped for a formatting error, or checkpointed for the next start, by default None.
     """
     
     # Delay in seconds
@@ -105,7 +145,14 @@ def send_job_posts(posts: list[dict], bot: TeleBot, msg: Message = None, channel
         return [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
 
     # Looping over the posts list and sending each post to the user.
-    for post in posts:
+    for index, post in enumerate(posts):
+        # Past the shutdown deadline, storing the posts left instead of sending them.
+        if lifecycle.expired.is_set():
+            checkpoint_posts(channel_id or msg.chat.id, "full", posts[index:])
+            if on_delivered:
+                on_delivered(posts[index:])
+            return
+
         job_details = post["job_details"]
 
         # Split job details into chunks of maximum length
@@ -115,35 +162,116 @@ def send_job_posts(posts: list[dict], bot: TeleBot, msg: Message = None, channel
         with message_lock:
             # Send each chunk as a separate message
             for index, chunk in enumerate(job_detail_chunks):
-                # Attempt to send the message and handle rate-limiting
+                # Sending the same chunk again after a rate limit, so the post isn't cut.
+                while True:
+                    try:
+                        # Check if current chunk is the last by comparing the index with the length of the list
+                        is_last_chunk = (index == len(job_detail_chunks) - 1)
+                        if is_last_chunk:
+                            # Logic for the last chunk
+                            bot.send_message(
+                                chat_id=channel_id or msg.chat.id,
+                                text=chunk,
+                                reply_markup=jobs_post_inline_kb(post["job_link"]),
+                                parse_mode="Markdown",
+                                disable_web_page_preview=True
+                            )
+                        else:
+                            # Logic for all other chunks
+                            bot.send_message(
+                                chat_id=channel_id or msg.chat.id,
+                                text=chunk,
+                                parse_mode="Markdown",
+                                disable_web_page_preview=True
+                            )
+                        record("messages_sent")
+                        time.sleep(delay_between_messages)
+                        break
+                    except apihelper.ApiTelegramException as e:
+                        if e.error_code == 429:
+                            record("rate_limited")
+                            # Extract retry-after time from the exception and wait
+                            retry_after = int(e.result_json['parameters']['retry_after'])
+                            print(datetime.now(), f"Rate limited, sleeping for {retry_after} seconds")
+                            time.sleep(retry_after)
+                        elif e.error_code == 400:
+                            print(datetime.now(), "Formatting error, skipping message")
+                            break
+                        else:
+                            raise e
+
+        # The post was sent, or skipped for good on a formatting error.
+        if on_delivered:
+            on_delivered([post])
+
+
+def send_digest_posts(
+    posts: list[dict],
+    bot: TeleBot,
+    msg: Message = None,
+    channel_id: str = None,
+    on_delivered: Callable[[list[dict]], None] = None,
+) -> None:
+    """Sends each digest post in a single message, and keeps the full job posts it covers available on demand.
+
+    Parameters
+    ----------
+    posts : list[dict]
+        The list of digest posts created by the telegram digest creator.
+    bot : TeleBot
+        The bot instance.
+    msg : Message
+        The Message Object.
+    channel_id : str, optional
+        The channel id, by default None.
+    on_delivered : Callable[[list[dict]], None], optional
+        Called with the posts sent, skipped for a formatting error, or checkpointed for the next start, by default None.
+    """
+
+    # Delay in seconds
+    delay_between_messages = 1
+
+    for index, post in enumerate(posts):
+        # Past the shutdown deadline, storing the posts left instead of sending them.
+        if lifecycle.expired.is_set():
+            checkpoint_posts(channel_id or msg.chat.id, "digest", posts[index:])
+            if on_delivered:
+                on_delivered(posts[index:])
+            return
+
+        # Storing the full posts, so the digest buttons can request them later.
+        for job in post["jobs"]:
+            job_details_store.set(job["job_key"], job)
+
+        reply_markup = jobs_digest_inline_kb(bot.user.username, [job["job_key"] for job in post["jobs"]])
+
+        with message_lock:
+            # Retrying the same digest after a rate limit, a digest holds several jobs so it shouldn't be dropped.
+            while True:
                 try:
-                    # Check if current chunk is the last by comparing the index with the length of the list
-                    is_last_chunk = (index == len(job_detail_chunks) - 1)
-                    if is_last_chunk:
-                        # Logic for the last chunk
-                        bot.send_message(
-                            chat_id=channel_id or msg.chat.id,
-                            text=chunk,
-                            reply_markup=jobs_post_inline_kb(post["job_link"]),
-                            parse_mode="Markdown",
-                            disable_web_page_preview=True
-                        )
-                    else:
-                        # Logic for all other chunks
-                        bot.send_message(
-                            chat_id=channel_id or msg.chat.id,
-                            text=chunk,
-                            parse_mode="Markdown",
-                            disable_web_page_preview=True
-                        )
+                    bot.send_message(
+                        chat_id=channel_id or msg.chat.id,
+                        text=post["job_details"],
+                        reply_markup=reply_markup,
+                        parse_mode="Markdown",
+                        disable_web_page_preview=True
+                    )
+                    record("messages_sent")
                     time.sleep(delay_between_messages)
+                    break
                 except apihelper.ApiTelegramException as e:
                     if e.error_code == 429:
+                        record("rate_limited")
                         # Extract retry-after time from the exception and wait
                         retry_after = int(e.result_json['parameters']['retry_after'])
                         print(datetime.now(), f"Rate limited, sleeping for {retry_after} seconds")
                         time.sleep(retry_after)
                     elif e.error_code == 400:
-                        print(datetime.now(), "Formatting error, skipping message")
+                        print(datetime.now(), "Formatting error, skipping digest")
+                        break
                     else:
                         raise e
+
+        # The digest was sent, or skipped for good on a formatting error.
+        if on_delivered:
+            on_delivered([post])
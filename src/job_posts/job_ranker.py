@@ -0,0 +1,188 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing math for the BM25 inverse document frequency.
+import math
+
+# Importing re to normalize and tokenize the job titles and descriptions.
+import re
+
+# Importing Counter to count the terms frequencies.
+from collections import Counter
+
+
+# The spellings rewritten before tokenizing, so they survive as single tokens.
+SPELLINGS = {
+    r"c\+\+": "cpp",
+    r"c#": "csharp",
+    r"\.net\b": "dotnet",
+    r"\bnode\.js\b": "nodejs",
+    r"\bfront[\s-]+end\b": "frontend",
+    r"\bback[\s-]+end\b": "backend",
+    r"\bfull[\s-]+stack\b": "fullstack",
+    r"\bdev[\s-]*ops\b": "devops",
+}
+
+# The title abbreviations expanded after tokenizing.
+ABBREVIATIONS = {
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "jnr": "junior",
+    "mid": "middle",
+    "dev": "developer",
+    "devs": "developer",
+    "eng": "engineer",
+    "engr": "engineer",
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "fe": "frontend",
+    "be": "backend",
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "ml": "machine learning",
+    "qa": "quality assurance",
+    "pm": "product manager",
+}
+
+# The groups of interchangeable terms, a query term matches any term of its group.
+SYNONYMS = [
+    {"developer", "engineer", "programmer"},
+    {"middle", "intermediate", "regular"},
+    {"lead", "principal", "staff"},
+    {"golang", "go"},
+    {"javascript", "ecmascript"},
+    {"kubernetes", "k8s"},
+    {"postgresql", "postgres"},
+]
+
+
+def normalize(text: str) -> list[str]:
+    """_summary_ : This function normalizes a job title or description into its terms.
+
+    Parameters
+    ----------
+    text : str
+        _description_ : The text to normalize.
+
+    Returns
+    -------
+    list[str]
+        _description_ : The lowered terms, with the special spellings kept and the abbreviations expanded.
+    """
+    text = text.lower()
+    for pattern, replacement in SPELLINGS.items():
+        text = re.sub(pattern, f" {replacement} ", text)
+
+    terms = []
+    for word in re.findall(r"\w+", text):
+        terms.extend(ABBREVIATIONS.get(word, word).split())
+    return terms
+
+
+class JobRanker:
+    """_summary_ : This class scores jobs against a search query with BM25, over their title and description.
+
+    The title counts 'title_weight' times as much as the description (BM25F), each query term also matches its
+    synonyms, and the document frequencies are taken over the scored jobs themselves.
+
+    Example
+    -------
+        >>> JobRanker("python developer").select([("Sr. Python Dev", "..."), ("Java Engineer", "...")], top_n=10)
+        [0]
+    """
+
+    def __init__(self, query: str, title_weight: float = 3.0, k1: float = 1.2, b: float = 0.75) -> None:
+        """_summary_ : This method compiles the query terms.
+
+        Parameters
+        ----------
+        query : str
+            _description_ : The search query, eg. the searched job title.
+        title_weight : float, optional
+            _description_, by default 3.0 : How many times a title term counts more than a description term.
+        k1 : float, optional
+            _description_, by default 1.2 : The BM25 term frequency saturation.
+        b : float, optional
+            _description_, by default 0.75 : The BM25 document length normalization.
+        """
+        self.title_weight = title_weight
+        self.k1 = k1
+        self.b = b
+
+        # List[the terms matching each query term], the duplicated query terms count once.
+        self.query_terms: list[frozenset[str]] = []
+        for term in dict.fromkeys(normalize(query)):
+            group = next((group for group in SYNONYMS if term in group), {term})
+            self.query_terms.append(frozenset(group))
+
+    def score(self, jobs: list[tuple[str, str]]) -> list[float]:
+        """_summary_ : This method scores the jobs against the query.
+
+        Parameters
+        ----------
+        jobs : list[tuple[str, str]]
+            _description_ : The (job title, job description) of each job.
+
+        Returns
+        -------
+        list[float]
+            _description_ : The jobs scores, in the given order, 0 for the jobs matching no query term.
+        """
+        if not jobs or not self.query_terms:
+            return [0.0] * len(jobs)
+
+        # Weighting the title terms frequencies and lengths.
+        documents = []
+        for title, description in jobs:
+            title_terms, description_terms = normalize(title), normalize(description)
+            frequencies = Counter(description_terms)
+            for term in title_terms:
+                frequencies[term] += self.title_weight
+            documents.append((frequencies, self.title_weight * len(title_terms) + len(description_terms)))
+
+        average_length = sum(length for _, length in documents) / len(documents) or 1
+
+        # Computing each query term's inverse document frequency over the scored jobs.
+        idf = []
+        for group in self.query_terms:
+            frequency = sum(any(term in frequencies for term in group) for frequencies, _ in documents)
+            idf.append(math.log(1 + (len(documents) - frequency + 0.5) / (frequency + 0.5)))
+
+        scores = []
+        for frequencies, length in documents:
+            norm = self.k1 * (1 - self.b + self.b * length / average_length)
+            score = 0.0
+            for group, term_idf in zip(self.query_terms, idf):
+                tf = sum(frequencies[term] for term in group)
+                score += term_idf * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def select(self, jobs: list[tuple[str, str]], top_n: int = 0, min_score: float = 0.0) -> list[int]:
+        """_summary_ : This method selects the most relevant jobs.
+
+        Parameters
+        ----------
+        jobs : list[tuple[str, str]]
+            _description_ : The (job title, job description) of each job.
+        top_n : int, optional
+            _description_, by default 0 : The maximum number of jobs to select, 0 for no limit.
+        min_score : float, optional
+            _description_, by default 0.0 : The minimum score relative to the best one (0 to 1) a job needs.
+
+        Returns
+        -------
+        list[int]
+            _description_ : The indexes of the selected jobs, the most relevant first.
+        """
+        scores = self.score(jobs)
+        best = max(scores, default=0.0)
+
+        # Dropping the jobs matching nothing, and the ones too far behind the best.
+        ranked = sorted(
+            (index for index, score in enumerate(scores) if score > 0 and score >= best * min_score),
+            key=lambda index: scores[index],
+            reverse=True,
+        )
+        return ranked[:top_n] if top_n else ranked
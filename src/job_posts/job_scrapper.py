@@ -9,18 +9,9 @@ from dataclasses import dataclass, field
 # Importing requests to send requests to linkedin.
 import requests
 
-# Importing BeautifulSoup to parse the html.
-from bs4 import BeautifulSoup
-
 # Importing decouple to get the search keyword from the .env file.
 from decouple import config
 
-# Importing BeautifulSoup to parse the job description.
-from bs4 import BeautifulSoup
-
-# Importing markdownify to convert HTML to Markdown.
-from markdownify import MarkdownConverter
-
 # Importing datetime to parse timestamp
 from datetime import datetime, timedelta
 
@@ -30,10 +21,29 @@ import re
 # Importing sleep to delay requests to Gemini API
 from time import sleep
 
-# Importing google.generativeai to generate AI tags
-import google.generativeai as genai
-from google.api_core.exceptions import TooManyRequests
-from google.api_core.exceptions import ResourceExhausted
+# Importing threading to configure Gemini once, whatever the thread scrapping first.
+import threading
+
+# Importing cache to create the Markdown converter once.
+from functools import cache
+
+# BeautifulSoup, markdownify and google.generativeai are imported on first use, google.generativeai alone takes
+## most of the bot's start time, and a restart that only answers commands never needs them.
+
+# Importing the search progress to report the scrapping progress and stop cancelled scrapes.
+from .search_progress import SearchProgress
+
+# Importing the job ranker to only tag and send the jobs relevant to the search.
+from .job_ranker import JobRanker
+
+# Importing the pipeline run recorder to count the scrapped jobs and time the scrapping stages.
+from .pipeline_runs import record, stage
+
+# Importing Callable for type hinting.
+from typing import Callable
+
+# Importing the canonical job links, used as the jobs keys.
+from database.job_ids import canonical_job_link
 
 
 # Getting default job title.
@@ -50,23 +60,71 @@ else:
 
 AI_TAG_ALLOW_LIST = config('AI_TAG_ALLOW_LIST').split(',')
 
+# Getting the maximum number of jobs tagged and sent per scrape, the most relevant first (0 = no limit).
+RANK_TOP_N = config("RANK_TOP_N", default=30, cast=int)
+
+# Getting the minimum relevance a job needs to be tagged and sent, relative to the most relevant job (0 to 1).
+RANK_MIN_SCORE = config("RANK_MIN_SCORE", default=0.35, cast=float)
+
 GEMINI_API_KEYS = config('GEMINI_API_KEYS').split(',')
 
-# Creating a custom MarkdownConverter that uses one asterisk for strong/bold text.
-class SingleAsteriskBoldConverter(MarkdownConverter):
-    """
-    Create a custom MarkdownConverter that uses one asterisk for strong/bold text.
+# Index of the Gemini API key in use, None until Gemini is configured on its first call.
+_gemini_key_index = None
+_gemini_lock = threading.Lock()
+
+
+def gemini():
+    """_summary_ : This function returns the google.generativeai module, imported and configured with the 1st API key on its first call.
+
+    Returns
+    -------
+    module
+        _description_ : The configured google.generativeai module.
     """
-    
-    def convert_strong(self, el, text, convert_as_inline):
-        return '*' + text + '*' if text else ''
-    
-    def convert_b(self, el, text, convert_as_inline):
-        return self.convert_strong(el, text, convert_as_inline)
+    global _gemini_key_index
+    # Importing google.generativeai here, so the bot starts without loading it.
+    import google.generativeai as genai
+
+    with _gemini_lock:
+        if _gemini_key_index is None:
+            _gemini_key_index = 0
+            genai.configure(api_key=GEMINI_API_KEYS[_gemini_key_index])
+    return genai
+
+
+def switch_gemini_key() -> None:
+    """This function configures Gemini with the next API key, after the current one is exhausted."""
+    global _gemini_key_index
+    genai = gemini()
+    with _gemini_lock:
+        _gemini_key_index = (_gemini_key_index + 1) % len(GEMINI_API_KEYS)
+        genai.configure(api_key=GEMINI_API_KEYS[_gemini_key_index])
+
+
+@cache
+def markdown_converter() -> type:
+    """Returns the custom MarkdownConverter that uses one asterisk for strong/bold text, created on first use."""
+    # Importing markdownify here, so the bot starts without loading it.
+    from markdownify import MarkdownConverter
+
+    # Creating a custom MarkdownConverter that uses one asterisk for strong/bold text.
+    class SingleAsteriskBoldConverter(MarkdownConverter):
+        """
+        Create a custom MarkdownConverter that uses one asterisk for strong/bold text.
+        """
+
+        def convert_strong(self, el, text, convert_as_inline):
+            return '*' + text + '*' if text else ''
+
+        def convert_b(self, el, text, convert_as_inline):
+            return self.convert_strong(el, text, convert_as_inline)
+
+    return SingleAsteriskBoldConverter
+
 
 # Convert HTML to Markdown using the custom converter
 def md(html, **options):
-    return SingleAsteriskBoldConverter(**options).convert(html)
+    return markdown_converter()(**options).convert(html)
 
 
 # Creating an abstract class for Scrappers.
@@ -99,17 +157,20 @@ class LinkedinScrapper(Scrapper):
     # Default list to hold raw html data.
     raw_data: list[dict] = field(default_factory=list)
 
+    # Default list to hold the jobs with their details, waiting to be ranked.
+    candidates: list[tuple[str, str, str, str, str, datetime, str]] = field(default_factory=list)
+
     # Default list to hold parsed data.
     parsed_data: list[tuple[str, str, str, str, str]] = field(default_factory=list)
 
     # Default list to hold final formatted data ready for use.
     formatted_data: list[dict] = field(default_factory=list)
 
-    # Current index of the API key
-    _current_api_key_index = 0
+    # The progress of the scrape, shared with the searches waiting for it.
+    progress: SearchProgress = field(default_factory=SearchProgress)
 
-    # Initialize genai with the 1st API key
-    genai.configure(api_key=GEMINI_API_KEYS[_current_api_key_index])
+    # Returns the apply links to skip among the found ones (eg. the jobs already posted), their details aren't fetched.
+    skip_known: Callable[[list[str]], set[str]] = None
 
     def set_search_params(self, job_tile: str, location: str) -> None:
         """_summary_ :  This method sets the search parameters for the linkedin jobs.
@@ -126,6 +187,16 @@ class LinkedinScrapper(Scrapper):
         # Setting the location instance variable.
         self._location = location
 
+    def set_fetch_interval(self, seconds: int) -> None:
+        """_summary_ :  This method sets how recently (in seconds) the searched jobs must have been posted.
+
+        Parameters
+        ----------
+        seconds : int
+            _description_ : The posting window, FETCH_JOBS_INTERVAL by default.
+        """
+        self._fetch_jobs_interval = str(int(seconds))
+
     def scrape_jobs(self) -> None:
         """This method start the scrapping process."""
         # Splitting the location string by comma
@@ -133,19 +204,36 @@ class LinkedinScrapper(Scrapper):
 
         # Loop through each location and scrape jobs
         for location in locations:
+            # Stopping if every search waiting for this scrape was cancelled.
+            self.progress.raise_if_cancelled()
+
             # Creating the URL with the job title and current location.
             url = f"https://www.linkedin.com/jobs/search?keywords={self._job_tile}&location={location.strip()}&f_TPR=r{self._fetch_jobs_interval}"
             # Collecting the data.
-            self.collect_data(url)
+            with stage("collect"):
+                self.collect_data(url)
 
             # Parsing the data.
-            self.parse_data()
+            with stage("details"):
+                self.parse_data()
+
+        # Keeping the most relevant jobs, before spending any Gemini call on them.
+        with stage("rank"):
+            self.rank_data()
+
+        # Tagging the kept jobs.
+        with stage("tag"):
+            self.tag_data()
 
         # Formatting the data.
-        self.format_data()
+        with stage("format"):
+            self.format_data()
 
     def collect_data(self, url: str):
         """This Method sends calls the url using the request lib and gets back the data from linkedin"""
+        # Importing BeautifulSoup here, so the bot starts without loading it.
+        from bs4 import BeautifulSoup
+
         # Getting the response from the website.
         response = requests.get(url, headers={ "User-Agent": "Mozilla/5.0" })
 
@@ -161,81 +249,141 @@ class LinkedinScrapper(Scrapper):
         # Returning the raw collected html data.
         self.raw_data = html_data
 
+        # Reporting the number of job cards found.
+        self.progress.advance("cards_found", len(html_data))
+        record("cards_found", len(html_data))
+
     def parse_data(self):
         """This Method parses data and extracts the job's details."""
 
         # Getting the data out of the instance variable for clarity.
         data = self.raw_data
 
+        # Getting the known jobs to skip, with a single lookup for the whole page.
+        known = set()
+        if self.skip_known:
+            known = self.skip_known([self.parse_card(job)[3] for job in data])
+
         # Looping over the raw html page data and extracting jobs details.
         for job in data:
-            # Getting the job title.
-            job_title = job.find("h3", class_="base-search-card__title").text.strip()
+            # Stopping if every search waiting for this scrape was cancelled.
+            self.progress.raise_if_cancelled()
 
-            # Getting the company name.
-            job_company = job.find(
-                "h4", class_="base-search-card__subtitle"
-            ).text.strip()
+            job_title, job_company, job_location, apply_link = self.parse_card(job)
 
-            # Getting the job location.
-            job_location = job.find(
-                "span", class_="job-search-card__location"
-            ).text.strip()
+            # Skipping the known jobs, they were already handled by a previous scrape.
+            if apply_link in known:
+                continue
 
-            # Getting the job link.
-            apply_link = self.remove_country_code_from_url(job.find("a", class_="base-card__full-link")["href"])
+            # Skipping the jobs already found in a previous location, their details are already known.
+            if any(candidate[4] == apply_link for candidate in self.candidates):
+                self.progress.advance("details_fetched")
+                continue
 
             # Get the page source
             page_source = requests.get(apply_link, headers={ "User-Agent": "Mozilla/5.0" }).content
 
-            # Parse the page source with BeautifulSoup
-            soup = BeautifulSoup(page_source, 'html.parser')
+            # Reporting the fetched job details.
+            self.progress.advance("details_fetched")
+            record("details_fetched")
+
+            job_description_md, timestamp, ago_text = self.parse_details(page_source)
+
+            # Appending the job details to the candidates, they are ranked once every location is parsed.
+            self.candidates.append((job_title, job_company, job_location, job_description_md, apply_link, timestamp.astimezone(), ago_text))
+
+    def parse_card(self, job) -> tuple[str, str, str, str]:
+        """This Method extracts the (job title, company, location, apply link) of a job search card."""
+        # Getting the job title.
+        job_title = job.find("h3", class_="base-search-card__title").text.strip()
+
+        # Getting the company name.
+        job_company = job.find(
+            "h4", class_="base-search-card__subtitle"
+        ).text.strip()
+
+        # Getting the job location.
+        job_location = job.find(
+            "span", class_="job-search-card__location"
+        ).text.strip()
+
+        # Getting the job link, without the tracking query changing on every scrape, so the job is always found by the same link.
+        apply_link = canonical_job_link(job.find("a", class_="base-card__full-link")["href"], job.get("data-entity-urn"))
+
+        return job_title, job_company, job_location, apply_link
+
+    def parse_details(self, page_source: bytes) -> tuple[str, datetime, str]:
+        """This Method extracts the (description in Markdown, post time, ago text) of a job page."""
+        # Importing BeautifulSoup here, so the bot starts without loading it.
+        from bs4 import BeautifulSoup
+
+        # Parse the page source with BeautifulSoup
+        soup = BeautifulSoup(page_source, 'html.parser')
+
+        # Extract ago text
+        ago_text_element = soup.find('span', class_='posted-time-ago__text')
+        # Check if the element was found before accessing .text
+        if ago_text_element:
+            ago_text = ago_text_element.text.strip()
+        else:
+            ago_text = "Unknown"
+
+        # Ectract the number from ago text
+        num = 0
+        match = re.search(r'\d+', ago_text)
+        if match:
+            num = int(match.group())
+
+        # Calculate post time
+        timestamp = datetime.now()
+        if 'minute' in ago_text:
+            timestamp = datetime.now() - timedelta(minutes=num)
+        elif 'hour' in ago_text:
+            timestamp = datetime.now() - timedelta(hours=num)
+        elif 'day' in ago_text:
+            timestamp = datetime.now() - timedelta(days=num)
+
+        # Rename ago text for better understanding
+        if ago_text.lower() == '1 day ago':
+            ago_text = '24 hours ago'
+
+        # Find and remove 'Show more' and 'Show less' buttons
+        for button in soup.find_all('button'):
+            if button.text.strip() in ['Show more', 'Show less']:
+                button.decompose()
+
+        # Extract job description in Markdown format
+        description_div = soup.find('div', {'class': 'description__text description__text--rich'})
+        job_description_md = ''
+        if description_div:
+            # Convert the inner HTML of description_div to Markdown
+            job_description_md = md(str(description_div), bullets=['•'])
+
+        return job_description_md, timestamp, ago_text
+
+    def rank_data(self):
+        """This Method keeps the candidates most relevant to the searched job title, the top RANK_TOP_N above RANK_MIN_SCORE."""
+        ranker = JobRanker(self._job_tile)
+        selected = ranker.select(
+            [(job[0], job[3]) for job in self.candidates], top_n=RANK_TOP_N, min_score=RANK_MIN_SCORE
+        )
+        self.candidates = [self.candidates[index] for index in selected]
 
-            # Extract ago text
-            ago_text_element = soup.find('span', class_='posted-time-ago__text')
-            # Check if the element was found before accessing .text
-            if ago_text_element:
-                ago_text = ago_text_element.text.strip()
-            else:
-                ago_text = "Unknown"
-
-            # Ectract the number from ago text
-            num = 0
-            match = re.search(r'\d+', ago_text)
-            if match:
-                num = int(match.group())
-
-            # Calculate post time
-            timestamp = datetime.now()
-            if 'minute' in ago_text:
-                timestamp = datetime.now() - timedelta(minutes=num)
-            elif 'hour' in ago_text:
-                timestamp = datetime.now() - timedelta(hours=num)
-            elif 'day' in ago_text:
-                timestamp = datetime.now() - timedelta(days=num)
-
-            # Rename ago text for better understanding
-            if ago_text.lower() == '1 day ago':
-                ago_text = '24 hours ago'
-
-            # Find and remove 'Show more' and 'Show less' buttons
-            for button in soup.find_all('button'):
-                if button.text.strip() in ['Show more', 'Show less']:
-                    button.decompose()
-
-            # Extract job description in Markdown format
-            description_div = soup.find('div', {'class': 'description__text description__text--rich'})
-            job_description_md = ''
-            if description_div:
-                # Convert the inner HTML of description_div to Markdown
-                job_description_md = md(str(description_div), bullets=['•'])
-
-            # Check if specified job title is found in either the job title or job description
-            if self._job_tile.lower() in job_title.lower() or self._job_tile in job_description_md.lower():
-                # Getting the AI tags for the job
-                ai_tags = self.get_ai_tags(job_title, job_company, job_location, job_description_md)
-                # Appending the job details to class variable list as a tuple
-                self.parsed_data.append((job_title, job_company, job_location, self.replace_md_spaces(job_description_md), apply_link, timestamp.astimezone(), ago_text, ai_tags))
+        # Reporting the number of jobs to tag.
+        self.progress.advance("selected", len(self.candidates))
+
+    def tag_data(self):
+        """This Method gets the AI tags of the ranked candidates."""
+        for job_title, job_company, job_location, job_description_md, apply_link, timestamp, ago_text in self.candidates:
+            # Stopping if every search waiting for this scrape was cancelled.
+            self.progress.raise_if_cancelled()
+
+            # Getting the AI tags for the job
+            ai_tags = self.get_ai_tags(job_title, job_company, job_location, job_description_md)
+            # Reporting the tagged job.
+            self.progress.advance("tagged")
+            # Appending the job details to class variable list as a tuple
+            self.parsed_data.append((job_title, job_company, job_location, self.replace_md_spaces(job_description_md), apply_link, timestamp, ago_text, ai_tags))
 
     def format_data(self):
         """This Method formats data after being parsed into a desired format"""
@@ -255,14 +403,41 @@ class LinkedinScrapper(Scrapper):
                 "about_job": self.limit_newlines(job[3]).strip(),
                 "apply_link": job[4],
                 "timestamp": job[6],
+                "posted_at": job[5],
                 "ai_tags": job[7]
             }
             # Adding this dict to the formatted_data instance variable.
             self.formatted_data.append(job_details)
 
     def get_ai_tags(self, job_title, job_company, job_location, job_description_md):
-        model = genai.GenerativeModel('gemini-1.5-flash-latest')
-        prompt = f"""
+        # Importing the Gemini API exceptions here, with google.generativeai.
+        from google.api_core.exceptions import ResourceExhausted, TooManyRequests
+
+        model = gemini().GenerativeModel('gemini-1.5-flash-latest')
+        prompt = self.ai_tags_prompt(job_title, job_company, job_location, job_description_md)
+        try:
+            record("gemini_calls")
+            response = model.generate_content(prompt)
+            if len(response.parts) == 0:
+                return ""
+            else:
+                return self.split_response_to_tags(response.parts[0].text)
+        except ResourceExhausted as e:
+            record("rate_limited")
+            print(datetime.now(), 'Gemini Resource Exhausted, switching tokens')
+            self.switchGeminiToken()
+        except TooManyRequests as e:
+            record("rate_limited")
+            retry_after = 60
+            print(datetime.now(), f'Too many requests to Gemini API, sleeping for {retry_after} seconds')
+            sleep(retry_after)
+        except Exception as e:
+            print(datetime.now(), f"An unexpected error occurred while getting AI Tags: {e}")
+            return ""
+
+    def ai_tags_prompt(self, job_title, job_company, job_location, job_description_md) -> str:
+        """This Method creates the Gemini prompt asking for the job's tags."""
+        return f"""
         I would like you to generate relevant tags for the following job vacancy:
         {job_title}
 
@@ -281,22 +456,6 @@ class LinkedinScrapper(Scrapper):
 
         Only include these exact tags if applicable, comma-separated.
         """
-        try:
-            response = model.generate_content(prompt)
-            if len(response.parts) == 0:
-                return ""
-            else:
-                return self.split_response_to_tags(response.parts[0].text)
-        except ResourceExhausted as e:
-            print(datetime.now(), 'Gemini Resource Exhausted, switching tokens')
-            self.switchGeminiToken()
-        except TooManyRequests as e:
-            retry_after = 60
-            print(datetime.now(), f'Too many requests to Gemini API, sleeping for {retry_after} seconds')
-            sleep(retry_after)
-        except Exception as e:
-            print(datetime.now(), f"An unexpected error occurred while getting AI Tags: {e}")
-            return ""
 
     def split_response_to_tags(self, response_text: str):
         hashtags = []
@@ -313,15 +472,8 @@ class LinkedinScrapper(Scrapper):
         return " ".join(hashtags) if hashtags else ""
 
     def switchGeminiToken(self):
-        self._current_api_key_index = (self._current_api_key_index + 1) % len(GEMINI_API_KEYS)
-        genai.configure(api_key=GEMINI_API_KEYS[self._current_api_key_index])
-
-    def remove_country_code_from_url(self, url):
-        # Regex pattern to match URLs with country code before linkedin.com
-        pattern = r'https://[a-z]{2}\.linkedin\.com'
-        # Replace the matched pattern with "https://linkedin.com"
-        new_url = re.sub(pattern, 'https://www.linkedin.com', url)
-        return new_url
+        # The key in use is shared by every scrapper, as is the Gemini configuration.
+        switch_gemini_key()
 
     def replace_md_spaces(self, text):
         # Replace lines that consist solely of attributed spaces, with the ones consisting of plain spaces
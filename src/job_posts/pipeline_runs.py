@@ -0,0 +1,280 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing re to escape the queries in the report.
+import re
+
+# Importing ContextVar to keep the current run of each thread, and of each asyncio task.
+from contextvars import ContextVar
+
+# Importing time to measure the runs and their stages.
+import time
+
+# Importing datetime to log the slow and failed runs.
+from datetime import datetime
+
+# Importing contextmanager to create the run and stage scopes.
+from contextlib import contextmanager
+
+# Importing decouple to get the regression settings from the .env file.
+from decouple import config
+
+# Importing the pipeline runs commands to record and read the runs history.
+from database import AddPipelineRunCommand, GetPipelineRunsCommand
+
+
+# Getting how many times slower than the trigger's median a run or a stage must be to be reported as a regression.
+RUNS_REGRESSION_FACTOR = config("RUNS_REGRESSION_FACTOR", default=1.5, cast=float)
+
+# Getting the number of latest runs compared to the ones before them to find the regressions.
+RUNS_RECENT_WINDOW = config("RUNS_RECENT_WINDOW", default=5, cast=int)
+
+# The counted events of a run.
+COUNTERS = ("cards_found", "details_fetched", "cache_hits", "gemini_calls", "messages_sent", "rate_limited")
+
+# The current run of each thread or asyncio task, the tasks started by a run (eg. the concurrent fetches) share it.
+_current_run: ContextVar["PipelineRun"] = ContextVar("pipeline_run", default=None)
+
+
+class PipelineRun:
+    """_summary_ : This class measures a run of the jobs pipeline: its counters and the time spent in each stage.
+
+    The run is the current run of the thread (or asyncio task) that started it, so the scrapper, the Gemini tagging
+    and the senders report to it with record() and stage() without it being passed around.
+    """
+
+    def __init__(self, trigger: str, query: str) -> None:
+        """_summary_ : This method starts the run.
+
+        Parameters
+        ----------
+        trigger : str
+            _description_ : What started the run ('channel' | 'prepare' | 'trickle' | 'subscriptions' | 'ljobs').
+        query : str
+            _description_ : The searched 'job title|locations', or a description of the run.
+        """
+        self.trigger = trigger
+        self.query = query
+        self.status = "ok"
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.duration = 0.0
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        # Dict[stage: seconds spent in it], a stage entered several times (eg. per location) adds up.
+        self.stages: dict[str, float] = {}
+
+    def to_row(self) -> dict:
+        """Returns the run as a pipeline_runs row."""
+        return {
+            "trigger": self.trigger,
+            "query": self.query,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration": self.duration,
+            **self.counts,
+            "stages": {stage: round(seconds, 3) for stage, seconds in self.stages.items()},
+        }
+
+
+def current_run() -> PipelineRun:
+    """Returns the current thread's run, None if the thread isn't running the pipeline."""
+    return _current_run.get()
+
+
+def record(counter: str, count: int = 1) -> None:
+    """_summary_ : This function adds to a counter of the current thread's run, if any.
+
+    Parameters
+    ----------
+    counter : str
+        _description_ : One of the COUNTERS.
+    count : int, optional
+        _description_, by default 1 : The number to add.
+    """
+    if run := current_run():
+        run.counts[counter] += count
+
+
+@contextmanager
+def stage(name: str):
+    """_summary_ : This context manager adds the time spent in its scope to a stage of the current thread's run, if any.
+
+    Example
+    -------
+        >>> with stage("send"):
+        ...     publish_job_posts(posts, bot, channel_id=CHANNEL_ID)
+    """
+    run = current_run()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if run:
+            run.stages[name] = run.stages.get(name, 0.0) + time.perf_counter() - start
+
+
+@contextmanager
+def pipeline_run(trigger: str, query: str):
+    """_summary_ : This context manager runs its scope as a pipeline run, recorded in the runs history once finished.
+
+    A run raising is recorded with the exception name as its status, a cancelled search with 'SearchCancelled'.
+    A run nested in another run (eg. a subscriptions run fetching its searches) reports to the outer one.
+
+    Parameters
+    ----------
+    trigger : str
+        _description_ : What started the run ('channel' | 'prepare' | 'trickle' | 'subscriptions' | 'ljobs').
+    query : str
+        _description_ : The searched 'job title|locations', or a description of the run.
+    """
+    if current_run():
+        yield current_run()
+        return
+
+    run = PipelineRun(trigger, query)
+    token = _current_run.set(run)
+    try:
+        yield run
+    except BaseException as e:
+        run.status = type(e).__name__
+        raise
+    finally:
+        _current_run.reset(token)
+        run.duration = time.perf_counter() - run._start
+        save_run(run)
+
+
+def save_run(run: PipelineRun) -> None:
+    """Records the run, and logs it if it's a regression, a failing history must not fail the pipeline."""
+    try:
+        previous = GetPipelineRunsCommand(trigger=run.trigger, limit=50).execute()
+        AddPipelineRunCommand(run=run.to_row()).execute()
+    except Exception as e:
+        print(datetime.now(), f"Recording the {run.trigger} pipeline run failed: {e}")
+        return
+
+    baseline = median([r["duration"] for r in previous if r["status"] == "ok"])
+    if run.status == "ok" and baseline and run.duration > baseline * RUNS_REGRESSION_FACTOR and len(previous) >= 5:
+        print(
+            datetime.now(),
+            f"Slow {run.trigger} pipeline run: {run.duration:.1f}s, the median is {baseline:.1f}s, stages {run.to_row()['stages']}",
+        )
+
+
+# ----- RUNS REPORTS ----- #
+
+
+def percentile(values: list[float], p: float) -> float:
+    """_summary_ : This function returns the p-th percentile of the values, interpolated between the closest ranks.
+
+    Parameters
+    ----------
+    values : list[float]
+        _description_ : The values.
+    p : float
+        _description_ : The percentile, from 0 to 100.
+
+    Returns
+    -------
+    float
+        _description_ : The percentile, None if there are no values.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    rank = (len(values) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def median(values: list[float]) -> float:
+    """Returns the median of the values, None if there are no values."""
+    return percentile(values, 50)
+
+
+def regressions(runs: list[dict], recent: int = RUNS_RECENT_WINDOW, factor: float = RUNS_REGRESSION_FACTOR) -> list[str]:
+    """_summary_ : This function compares the latest runs of a trigger with the ones before them.
+
+    Parameters
+    ----------
+    runs : list[dict]
+        _description_ : The runs of a single trigger, the latest first.
+    recent : int, optional
+        _description_, by default RUNS_RECENT_WINDOW : The number of latest runs compared.
+    factor : float, optional
+        _description_, by default RUNS_REGRESSION_FACTOR : How many times slower a median must be to be reported.
+
+    Returns
+    -------
+    list[str]
+        _description_ : The regressions, eg. 'tag: 12.0s → 31.5s (×2.6)', the total duration and each stage.
+    """
+    runs = [run for run in runs if run["status"] == "ok"]
+    latest, before = runs[:recent], runs[recent:]
+    if not latest or len(before) < recent:
+        return []
+
+    found = []
+    stages = {"total": None} | dict.fromkeys(stage for run in runs for stage in run["stages"])
+    for name in stages:
+
+        def seconds(run: dict) -> float:
+            return run["duration"] if name == "total" else run["stages"].get(name, 0.0)
+
+        now, then = median([seconds(run) for run in latest]), median([seconds(run) for run in before])
+        # Ignoring the stages too short to matter.
+        if then and now > then * factor and now - then > 1:
+            found.append(f"{name}: {then:.1f}s → {now:.1f}s (×{now / then:.1f})")
+    return found
+
+
+def escape(text: str) -> str:
+    """Escapes the legacy Markdown characters of a text, eg. a searched job title."""
+    return re.sub(r"([_*`\[])", r"\\\1", text)
+
+
+def runs_report(runs: list[dict], shown: int = 10) -> str:
+    """_summary_ : This function creates the /runs report: the latest runs, and per trigger the percentiles and regressions.
+
+    Parameters
+    ----------
+    runs : list[dict]
+        _description_ : The runs, the latest first.
+    shown : int, optional
+        _description_, by default 10 : The number of latest runs listed.
+
+    Returns
+    -------
+    str
+        _description_ : The report, in telegram's legacy Markdown.
+    """
+    if not runs:
+        return "No pipeline runs recorded yet."
+
+    lines = ["*Latest pipeline runs*", ""]
+    for run in runs[:shown]:
+        started = datetime.fromtimestamp(run["started_at"]).strftime("%m/%d %H:%M")
+        stages = ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in run["stages"].items())
+        lines.append(
+            f"• {started} *{run['trigger']}* {escape(run['query'])} {run['duration']:.1f}s"
+            f"{'' if run['status'] == 'ok' else ' ' + run['status']}\n"
+            f"  cards {run['cards_found']}, details {run['details_fetched']}, cache hits {run['cache_hits']}, "
+            f"gemini {run['gemini_calls']}, sent {run['messages_sent']}, 429s {run['rate_limited']}"
+            + (f"\n  {stages}" if stages else "")
+        )
+
+    for trigger in dict.fromkeys(run["trigger"] for run in runs):
+        trigger_runs = [run for run in runs if run["trigger"] == trigger]
+        durations = [run["duration"] for run in trigger_runs if run["status"] == "ok"]
+        failed = len(trigger_runs) - len(durations)
+        lines += ["", f"*{trigger}* ({len(trigger_runs)} runs, {failed} not ok)"]
+        if durations:
+            lines.append(
+                "• p50 {:.1f}s, p90 {:.1f}s, p99 {:.1f}s".format(
+                    percentile(durations, 50), percentile(durations, 90), percentile(durations, 99)
+                )
+            )
+        for regression in regressions(trigger_runs):
+            lines.append(f"• ⚠️ {regression}")
+
+    return "\n".join(lines)
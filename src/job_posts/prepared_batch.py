@@ -0,0 +1,70 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing time to age the prepared batches.
+import time
+
+# Importing dataclass to create the prepared batch dataclass.
+from dataclasses import dataclass
+
+# Importing threading to let the publish phase wait for a prepare phase still running.
+import threading
+
+
+@dataclass(slots=True)
+class PreparedBatch:
+    """_summary_ : This data class holds the channel posts scrapped, tagged and rendered ahead of the post time."""
+
+    # The rendered posts, ready to send.
+    posts: list[dict]
+    # The apply links of the batch jobs, so the top-up scrape doesn't post them twice.
+    links: set[str]
+    # The unix time the batch scrape started at, the top-up scrape covers the jobs posted since.
+    started_at: float
+
+
+class BatchSlot:
+    """_summary_ : This class holds the latest prepared batch until the publish phase takes it.
+
+    A publish phase starting while the prepare phase still runs (eg. LinkedIn is slow) waits for it, rather than
+    scrapping the same jobs a second time.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._batch: PreparedBatch = None
+        self._preparing = False
+
+    def start(self) -> None:
+        """Marks a prepare phase as running, dropping the batch left over by a previous one."""
+        with self._cond:
+            self._batch = None
+            self._preparing = True
+
+    def put(self, batch: PreparedBatch = None) -> None:
+        """Stores the prepared batch, None if the prepare phase failed, and wakes up the publish phase."""
+        with self._cond:
+            self._batch = batch
+            self._preparing = False
+            self._cond.notify_all()
+
+    def take(self, max_age: float, wait: float) -> PreparedBatch:
+        """_summary_ : This method takes the prepared batch, so it's only published once.
+
+        Parameters
+        ----------
+        max_age : float
+            _description_ : The number of seconds after its scrape started a batch is too old to publish.
+        wait : float
+            _description_ : The number of seconds to wait for a prepare phase still running.
+
+        Returns
+        -------
+        PreparedBatch
+            _description_ : The batch, None if there's none, it's too old, or the prepare phase is still running.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: not self._preparing, timeout=wait)
+            batch, self._batch = self._batch, None
+        if batch is None or time.time() - batch.started_at > max_age:
+            return None
+        return batch
@@ -0,0 +1,137 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing time to age the cached results.
+import time
+
+# Importing OrderedDict to keep the entries in least recently used order.
+from collections import OrderedDict
+
+# Importing datetime to log the failed refreshes.
+from datetime import datetime
+
+# Importing threading to refresh the stale results in the background.
+import threading
+
+# Importing Any, Callable & Hashable for type hinting.
+from typing import Any, Callable, Hashable
+
+
+class QueryResultCache:
+    """_summary_ : This class caches query results with a freshness TTL, a stale-while-revalidate window and LRU eviction.
+
+    - A result younger than 'ttl' is returned as is (hit).
+    - A result younger than 'ttl + stale_ttl' is returned right away, and refreshed in the background (stale hit).
+    - An older or missing result is loaded by the caller (miss).
+    """
+
+    def __init__(self, ttl: int, stale_ttl: int, max_size: int) -> None:
+        """_summary_ : This method initiates the cache.
+
+        Parameters
+        ----------
+        ttl : int
+            _description_ : The number of seconds a result is fresh.
+        stale_ttl : int
+            _description_ : The number of seconds after 'ttl' a stale result is still served while being refreshed.
+        max_size : int
+            _description_ : The maximum number of cached results, the least recently used are evicted first.
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        # OrderedDict[key: (stored at timestamp, value)], the least recently used key first.
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # The keys being refreshed in the background.
+        self._refreshing: set[Hashable] = set()
+        self._lock = threading.Lock()
+        # Dict[counter name: count].
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0}
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """_summary_ : This method stores a fresh result, evicting the least recently used ones above max_size.
+
+        Parameters
+        ----------
+        key : Hashable
+            _description_ : The query key.
+        value : Any
+            _description_ : The query result.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def get_or_load(
+        self, key: Hashable, loader: Callable[[], Any], refresher: Callable[[], Any] = None
+    ) -> Any:
+        """_summary_ : This method returns the cached result of the query, or loads it with the loader.
+
+        Parameters
+        ----------
+        key : Hashable
+            _description_ : The query key.
+        loader : Callable[[], Any]
+            _description_ : The function loading the query result, called on misses.
+        refresher : Callable[[], Any], optional
+            _description_, by default the loader : The function loading the query result on background refreshes.
+
+        Returns
+        -------
+        Any
+            _description_ : The query result.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.monotonic() - entry[0] if entry else None
+
+            # Fresh result.
+            if entry and age < self.ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[1]
+
+            # Stale result, served right away while being refreshed once in the background.
+            if entry and age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._stats["refreshes"] += 1
+                    threading.Thread(
+                        target=self._refresh, args=(key, refresher or loader), daemon=True
+                    ).start()
+                return entry[1]
+
+            self._stats["misses"] += 1
+
+        # Loading outside of the lock, loads can take minutes.
+        value = loader()
+        self.put(key, value)
+        return value
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        """Reloads a stale result in the background, keeping the stale one if the loader fails."""
+        try:
+            self.put(key, loader())
+        except Exception as e:
+            print(datetime.now(), f"Refreshing the cached result of {key} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def stats(self) -> dict[str, Any]:
+        """_summary_ : This method returns the cache counters and its hit rate.
+
+        Returns
+        -------
+        dict[str, Any]
+            _description_ : The counters, the current size, and the hit rate (fresh and stale hits over all lookups).
+        """
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries))
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
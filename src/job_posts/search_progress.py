@@ -0,0 +1,75 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing Event & Lock to share the progress between the scrapping thread and the searches watching it.
+from threading import Event, Lock
+
+
+class SearchCancelled(Exception):
+    """Raised inside a scrape once every search waiting for it was cancelled."""
+
+
+class SearchProgress:
+    """_summary_ : This class counts the progress of a scrape, and lets the searches waiting for it cancel it.
+
+    A scrape can be shared by several searches (single flight), each one joins the progress, and the scrape is only
+    cancelled once every search that joined it cancelled. Searches that can't be cancelled (eg. the scheduled channel
+    run) join without ever cancelling, so the scrape always completes for them.
+    """
+
+    # The counted stages, in pipeline order.
+    STAGES = ("cards_found", "details_fetched", "selected", "tagged")
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counts = dict.fromkeys(self.STAGES, 0)
+        # The number of searches waiting for the scrape, that didn't cancel.
+        self._watchers = 0
+        self._cancelled = Event()
+
+    def advance(self, stage: str, count: int = 1) -> None:
+        """_summary_ : This method adds to the count of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            _description_ : One of the STAGES.
+        count : int, optional
+            _description_, by default 1 : The number to add.
+        """
+        with self._lock:
+            self._counts[stage] += count
+
+    def snapshot(self) -> dict[str, int]:
+        """Returns a copy of the stages counts."""
+        with self._lock:
+            return dict(self._counts)
+
+    def join(self) -> bool:
+        """_summary_ : This method registers a search waiting for the scrape.
+
+        Returns
+        -------
+        bool
+            _description_ : False if the scrape was already cancelled, the search must start its own scrape.
+        """
+        with self._lock:
+            if self._cancelled.is_set():
+                return False
+            self._watchers += 1
+            return True
+
+    def cancel(self) -> None:
+        """Unregisters a cancelled search, the scrape is cancelled once no search waits for it anymore."""
+        with self._lock:
+            self._watchers -= 1
+            if self._watchers <= 0:
+                self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raises SearchCancelled if the scrape was cancelled, called by the scrapper between its steps."""
+        if self._cancelled.is_set():
+            raise SearchCancelled()
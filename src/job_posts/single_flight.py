@@ -0,0 +1,109 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing Event & Lock to let the concurrent callers wait for the running call.
+from threading import Event, Lock
+
+# Importing Any, Callable & Hashable for type hinting.
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    """This class holds the state of an in-flight call shared by all of its callers."""
+
+    __slots__ = ("done", "result", "error", "callers", "state")
+
+    def __init__(self) -> None:
+        # Set once the call returned or raised.
+        self.done = Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        # The number of callers sharing this call, the first one included.
+        self.callers = 1
+        # The leader's state shared with the other callers, eg. the call's progress.
+        self.state: Any = None
+
+
+class SingleFlight:
+    """_summary_ : This class coalesces concurrent calls with the same key into a single execution.
+
+    The first caller of a key runs the function, the callers arriving while it runs wait for it and get
+    the same result (or the same exception). Once the call returns, the next caller of the key starts a new one.
+
+    Example
+    -------
+        >>> flights = SingleFlight()
+        >>> flights.do(("python developer", ("berlin",)), scrape)
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        # Dict[key: in-flight call].
+        self._calls: dict[Hashable, _Call] = {}
+        # The number of calls that attached to an in-flight call instead of running the function.
+        self.shared_calls = 0
+
+    def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Any],
+        state: Any = None,
+        on_join: Callable[[Any], None] = None,
+    ) -> Any:
+        """_summary_ : This method runs the function, or waits for the in-flight call with the same key.
+
+        Parameters
+        ----------
+        key : Hashable
+            _description_ : The key identifying identical calls.
+        func : Callable[[], Any]
+            _description_ : The function to run if no call with this key is in-flight.
+        state : Any, optional
+            _description_, by default None : The state to share with the other callers if this call leads the flight.
+        on_join : Callable[[Any], None], optional
+            _description_, by default None : Called with the flight's state once the caller joined it, before waiting.
+                Returning False refuses an in-flight call (eg. its scrape was cancelled), the caller starts a new one.
+
+        Returns
+        -------
+        Any
+            _description_ : The result of the function, shared by all the callers of the same flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            # Attaching to the in-flight call, handing its shared state to the caller while the call can't complete.
+            if call is not None and (on_join is None or on_join(call.state) is not False):
+                call.callers += 1
+                self.shared_calls += 1
+                leader = False
+            # Starting a new call, it replaces an in-flight call the caller refused.
+            else:
+                call = self._calls[key] = _Call()
+                call.state = state
+                leader = True
+                if on_join is not None:
+                    on_join(call.state)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Removing the call before waking up the waiters, so later callers start a fresh call.
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def in_flight(self) -> int:
+        """Returns the number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,89 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing dataclass to create the saved search dataclass.
+from dataclasses import dataclass
+
+# Importing defaultdict to group the saved searches by their search.
+from collections import defaultdict
+
+
+@dataclass(slots=True, frozen=True)
+class Subscription:
+    """_summary_ : This data class holds a chat's saved search."""
+
+    # The saved search id.
+    subscription_id: int
+    # The subscribed chat id.
+    chat_id: str
+    # The normalized job title, eg. 'python developer'.
+    job_title: str
+    # The normalized location, eg. 'new york'.
+    location: str
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Subscription":
+        """Creates the saved search out of its database row (subscription_id, chat_id, job_title, location, date_added)."""
+        return cls(subscription_id=row[0], chat_id=row[1], job_title=row[2], location=row[3])
+
+    @property
+    def query(self) -> tuple[str, str]:
+        """The (job title, location) search parameters of the saved search."""
+        return self.job_title, self.location
+
+
+class SubscriptionMatcher:
+    """_summary_ : This class plans the scrapes the saved searches need, and routes the scrapped jobs to their subscribers.
+
+    The saved searches are deduped into one scrape per distinct (job title, location), so the scrapping cost grows
+    with the distinct searches and not with the subscribers. Each scrape is ranked on its own, and its jobs go to
+    the chats that saved its search, as LinkedIn found them.
+    """
+
+    def __init__(self, subscriptions: list[Subscription]) -> None:
+        """_summary_ : This method groups the saved searches by their search.
+
+        Parameters
+        ----------
+        subscriptions : list[Subscription]
+            _description_ : The saved searches of all the chats.
+        """
+        # Dict[(job title, location): the chats that saved it, in their saving order].
+        self.subscribers: dict[tuple[str, str], list[str]] = defaultdict(list)
+        for sub in subscriptions:
+            if sub.job_title.strip() and sub.chat_id not in self.subscribers[sub.query]:
+                self.subscribers[sub.query].append(sub.chat_id)
+
+    def queries(self) -> list[tuple[str, str]]:
+        """_summary_ : This method returns the scrapes covering every saved search.
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            _description_ : The distinct (job title, location) search parameters, sorted so the same searches always
+                give the same scrapes.
+        """
+        return sorted(self.subscribers)
+
+    def route(self, results: dict[tuple[str, str], list[dict]]) -> dict[str, list[dict]]:
+        """_summary_ : This method routes the jobs of each scrape to the chats that saved its search.
+
+        Parameters
+        ----------
+        results : dict[tuple[str, str], list[dict]]
+            _description_ : Dict[(job title, location): the jobs its scrape found], formatted by the scrapper.
+
+        Returns
+        -------
+        dict[str, list[dict]]
+            _description_ : Dict[chat id: its jobs], a job found by several of a chat's searches is routed to it once,
+                in the scrapes order.
+        """
+        routes: dict[str, list[dict]] = defaultdict(list)
+        routed: dict[str, set[str]] = defaultdict(set)
+        for query in self.queries():
+            for job in results.get(query, []):
+                for chat_id in self.subscribers[query]:
+                    if job["apply_link"] not in routed[chat_id]:
+                        routed[chat_id].add(job["apply_link"])
+                        routes[chat_id].append(job)
+        return dict(routes)
@@ -0,0 +1,92 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing argparse to read the benchmark settings from the command line.
+import argparse
+
+# Importing os, subprocess & sys to import the bot in fresh interpreters, from the bot's directory.
+import os
+import subprocess
+import sys
+
+# Importing statistics to summarize the runs.
+import statistics
+
+# Importing defaultdict to total the import times per package.
+from collections import defaultdict
+
+
+# The bot's directory, the benchmarked modules are imported from it as the bot does.
+BOT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_times(module: str) -> list[tuple[str, int, int]]:
+    """Imports the module in a fresh interpreter, and returns the (module, self us, cumulative us) of every import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BOT_DIRECTORY,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    times = []
+    for line in result.stderr.splitlines():
+        # Lines look like 'import time:       236 |      11571 |   database.db_commands', after a header line.
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def cold_start(module: str) -> float:
+    """Returns the seconds importing the module takes in a fresh interpreter, the interpreter start excluded."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)",
+        ],
+        cwd=BOT_DIRECTORY,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """Measures the bot's cold start, and breaks the import cost down per module and per package."""
+    parser = argparse.ArgumentParser(description="Bot cold start (import) benchmark.")
+    parser.add_argument("--module", default="bot", help="The module to import, the bot by default.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # Timing the whole import, over fresh interpreters so nothing is cached but the bytecode.
+    seconds = [cold_start(args.module) for _ in range(args.runs)]
+    print(
+        f"import {args.module}: median {statistics.median(seconds) * 1000:,.0f} ms, "
+        f"min {min(seconds) * 1000:,.0f} ms, max {max(seconds) * 1000:,.0f} ms over {args.runs} runs\n"
+    )
+
+    # Breaking a single import down, each module's cumulative time includes the modules it imported first.
+    times = import_times(args.module)
+    print(f"{'module (slowest cumulative)':<50} {'self ms':>9} {'cumul. ms':>10}")
+    for name, self_us, cumulative_us in sorted(times, key=lambda item: item[2], reverse=True)[: args.top]:
+        print(f"{name:<50} {self_us / 1000:>9,.1f} {cumulative_us / 1000:>10,.1f}")
+
+    # Totalling the modules own time per top-level package, the dependencies worth deferring stand out.
+    packages = defaultdict(int)
+    for name, self_us, _ in times:
+        packages[name.split(".")[0]] += self_us
+    print(f"\n{'package (slowest self total)':<50} {'ms':>9} {'share':>10}")
+    total = sum(packages.values())
+    for name, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"{name:<50} {self_us / 1000:>9,.1f} {self_us / total:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
 from .chat_handler.handlers.message_handlers import (
     GroupMessageHandler,
     OwnerMessageHandler,
+    PrivateMessageHandler,
 )
 from .chat_handler.handlers.my_chat_handlers import MyChatMember
+from .chat_handler.handlers.callback_query_handlers import InlineButtonHandler
+from .chat_handler.handlers.inline_query_handlers import InlineModeHandler
 from .chat_handler.handlers_functions.my_chat_functions import allow_chat
 from .middlewares.filters import IsOwner, NotSpammer
 from .middlewares.spam_middleware import SpamMiddleware
-from .utilities.scheduler import Scheduler
-from .keyboards.inline.inline_keyboards import jobs_post_inline_kb
+from .utilities.scheduler import AsyncScheduler, Scheduler
+from .utilities.webhook import WebhookServer
+from .keyboards.inline.inline_keyboards import (
+    jobs_digest_inline_kb,
+    jobs_pager_inline_kb,
+    jobs_post_inline_kb,
+    search_cancel_inline_kb,
+)
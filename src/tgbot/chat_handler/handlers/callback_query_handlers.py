@@ -0,0 +1,74 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing the abstract base class and abstract method to create the callback handler interface
+from abc import ABC, abstractmethod
+
+# Importing Callable to type hinting
+from typing import Callable
+
+# Importing the TeleBot object
+from telebot import TeleBot
+
+# Defining the Callback Query Handler base class
+class CallbackQueryHandler(ABC):
+    """Abstract callback query handlers class"""
+
+    # Bot instance
+    bot: TeleBot
+
+    @abstractmethod
+    def callback_query_handler(self):
+        """This method implements the register_callback_query_handler functionality"""
+        # DOCS:https://pytba.readthedocs.io/en/latest/sync_version/index.html#telebot.TeleBot.register_callback_query_handler
+
+
+class InlineButtonHandler(CallbackQueryHandler):
+    """This class handles the inline keyboard buttons presses registration."""
+
+    def __init__(self, bot: TeleBot) -> None:
+        """_summary_ : This class register the inline keyboard buttons callbacks.
+
+        Parameters
+        ----------
+        bot : TeleBot
+            _description_ : Bot instance.
+
+        Methods
+        -------
+        callback_query_handler()
+
+        _parameters_
+        ------------
+            func : Callable
+                _description_ : The function to be called.
+            prefix : str
+                _description_ : The callback data prefix of the buttons handled by the function.
+
+        __Example__ :
+        -------------
+            >>> InlineButtonHandler(bot).callback_query_handler(func=ljobs_page, prefix="ljobs:")
+        """
+
+        # Bot instance
+        self.bot = bot
+
+    def callback_query_handler(self, *, func: Callable, prefix: str) -> None:
+        """_summary_ : This Method takes the function to be called when a button with the given callback data prefix is pressed.
+
+        Parameters
+        ----------
+        func : Callable
+            _description_ : The function to be called.
+        prefix : str
+            _description_ : The callback data prefix of the buttons handled by the function.
+
+        Example
+        -------
+            >>> InlineButtonHandler(bot).callback_query_handler(func=ljobs_page, prefix="ljobs:")
+
+        """
+        self.bot.register_callback_query_handler(
+            callback=func,  # The function that is going to be called.
+            func=lambda call: (call.data or "").startswith(prefix),  # Matching the buttons by their data prefix.
+            pass_bot=True,  # Passing the bot the function.
+        )
@@ -0,0 +1,70 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing the abstract base class and abstract method to create the inline query handler interface
+from abc import ABC, abstractmethod
+
+# Importing Callable to type hinting
+from typing import Callable
+
+# Importing the TeleBot object
+from telebot import TeleBot
+
+# Defining the Inline Query Handler base class
+class InlineQueryHandler(ABC):
+    """Abstract inline query handlers class"""
+
+    # Bot instance
+    bot: TeleBot
+
+    @abstractmethod
+    def inline_handler(self):
+        """This method implements the register_inline_handler functionality"""
+        # DOCS:https://pytba.readthedocs.io/en/latest/sync_version/index.html#telebot.TeleBot.register_inline_handler
+
+
+class InlineModeHandler(InlineQueryHandler):
+    """This class handles the inline mode queries registration, '@bot python berlin' in any chat."""
+
+    def __init__(self, bot: TeleBot) -> None:
+        """_summary_ : This class register the inline mode queries callbacks.
+
+        Parameters
+        ----------
+        bot : TeleBot
+            _description_ : Bot instance.
+
+        Methods
+        -------
+        inline_handler()
+
+        _parameters_
+        ------------
+            func : Callable
+                _description_ : The function to be called.
+
+        __Example__ :
+        -------------
+            >>> InlineModeHandler(bot).inline_handler(func=ljobs_inline)
+        """
+
+        # Bot instance
+        self.bot = bot
+
+    def inline_handler(self, *, func: Callable) -> None:
+        """_summary_ : This Method takes the function to be called when the bot is queried in inline mode.
+
+        Parameters
+        ----------
+        func : Callable
+            _description_ : The function to be called.
+
+        Example
+        -------
+            >>> InlineModeHandler(bot).inline_handler(func=ljobs_inline)
+
+        """
+        self.bot.register_inline_handler(
+            callback=func,  # The function that is going to be called.
+            func=lambda query: True,  # Handling every inline query.
+            pass_bot=True,  # Passing the bot the function.
+        )
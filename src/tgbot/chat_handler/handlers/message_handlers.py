@@ -145,3 +145,50 @@ class GroupMessageHandler(MessageHandler):
             is_chat_admin=group_admins,  # Check wether user is admin in chat or not.
             spamfilter=True,  # Adding the Not spam filter.
         )
+
+
+class PrivateMessageHandler(MessageHandler):
+    """This class handles the messages | commands registration for the private chat with any user."""
+
+    def __init__(self, bot: TeleBot) -> None:
+        """_summary_ : This class register the private chat commands, available to every user.
+
+        Parameters
+        ----------
+        bot : _type_ : TeleBot
+            _description_ : bot instance.
+
+        Methods
+        -------
+        register_message_handler()
+            _summary_ : This Method takes in a function and a list of commands, and calls the function when these command are sent in the 'Private chat' from any user.
+
+            __Example__
+            -----------
+                >>>  PrivateMessageHandler.message_handler(func=start, commands=['start'])
+        """
+        # Bot instance
+        self.bot = bot
+
+    def message_handler(self, *, func: Callable, commands: list[str]) -> None:
+        """_summary_ : This Method takes in a function and a list of commands, and calls the function when these command are sent in the 'Private chat' from any user.
+
+        Parameters
+        ----------
+        func : Callable
+            _description_ : The function to be called.
+        commands : list[str]
+            _description_ : a list of strings specifying the commands for the bot listens for.
+
+        Example
+        -------
+            >>>  PrivateMessageHandler.message_handler(func=start, commands=['start'])
+        """
+        # Registering the command.
+        self.bot.register_message_handler(
+            callback=func,  # Command function name from the 'command.py' module.
+            commands=commands,  # Command call name in chat.
+            chat_types=["private"],  # Specifying chat type for this command.
+            pass_bot=True,  # Passing the bot instance into the function.
+            spamfilter=True,  # Adding the Not spam filter.
+        )
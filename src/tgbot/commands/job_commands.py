@@ -1,19 +1,151 @@
 # ----- IMPORTING REQUIRED MODULES ----- #
 
+# Importing random to randomly choose a reply from the helper messages dict.
+import random
+
 # Importing re for regex.
 import re
 
+# Importing uuid to create the stored result sets ids.
+import uuid
+
+# Importing time to get the inline searches posting window.
+import time
+
+# Importing partial to pass the task to the progress callback.
+from functools import partial
+
+# Importing Callable for type hinting.
+from typing import Callable
+
+# Importing decouple to get the result sets TTL from the .env file.
+from decouple import config
+
 # Importing telegram bot API.
-from telebot import TeleBot, util
+from telebot import TeleBot, apihelper, util
+
+# Importing telegram API Message, CallbackQuery & InlineQuery objects, and the inline query results.
+from telebot.types import (
+    CallbackQuery,
+    InlineQuery,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+    Message,
+)
 
-# Importing telegram API Message object.
-from telebot.types import Message
+# Importing the job post, the result set pager and the search cancel inline keyboards.
+from tgbot import jobs_pager_inline_kb, jobs_post_inline_kb, search_cancel_inline_kb
+
+# Importing the owner's username, the owner can cancel any search.
+from tgbot.middlewares.filters import OWNER
+
+# Importing the search queue to run the searches off the bot's handler threads.
+from tgbot.utilities.search_queue import SearchQueue, SearchRejected, SearchTask
+
+# Importing the scheduled run, to cancel the scheduled updates the scheduler times out.
+from tgbot.utilities.scheduler import current_scheduled_run
+
+# Importing the expiring store to keep the /ljobs result sets server-side.
+from tgbot.utilities.expiring_store import ExpiringStore
+
+# Importing helper messages.
+from tgbot.utilities.chat_helper import msgs
 
 # Importing jobs factory function to create scrap jobs => create job posts.
-from job_posts.job_post_factory import jobs_factory
+from job_posts.job_post_factory import (
+    channel_jobs_preparer,
+    channel_jobs_trickle,
+    channel_jobs_updater,
+    coverage_key,
+    jobs_factory,
+    post_creator,
+    search_key,
+    subscriptions_updater,
+)
+
+# Importing the pipeline run recorder to record the /ljobs searches.
+from job_posts.pipeline_runs import PipelineRun, pipeline_run, record, stage
+
+# Importing the job post creator and the job keys, to create the inline results and the full post links.
+from job_posts.job_post_creator import TgJobPost, job_key
+
+# Importing the fetch interval, the inline searches only show the jobs posted within it.
+from job_posts.job_scrapper import FETCH_JOBS_INTERVAL
+
+# Importing the inline search command to answer the inline queries from the local jobs index.
+# Importing the subscriptions commands to manage the chats saved searches.
+from database import (
+    AddSubscriptionCommand,
+    DeleteSubscriptionCommand,
+    GetJobCommand,
+    GetSubscriptionsCommand,
+    InlineSearchJobsCommand,
+    SubscriptionLimitReached,
+)
+
+# Importing job posts sender function and the digest jobs store to send the full job posts on demand.
+# Importing split_markdown to fit a job post in a single page.
+from job_posts.job_post_sender import job_details_store, send_job_posts, split_markdown
+
+# Importing the exception raised by cancelled scrapes.
+from job_posts.search_progress import SearchCancelled
+
+
+# ----- GLOBAL VARIABLES ----- #
+
+# Getting how long (in seconds) the /ljobs result sets can be navigated (default = 6 hours).
+LJOBS_RESULTS_TTL = config("LJOBS_RESULTS_TTL", default=21600, cast=int)
+
+# The /ljobs result sets, keyed by their id => {"chat_id": chat id, "posts": list of job posts}.
+ljobs_results = ExpiringStore(ttl=LJOBS_RESULTS_TTL, max_size=500)
+
+# Getting the number of searches running at the same time.
+SEARCH_WORKERS = config("SEARCH_WORKERS", default=3, cast=int)
+
+# Getting the number of search workers kept for the scheduled channel run and the owner.
+SEARCH_RESERVED_WORKERS = config("SEARCH_RESERVED_WORKERS", default=1, cast=int)
+
+# Getting the number of searches a group can run at the same time.
+SEARCH_MAX_RUNNING_PER_CHAT = config("SEARCH_MAX_RUNNING_PER_CHAT", default=1, cast=int)
 
-# Importing job posts sender function to loop over created job data and send each with inline keyboard.
-from job_posts.job_post_sender import send_job_posts
+# Getting the number of searches a group can have waiting in the queue.
+SEARCH_MAX_QUEUED_PER_CHAT = config("SEARCH_MAX_QUEUED_PER_CHAT", default=2, cast=int)
+
+# Getting the number of searches that can wait in the queue.
+SEARCH_MAX_QUEUED = config("SEARCH_MAX_QUEUED", default=20, cast=int)
+
+# Getting the number of seconds a search can wait in the queue before being dropped (default = 10 minutes).
+SEARCH_MAX_WAIT = config("SEARCH_MAX_WAIT", default=600, cast=int)
+
+# Getting the number of seconds between two progress updates of a running search.
+SEARCH_REPORT_INTERVAL = config("SEARCH_REPORT_INTERVAL", default=5, cast=int)
+
+# Getting how long (in seconds) the inline results of a query are reused (default = 1 minute).
+INLINE_RESULTS_TTL = config("INLINE_RESULTS_TTL", default=60, cast=int)
+
+# Getting the maximum number of jobs an inline query returns, across all its pages.
+INLINE_MAX_RESULTS = config("INLINE_MAX_RESULTS", default=100, cast=int)
+
+# Getting how long (in seconds) the local jobs index can take to answer an inline query (default = 80 ms).
+INLINE_DEADLINE = config("INLINE_DEADLINE", default=0.08, cast=float)
+
+# Getting the number of searches a chat can save.
+SUBSCRIPTIONS_MAX_PER_CHAT = config("SUBSCRIPTIONS_MAX_PER_CHAT", default=10, cast=int)
+
+# Getting the number of distinct searches all the chats can save, each one is scrapped every subscriptions run.
+SUBSCRIPTIONS_MAX_SEARCHES = config("SUBSCRIPTIONS_MAX_SEARCHES", default=50, cast=int)
+
+# Telegram's maximum number of results per inline answer.
+INLINE_PAGE_SIZE = 50
+
+# The inline results, keyed by the normalized query => list of InlineQueryResultArticle.
+inline_results = ExpiringStore(ttl=INLINE_RESULTS_TTL, max_size=200)
+
+# The maximum length of a result set page, leaving room for the cut marker.
+LJOBS_PAGE_LENGTH = 4000
+
+# The waiting message text.
+LJOBS_WAIT_TEXT = "Please wait while we gather the latest vacancies for you⏳..."
 
 
 # ----- DEFINING INTERFACES  ----- #
@@ -51,55 +183,586 @@ def param_validator(parameter: str) -> bool:
     return bool(re.search(pattern, params))
 
 
-# ----- JOBS COMMANDS ----- #
+def ljobs_page_text(post: dict) -> str:
+    """_summary_ : This function fits a job post in a single message, cutting the job description if needed.
 
+    Parameters
+    ----------
+    post : dict
+        _description_ : The job post created by the telegram post creator.
+
+    Returns
+    -------
+    str
+        _description_ : The job post text, at most a message long.
+    """
+    # Leaving room for the cut marker.
+    chunks = split_markdown(post["job_details"], max_length=LJOBS_PAGE_LENGTH)
+
+    # Adding a cut marker if the description didn't fit.
+    return chunks[0] + ("\n\n…" if len(chunks) > 1 else "")
 
-def ljobs(msg: Message, bot: TeleBot) -> None:
-    """This function handles the '/ljobs' command."""
 
-    # Send a waiting message to the user.
-    wait_message = bot.reply_to(msg, "Please wait while we gather the latest vacancies for you⏳...")
+def ljobs_full_post_url(bot: TeleBot, post: dict) -> str | None:
+    """_summary_ : This function returns the deep link sending the full post of a job its page cuts, like the digest buttons.
+
+    Parameters
+    ----------
+    bot : TeleBot
+        _description_ : The bot instance, the link opens its private chat.
+    post : dict
+        _description_ : The job post created by the telegram post creator.
+
+    Returns
+    -------
+    str | None
+        _description_ : The '/start job_<key>' deep link, None if the post fits in its page.
+    """
+    if len(post["job_details"]) <= LJOBS_PAGE_LENGTH:
+        return None
+
+    # Storing the full post, so '/start job_<key>' can send it later.
+    key = job_key(post["job_link"])
+    job_details_store.set(key, post)
+    return f"https://t.me/{bot.user.username}?start=job_{key}"
+
+
+def edit_ljobs_page(bot: TeleBot, chat_id: int, message_id: int, result_id: str, posts: list[dict], page: int) -> None:
+    """_summary_ : This function shows a page of a stored /ljobs result set in its message.
+
+    Telegram refuses some scraped descriptions Markdown, the page is then shown as plain text.
+
+    Parameters
+    ----------
+    bot : TeleBot
+        _description_ : The bot instance.
+    chat_id : int
+        _description_ : The result set's chat id.
+    message_id : int
+        _description_ : The result set's message id.
+    result_id : str
+        _description_ : The id of the stored result set.
+    posts : list[dict]
+        _description_ : The result set's job posts.
+    page : int
+        _description_ : The index of the job to show.
+    """
+    post = posts[page]
+    page_message = {
+        "chat_id": chat_id,
+        "message_id": message_id,
+        "text": ljobs_page_text(post),
+        "reply_markup": jobs_pager_inline_kb(
+            result_id, page, len(posts), post["job_link"], full_post_url=ljobs_full_post_url(bot, post)
+        ),
+        "disable_web_page_preview": True,
+    }
 
     try:
-        # If search parameters were provided:
-        if search_params := util.extract_arguments(msg.text).strip():
-            # Strip space for the string if any and check parameters format.
-            if not param_validator(search_params):
-                bot.edit_message_text(
-                    chat_id=msg.chat.id,
-                    message_id=wait_message.message_id,
-                    text=f"*{msg.text}* is not a valid search pattern. Please follow this pattern: /ljobs Job Title, Location",
-                    parse_mode="markdown"
-                )
-                return
-            # Convert search parameters into a tuple.
-            search_params = tuple(search_params.split(","))
-
-            # Pass the new search params to create jobs using the jobs factory function.
-            jobs = jobs_factory(search_params)
-        else:
-            # Create jobs using the jobs factory function without parameters.
-            jobs = jobs_factory()
-
-        # Delete the waiting message.
-        bot.delete_message(chat_id=msg.chat.id, message_id=wait_message.message_id)
-
-        # Loop over the list of created posts and send each one.
-        send_job_posts(posts=jobs, bot=bot, msg=msg)
+        bot.edit_message_text(parse_mode="Markdown", **page_message)
+    except apihelper.ApiTelegramException as e:
+        if e.error_code != 400:
+            raise e
+        # Telegram refuses edits that don't change the message, eg. a single job result set.
+        if "message is not modified" in e.description:
+            return
+        # Showing the page without its broken Markdown, rather than not showing it.
+        bot.edit_message_text(**page_message)
+
+
+# ----- SEARCH QUEUE ----- #
+
+
+def ljobs_progress_text(task: SearchTask) -> str:
+    """_summary_ : This function creates the waiting message text reporting the search progress.
+
+    Parameters
+    ----------
+    task : SearchTask
+        _description_ : The running search task.
+
+    Returns
+    -------
+    str
+        _description_ : The waiting message text.
+    """
+    # The task didn't join a scrape yet.
+    if task.progress is None:
+        return LJOBS_WAIT_TEXT
+
+    counts = task.progress.snapshot()
+    return (
+        f"{LJOBS_WAIT_TEXT}\n\n"
+        f"• Job cards found: {counts['cards_found']}\n"
+        f"• Details fetched: {counts['details_fetched']}/{counts['cards_found']}\n"
+        f"• Relevant: {counts['selected']}\n"
+        f"• Tagged: {counts['tagged']}/{counts['selected']}"
+    )
 
+
+def report_ljobs_search(task: SearchTask) -> None:
+    """This function edits the waiting message of a running search with its progress, called by the search queue."""
+    # The scheduled runs have no waiting message.
+    if task.lane == "scheduled":
+        return
+
+    # Editing under the task's message lock, the search's outcome is only edited in once the task is finalized.
+    with task.message_lock:
+        if task.finalized or task.status != "running":
+            return
+
+        text = ljobs_progress_text(task)
+
+        # Telegram refuses edits that don't change the message.
+        if text == task.context["last_report"]:
+            return
+
+        task.context["bot"].edit_message_text(
+            chat_id=task.chat_id,
+            message_id=task.message_id,
+            text=text,
+            reply_markup=search_cancel_inline_kb(task.task_id),
+        )
+        task.context["last_report"] = text
+
+
+def expire_ljobs_search(task: SearchTask) -> None:
+    """This function lets the user know their search waited too long in the queue, called by the search queue."""
+    task.context["bot"].edit_message_text(
+        chat_id=task.chat_id,
+        message_id=task.message_id,
+        text="⌛ The bot was too busy to run your search in time, please try again later.",
+    )
+
+
+def run_ljobs_search(task: SearchTask) -> None:
+    """This function runs a queued /ljobs search as a recorded pipeline run, called by the search queue."""
+    with pipeline_run("ljobs", coverage_key(search_key(task.search_params))) as run:
+        # The time the search waited in the queue.
+        run.stages["queue"] = time.monotonic() - task.queued_at
+        ljobs_search(task, run)
+
+
+def ljobs_search(task: SearchTask, run: PipelineRun) -> None:
+    """This function runs a /ljobs search, and turns its waiting message into the result set's first page."""
+    bot = task.context["bot"]
+
+    try:
+        # Creating the jobs posts, the task joins the scrape's progress to report it and be able to cancel it.
+        jobs = jobs_factory(
+            task.search_params,
+            post_mode="full",
+            on_progress=partial(search_queue.join_progress, task),
+        )
+    except SearchCancelled:
+        task.finalize()
+        run.status = "SearchCancelled"
+        # The cancel button already updated the waiting message.
+        if task.cancelled.is_set():
+            return
+        # The searches sharing the scrape cancelled it, letting the user know rather than leaving them waiting.
+        bot.edit_message_text(
+            chat_id=task.chat_id,
+            message_id=task.message_id,
+            text="The search was interrupted🙊, please try again.",
+        )
+        return
     except Exception as e:
+        task.finalize()
+        run.status = type(e).__name__
         # In case scrapping fails or an error occurs, update the waiting message to show an error.
-        error_message = f"Something went wrong while fetching the vacancies🙊: {e}"
         try:
             error_message = f"Something went wrong while fetching the vacancies🙊: {e}"
             bot.edit_message_text(
-                chat_id=msg.chat.id,
-                message_id=wait_message.message_id,
+                chat_id=task.chat_id,
+                message_id=task.message_id,
                 text=error_message
             )
         except Exception as edit_error:
             error_message = f"Something went wrong while posting the vacancies🙊: {e}, {edit_error}"
             bot.send_message(
-                chat_id=msg.chat.id,
+                chat_id=task.chat_id,
                 text=error_message,
             )
+        return
+
+    # Stopping the progress reports, the waiting message shows the search's outcome from now on.
+    task.finalize()
+
+    # The search was cancelled while other searches kept the scrape running.
+    if task.cancelled.is_set():
+        run.status = "SearchCancelled"
+        return
+
+    # Letting the user know if no vacancies were found.
+    if not jobs:
+        bot.edit_message_text(
+            chat_id=task.chat_id,
+            message_id=task.message_id,
+            text="No vacancies were found for this search🙊, try again later or with other parameters.",
+        )
+        return
+
+    # Storing the result set server-side, the pager buttons navigate it by its id.
+    result_id = uuid.uuid4().hex[:12]
+    ljobs_results.set(result_id, {"chat_id": task.chat_id, "posts": jobs})
+
+    # Turning the waiting message into the first page of the result set.
+    try:
+        with stage("send"):
+            edit_ljobs_page(bot, task.chat_id, task.message_id, result_id, jobs, 0)
+    except Exception as e:
+        run.status = type(e).__name__
+        # Replacing the waiting message and its dead cancel button with the error.
+        bot.edit_message_text(
+            chat_id=task.chat_id,
+            message_id=task.message_id,
+            text=f"Something went wrong while posting the vacancies🙊: {e}",
+        )
+        return
+    record("messages_sent")
+
+
+# The /ljobs searches queue, running the searches on its own worker threads.
+search_queue = SearchQueue(
+    runner=run_ljobs_search,
+    reporter=report_ljobs_search,
+    expirer=expire_ljobs_search,
+    workers=SEARCH_WORKERS,
+    reserved_workers=SEARCH_RESERVED_WORKERS,
+    max_running_per_chat=SEARCH_MAX_RUNNING_PER_CHAT,
+    max_queued_per_chat=SEARCH_MAX_QUEUED_PER_CHAT,
+    max_queued=SEARCH_MAX_QUEUED,
+    max_wait=SEARCH_MAX_WAIT,
+    report_interval=SEARCH_REPORT_INTERVAL,
+)
+
+
+def queued_channel_jobs_updater(bot: TeleBot) -> None:
+    """_summary_ : This function runs the scheduled channel update on the search queue's priority lane, and waits for it.
+
+    Parameters
+    ----------
+    bot : TeleBot
+        _description_ : bot instance
+    """
+    queued_scheduled_run(channel_jobs_updater, bot)
+
+
+def queued_channel_jobs_preparer(bot: TeleBot) -> None:
+    """_summary_ : This function runs the scheduled channel prepare phase on the search queue's priority lane, and waits for it.
+
+    Parameters
+    ----------
+    bot : TeleBot
+        _description_ : bot instance
+    """
+    queued_scheduled_run(channel_jobs_preparer, bot)
+
+
+def queued_channel_jobs_trickle(bot: TeleBot) -> None:
+    """_summary_ : This function runs the scheduled channel trickle scrape on the search queue's priority lane, and waits for it.
+
+    Parameters
+    ----------
+    bot : TeleBot
+        _description_ : bot instance
+    """
+    queued_scheduled_run(channel_jobs_trickle, bot)
+
+
+def queued_subscriptions_updater(bot: TeleBot) -> None:
+    """_summary_ : This function runs the scheduled saved searches delivery on the search queue's priority lane, and waits for it.
+
+    Parameters
+    ----------
+    bot : TeleBot
+        _description_ : bot instance
+    """
+    queued_scheduled_run(subscriptions_updater, bot)
+
+
+def queued_scheduled_run(updater: Callable[..., None], bot: TeleBot) -> None:
+    """Runs a scheduled updater as a 'scheduled' lane task, and waits for it so the schedule doesn't overlap runs.
+
+    The task joins the scrapes it runs, so a scheduler timeout cancels them like the /ljobs cancel button does.
+    """
+    task = SearchTask(
+        chat_id=0,
+        user_id=0,
+        message_id=0,
+        lane="scheduled",
+        runner=lambda task: updater(bot, on_progress=partial(search_queue.join_progress, task)),
+    )
+    search_queue.submit(task)
+
+    # Cancelling the task if the scheduler times the run out.
+    if run := current_scheduled_run():
+        run.on_cancel(partial(search_queue.cancel, task.task_id))
+    task.finished.wait()
+
+
+# ----- INLINE MODE ----- #
+
+
+def inline_articles(jobs: list[dict]) -> list[InlineQueryResultArticle]:
+    """_summary_ : This function creates the inline results of the jobs, each one sends the job post when chosen.
+
+    Parameters
+    ----------
+    jobs : list[dict]
+        _description_ : The jobs formatted like the scrapper does.
+
+    Returns
+    -------
+    list[InlineQueryResultArticle]
+        _description_ : The inline results, in the jobs order.
+    """
+    return [
+        InlineQueryResultArticle(
+            id=job_key(job["apply_link"]),
+            title=job["job_title"],
+            description=f"🏢 {job['job_company']} · 📍 {job['job_location']} · {job['timestamp']}",
+            input_message_content=InputTextMessageContent(
+                ljobs_page_text(post), parse_mode="Markdown", disable_web_page_preview=True
+            ),
+            reply_markup=jobs_post_inline_kb(post["job_link"]),
+        )
+        for job, post in zip(jobs, post_creator(data=jobs, creator=TgJobPost))
+    ]
+
+
+# ----- JOBS COMMANDS ----- #
+
+
+def ljobs(msg: Message, bot: TeleBot) -> None:
+    """This function handles the '/ljobs' command, by queueing the search and returning right away."""
+
+    # If search parameters were provided:
+    if search_params := util.extract_arguments(msg.text).strip():
+        # Strip space for the string if any and check parameters format.
+        if not param_validator(search_params):
+            bot.reply_to(
+                msg,
+                f"*{msg.text}* is not a valid search pattern. Please follow this pattern: /ljobs Job Title, Location",
+                parse_mode="markdown"
+            )
+            return
+        # Convert search parameters into a tuple.
+        search_params = tuple(search_params.split(","))
+
+    # Letting the user know how many searches are ahead of theirs.
+    text = LJOBS_WAIT_TEXT
+    if ahead := search_queue.pending():
+        text += f"\n\nQueued, {ahead} search(es) ahead of yours."
+
+    # Creating the search task, it's reported on the waiting message.
+    task = SearchTask(
+        chat_id=msg.chat.id,
+        user_id=msg.from_user.id,
+        message_id=0,
+        search_params=search_params or None,
+        context={"bot": bot},
+        # The owner's searches have their own priority lane.
+        lane="owner" if msg.from_user.username == OWNER else "chat",
+    )
+
+    # Send a waiting message to the user, with a button to cancel the search.
+    wait_message = bot.reply_to(msg, text, reply_markup=search_cancel_inline_kb(task.task_id))
+    task.message_id = wait_message.message_id
+    task.context["last_report"] = text
+
+    try:
+        # Queueing the search, the search workers run it and edit the waiting message.
+        search_queue.submit(task)
+    except SearchRejected as e:
+        # Letting the user know right away the search wasn't admitted.
+        bot.edit_message_text(chat_id=msg.chat.id, message_id=wait_message.message_id, text=f"🚦 {e}")
+
+
+def start(msg: Message, bot: TeleBot) -> None:
+    """This function handles the '/start' command in private chat, 'job_<key>' deep links send a digest job's full post."""
+
+    # Getting the deep link payload, if any.
+    payload = util.extract_arguments(msg.text).strip()
+
+    # Replying with the help message if the chat wasn't opened from a digest button.
+    if not payload.startswith("job_"):
+        bot.reply_to(message=msg, text=random.choice(msgs.get("help")))
+        return
+
+    # Getting the full post of the job from the digest jobs store, or out of the jobs index once the store lost it
+    ## (eg. after a restart, or on another worker), the digest key is the job id in the index.
+    key = payload.removeprefix("job_")
+    if not (post := job_details_store.get(key)) and (job := GetJobCommand(job_id=key).execute()):
+        post = post_creator(data=[job], creator=TgJobPost)[0]
+        job_details_store.set(key, post)
+
+    if post:
+        send_job_posts(posts=[post], bot=bot, msg=msg)
+    else:
+        bot.reply_to(message=msg, text="This job is no longer available🙊, check the latest digest.")
+
+
+def ljobs_page(call: CallbackQuery, bot: TeleBot) -> None:
+    """This function handles the /ljobs result set Prev | Next buttons, by editing the message in place."""
+
+    # The page counter button does nothing.
+    if call.data == "ljobs:noop":
+        bot.answer_callback_query(call.id)
+        return
+
+    # Getting the result set id and the requested page from the callback data 'ljobs:<result_id>:<page>'.
+    _, result_id, page = call.data.split(":")
+    page = int(page)
+
+    # Getting the result set, it's only available in the chat it was requested in.
+    result = ljobs_results.get(result_id)
+    if result is None or result["chat_id"] != call.message.chat.id:
+        bot.answer_callback_query(
+            call.id, text="These results expired, please run /ljobs again.", show_alert=True
+        )
+        # Removing the dead navigation buttons.
+        bot.edit_message_reply_markup(
+            chat_id=call.message.chat.id, message_id=call.message.message_id
+        )
+        return
+
+    posts = result["posts"]
+    edit_ljobs_page(bot, call.message.chat.id, call.message.message_id, result_id, posts, page % len(posts))
+
+    # Stopping the button's loading animation.
+    bot.answer_callback_query(call.id)
+
+
+def ljobs_cancel(call: CallbackQuery, bot: TeleBot) -> None:
+    """This function handles the search cancel button, available to the requester, the chat admins and the owner."""
+
+    # Getting the task id from the callback data 'ljobs_cancel:<task_id>'.
+    task = search_queue.get(call.data.split(":")[1])
+
+    if task is None:
+        bot.answer_callback_query(call.id, text="This search already finished.")
+        return
+
+    # Checking if the user is the requester, the owner, or an admin of the chat.
+    allowed = (
+        call.from_user.id == task.user_id
+        or call.from_user.username == OWNER
+        or (
+            call.message.chat.type != "private"
+            and bot.get_chat_member(task.chat_id, call.from_user.id).status in ("administrator", "creator")
+        )
+    )
+    if not allowed:
+        bot.answer_callback_query(
+            call.id, text="Only the requester or an admin can cancel this search.", show_alert=True
+        )
+        return
+
+    if search_queue.cancel(task.task_id):
+        task.finalize()
+        bot.edit_message_text(
+            chat_id=task.chat_id,
+            message_id=task.message_id,
+            text="🚫 The search was cancelled.",
+        )
+
+    # Stopping the button's loading animation.
+    bot.answer_callback_query(call.id)
+
+
+def ljobs_inline(query: InlineQuery, bot: TeleBot) -> None:
+    """This function handles the inline queries '@bot python berlin', answering from the local jobs index only.
+
+    The results of a query are created once and paged with the query offset, a query the index can't answer
+    before the deadline gets an empty answer that telegram doesn't cache, it never triggers a scrape.
+    """
+    # Normalizing the query, so 'Python  Berlin' and 'python berlin' share their results.
+    text = " ".join(query.query.lower().split())
+
+    if (results := inline_results.get(text)) is None:
+        jobs = InlineSearchJobsCommand(
+            text=text,
+            posted_after=time.time() - int(FETCH_JOBS_INTERVAL),
+            limit=INLINE_MAX_RESULTS,
+            deadline=INLINE_DEADLINE,
+        ).execute()
+
+        # The index didn't answer in time, letting telegram ask again on the next keystroke.
+        if jobs is None:
+            bot.answer_inline_query(query.id, [], cache_time=0)
+            return
+
+        results = inline_articles(jobs)
+        inline_results.set(text, results)
+
+    # Getting the requested page, telegram sends back the last answer's next offset.
+    offset = int(query.offset) if query.offset.isdigit() else 0
+    next_offset = offset + INLINE_PAGE_SIZE
+
+    bot.answer_inline_query(
+        query.id,
+        results[offset:next_offset],
+        cache_time=INLINE_RESULTS_TTL,
+        next_offset=str(next_offset) if next_offset < len(results) else "",
+        # Pointing to the bot's private chat if the index has nothing to show.
+        switch_pm_text="No recent jobs found, open the bot" if not results else None,
+        switch_pm_parameter="inline" if not results else None,
+    )
+
+
+def subscribe(msg: Message, bot: TeleBot) -> None:
+    """This function handles the '/subscribe Job Title, Location[, Location...]' command, saving a search for the chat."""
+
+    # Getting and validating the search parameters.
+    search_params = util.extract_arguments(msg.text).strip()
+    if not param_validator(search_params):
+        bot.reply_to(
+            msg,
+            "Please follow this pattern: /subscribe Job Title, Location (more locations can follow, comma separated)",
+        )
+        return
+
+    # Saving a search per location, the same searches of all the chats share a single scrape.
+    job_title, *locations = search_params.split(",")
+    for location in filter(str.strip, locations):
+        try:
+            AddSubscriptionCommand(
+                chat_id=msg.chat.id,
+                job_title=job_title,
+                location=location,
+                max_per_chat=SUBSCRIPTIONS_MAX_PER_CHAT,
+                max_searches=SUBSCRIPTIONS_MAX_SEARCHES,
+            ).execute()
+        except SubscriptionLimitReached as e:
+            # Refusing the locations left, the ones before were saved.
+            bot.reply_to(msg, f"🚦 {e} See /subscriptions for the saved ones.")
+            return
+
+    bot.reply_to(msg, "Saved🔔, the new matching vacancies will be sent here. See /subscriptions to manage them.")
+
+
+def subscriptions(msg: Message, bot: TeleBot) -> None:
+    """This function handles the '/subscriptions' command, listing the chat's saved searches."""
+
+    if not (saved := GetSubscriptionsCommand(chat_id=msg.chat.id).execute()):
+        bot.reply_to(msg, "This chat has no saved searches, add one with /subscribe Job Title, Location")
+        return
+
+    lines = [f"{row[0]}. {row[2]} — {row[3]}" for row in saved]
+    bot.reply_to(msg, "Saved searches:\n\n" + "\n".join(lines) + "\n\nRemove one with /unsubscribe <number>")
+
+
+def unsubscribe(msg: Message, bot: TeleBot) -> None:
+    """This function handles the '/unsubscribe <number>' command, deleting one of the chat's saved searches."""
+
+    if not (subscription_id := util.extract_arguments(msg.text).strip()).isdigit():
+        bot.reply_to(msg, "Please follow this pattern: /unsubscribe <number>, see /subscriptions for the numbers.")
+        return
+
+    # A chat can only delete its own saved searches, the other ids match nothing.
+    if not DeleteSubscriptionCommand(chat_id=msg.chat.id, subscription_id=int(subscription_id)).execute():
+        bot.reply_to(msg, "No saved search with that number, see /subscriptions for the numbers.")
+        return
+    bot.reply_to(msg, "Removed🔕, see /subscriptions for the remaining ones.")
@@ -3,6 +3,12 @@
 # Importing random to randomly choose a reply from the helper messages dict.
 import random
 
+# Importing re to split the group ids arguments.
+import re
+
+# Importing datetime to show the scheduled jobs next runs.
+from datetime import datetime
+
 # Importing telegram bot API.
 from telebot import TeleBot, util
 
@@ -11,14 +17,24 @@ from telebot.types import Message
 
 # Importing database commands.
 from database import (
-    AddGroupToAllowListCommand,
-    DeleteGroupCommand,
+    AddGroupsToAllowListCommand,
+    DeleteGroupsCommand,
     GetGroupCommand,
+    GetPipelineRunsCommand,
 )
 
 # Importing helper messages.
 from tgbot.utilities import msgs
 
+# Importing the search results cache and the in-flight searches to report on them.
+from job_posts.job_post_factory import search_cache, search_flights
+
+# Importing the runs report to show the pipeline runs history.
+from job_posts.pipeline_runs import runs_report
+
+# Importing the scheduler cores to list and reschedule the scheduled jobs, of both runtimes.
+from tgbot.utilities.scheduler import async_scheduler_core, scheduler_core
+
 
 # ----- DEFINING INTERFACES ----- #
 
@@ -52,19 +68,24 @@ def admin_help(msg: Message, bot: TeleBot) -> None:
 # ----- GROUP ALLOW LIST CONTROL COMMANDS ----- #
 
 
+def group_ids(msg: Message) -> list[str]:
+    """Returns the group ids after the command, separated by spaces or commas."""
+    return [group_id for group_id in re.split(r"[\s,]+", util.extract_arguments(msg.text)) if group_id]
+
+
 def add_allow_group(msg: Message, bot: TeleBot) -> None:
     """This function handles the /addgroup command."""
 
-    # Getting the group id argument after the command.
-    group_id = util.extract_arguments(msg.text)
+    # Getting the group ids arguments after the command.
+    ids = group_ids(msg)
 
-    # Executing the add group command.
-    AddGroupToAllowListCommand(group_id=group_id).execute()
+    # Executing the add groups command, all the groups are added with a single commit.
+    AddGroupsToAllowListCommand(group_ids=ids).execute()
 
     # Replying to the owner command.
     bot.reply_to(
         message=msg,
-        text=f"Added *{group_id}* to the groups allowlist",
+        text=f"Added *{', '.join(ids)}* to the groups allowlist",
         parse_mode="markdown",
     )
 
@@ -72,16 +93,16 @@ def add_allow_group(msg: Message, bot: TeleBot) -> None:
 def rm_allow_group(msg: Message, bot: TeleBot) -> None:
     """This function handles the /rmgroup command."""
 
-    # Getting the group id argument after the command
-    group_id = util.extract_arguments(msg.text)
+    # Getting the group ids arguments after the command
+    ids = group_ids(msg)
 
-    # Executing the remove group command
-    DeleteGroupCommand(group_id=group_id).execute()
+    # Executing the remove groups command, all the groups are removed with a single commit.
+    DeleteGroupsCommand(group_ids=ids).execute()
 
     # Replying to the owner command
     bot.reply_to(
         message=msg,
-        text=f"Removed *{group_id}* from the groups allowlist",
+        text=f"Removed *{', '.join(ids)}* from the groups allowlist",
         parse_mode="markdown",
     )
 
@@ -106,3 +127,100 @@ def get_allow_group(msg: Message, bot: TeleBot) -> None:
 
     # Replying to the command with groups id.
     bot.reply_to(message=msg, text=msg_formatted, parse_mode="markdown")
+
+
+# ----- JOBS SEARCH REPORT COMMANDS ----- #
+
+
+def jobs_cache(msg: Message, bot: TeleBot) -> None:
+    """This function handles the /jobscache command."""
+
+    # Getting the search results cache counters.
+    stats = search_cache.stats()
+
+    # Formatting the report.
+    report = (
+        "*Jobs search cache*\n\n"
+        f"• *Hit rate:* {stats['hit_rate']:.0%}\n"
+        f"• *Fresh hits:* {stats['hits']}\n"
+        f"• *Stale hits:* {stats['stale_hits']}\n"
+        f"• *Misses:* {stats['misses']}\n"
+        f"• *Background refreshes:* {stats['refreshes']}\n"
+        f"• *Evictions:* {stats['evictions']}\n"
+        f"• *Cached searches:* {stats['size']}/{search_cache.max_size}\n"
+        f"• *Coalesced searches:* {search_flights.shared_calls}\n"
+        f"• *Scrapes in flight:* {search_flights.in_flight()}"
+    )
+
+    # Replying to the command with the report.
+    bot.reply_to(message=msg, text=report, parse_mode="markdown")
+
+
+def runs(msg: Message, bot: TeleBot) -> None:
+    """This function handles the /runs command, '/runs ljobs' only reports the runs of a trigger."""
+
+    # Getting the trigger argument after the command, if any.
+    trigger = util.extract_arguments(msg.text).strip().lower() or None
+
+    # Getting the latest runs, enough for the percentiles and the regressions.
+    report = runs_report(GetPipelineRunsCommand(trigger=trigger, limit=100).execute())
+
+    # Replying to the command with the report.
+    bot.reply_to(message=msg, text=report, parse_mode="markdown")
+
+
+# ----- SCHEDULED JOBS COMMANDS ----- #
+
+
+def scheduled_jobs() -> list:
+    """Returns the (next run, job) of the scheduled jobs, the threaded and async ones, the earliest first."""
+    return sorted(scheduler_core.jobs() + async_scheduler_core.jobs(), key=lambda entry: entry[0])
+
+
+def schedules_report() -> str:
+    """Returns the scheduled jobs with their schedule and next run."""
+    lines = ["*Scheduled jobs*", ""]
+    for due, job in scheduled_jobs():
+        every = f"every {job.minutes} minutes" if job.minutes else f"every {job.days_skipped} days at {job.hour}"
+        if job.lead:
+            every += f", {job.lead // 60:.0f} minutes ahead"
+        lines.append(f"• *{job.name}* {every}, next run {datetime.fromtimestamp(due):%m/%d %H:%M:%S}")
+    return "\n".join(lines) if len(lines) > 2 else "No scheduled jobs."
+
+
+def schedule(msg: Message, bot: TeleBot) -> None:
+    """This function handles the /schedule command.
+
+    '/schedule' lists the scheduled jobs, '/schedule channel 09:30' runs a job daily at an hour, '/schedule channel
+    90m' every 90 minutes, and '/schedule channel now' runs it right away. The changes last until the bot restarts.
+    """
+
+    # Getting the job name and its new schedule after the command, if any.
+    args = util.extract_arguments(msg.text).split()
+    if not args:
+        bot.reply_to(message=msg, text=schedules_report(), parse_mode="markdown")
+        return
+
+    job = scheduler_core.get(args[0]) or async_scheduler_core.get(args[0])
+    if job is None or len(args) != 2:
+        names = ", ".join(job.name for _, job in scheduled_jobs())
+        bot.reply_to(message=msg, text=f"Usage: /schedule <job> <HH:MM | minutes m | now>, the jobs are: {names}.")
+        return
+
+    when = args[1].lower()
+    if when == "now":
+        job.dispatch()
+        bot.reply_to(message=msg, text=f"The {job.name} job is starting.")
+        return
+
+    try:
+        due = job.reschedule(minutes=int(when[:-1])) if when.endswith("m") else job.reschedule(hour=when)
+    except ValueError as e:
+        bot.reply_to(message=msg, text=f"Invalid schedule '{when}': {e}")
+        return
+
+    bot.reply_to(
+        message=msg,
+        text=f"The {job.name} job now runs {when if when.endswith('m') else 'at ' + when}, next run at "
+        f"{datetime.fromtimestamp(due):%m/%d %H:%M:%S}. The .env schedule applies again after a restart.",
+    )
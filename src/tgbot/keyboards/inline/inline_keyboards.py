@@ -63,3 +63,107 @@ def jobs_post_inline_kb(job_link: str) -> InlineKeyboardMarkup:
 
     # Returning the inline keyboard markup.
     return inline_kb
+
+
+def jobs_digest_inline_kb(bot_username: str, job_keys: list[str]) -> InlineKeyboardMarkup:
+    """_summary_ : This function creates the inline keyboard markup for a jobs digest, one button per job.
+
+    Parameters
+    ----------
+    bot_username : str
+        _description_ : The bot's username, the buttons open the bot's private chat.
+    job_keys : list[str]
+        _description_ : The keys of the jobs in the digest, in the same order as the digest entries.
+
+    Returns
+    -------
+    InlineKeyboardMarkup
+        _description_ : The inline keyboard markup for the digest.
+    """
+
+    # Creating the inline keyboard markup instance, for the jobs details.
+    inline_kb = InlineKeyboardMarkup()
+
+    # Setting the keyboard row width to 5; so the buttons will be displayed in two rows at most.
+    inline_kb.row_width = 5
+
+    # Each button deep links to the bot's private chat, where '/start job_<key>' sends the full description.
+    inline_kb.add(
+        *[
+            InlineKeyboardButton(
+                f"📄 {number}", url=f"https://t.me/{bot_username}?start=job_{key}"
+            )
+            for number, key in enumerate(job_keys, start=1)
+        ]
+    )
+
+    # Returning the inline keyboard markup.
+    return inline_kb
+
+
+def jobs_pager_inline_kb(
+    result_id: str, page: int, pages: int, job_link: str, full_post_url: str = None
+) -> InlineKeyboardMarkup:
+    """_summary_ : This function creates the inline keyboard markup to navigate a stored /ljobs result set.
+
+    Parameters
+    ----------
+    result_id : str
+        _description_ : The id of the stored result set.
+    page : int
+        _description_ : The index of the shown job in the result set.
+    pages : int
+        _description_ : The number of jobs in the result set.
+    job_link : str
+        _description_ : The shown job's link URL.
+    full_post_url : str, optional
+        _description_, by default None : The deep link sending the shown job's full post, if its page is cut.
+
+    Returns
+    -------
+    InlineKeyboardMarkup
+        _description_ : The inline keyboard markup for the result set page.
+    """
+
+    # Creating the inline keyboard markup instance, for the navigation buttons.
+    inline_kb = InlineKeyboardMarkup()
+
+    # Adding the navigation row, the buttons wrap around the result set ends.
+    inline_kb.row(
+        InlineKeyboardButton("◀️ Prev", callback_data=f"ljobs:{result_id}:{(page - 1) % pages}"),
+        InlineKeyboardButton(f"{page + 1}/{pages}", callback_data="ljobs:noop"),
+        InlineKeyboardButton("Next ▶️", callback_data=f"ljobs:{result_id}:{(page + 1) % pages}"),
+    )
+
+    # Adding the full post button, the page only shows the beginning of a long description.
+    if full_post_url:
+        inline_kb.row(InlineKeyboardButton("📄 Full post", url=full_post_url))
+
+    # Adding the apply link for the shown job.
+    inline_kb.row(InlineKeyboardButton("👉 Click Here To Apply 👈", url=job_link))
+
+    # Returning the inline keyboard markup.
+    return inline_kb
+
+
+def search_cancel_inline_kb(task_id: str) -> InlineKeyboardMarkup:
+    """_summary_ : This function creates the inline keyboard markup to cancel a queued or running search.
+
+    Parameters
+    ----------
+    task_id : str
+        _description_ : The id of the search task.
+
+    Returns
+    -------
+    InlineKeyboardMarkup
+        _description_ : The inline keyboard markup with the cancel button.
+    """
+
+    # Creating the inline keyboard markup instance, for the cancel button.
+    inline_kb = InlineKeyboardMarkup()
+
+    inline_kb.add(InlineKeyboardButton("✖️ Cancel", callback_data=f"ljobs_cancel:{task_id}"))
+
+    # Returning the inline keyboard markup.
+    return inline_kb
@@ -9,7 +9,7 @@ from telebot.custom_filters import SimpleCustomFilter
 # Importing Message object to get user username from it
 from telebot.types import Message
 
-from database import GetUserCommand
+from database import IsBlockedUserCommand
 
 # ----- GLOBAL VARIABLES ----- #
 
@@ -37,12 +37,5 @@ class NotSpammer(SimpleCustomFilter):
 
     @staticmethod
     def check(msg: Message):
-        # Getting the user id from the message.
-        user_id = str(msg.from_user.id)
-        # Getting the user in the database.
-        users = GetUserCommand().execute()
-        # Extracting the users's id from the database.
-        users_list = [user[0] for user in users]
-
-        # Returning if the user is in the blocked users_list or not.
-        return user_id not in users_list
+        # Returning if the user is in the blocked users snapshot or not.
+        return not IsBlockedUserCommand(user_id=msg.from_user.id).execute()
@@ -5,15 +5,40 @@ from dataclasses import dataclass, field
 from decouple import config
 
 # Importing telebot objects for middleware and type hinting.
-from telebot import TeleBot
+from telebot import TeleBot, util
 from telebot.handler_backends import BaseMiddleware, CancelUpdate
 from telebot.types import Message
 
 # Importing database commands.
-from database.db_commands import AddUserCommand, GetUserCommand
+from database.db_commands import AddUserCommand, IsBlockedUserCommand
+
+# Importing the token bucket limiter to limit the commands per user and chat.
+from tgbot.utilities.rate_limiter import TokenBucketLimiter
 
 OWNER = config("OWNER")
 
+# Getting the commands limits as 'burst/seconds', eg. '5/60' lets a user send 5 commands at once, then 1 every 12 seconds.
+## 'search' for the commands that scrape, 'command' for every other command.
+RATE_LIMITS = {
+    "search": config("RATE_LIMIT_SEARCH", default="3/300"),
+    "command": config("RATE_LIMIT_COMMAND", default="5/60"),
+}
+
+# The commands class, the commands not listed here are in the 'command' class.
+COMMAND_CLASSES = {
+    "ljobs": "search",
+    "subscribe": "search",
+}
+
+
+def limiters_factory() -> dict[str, TokenBucketLimiter]:
+    """Creates a token bucket limiter per commands class, out of the RATE_LIMITS settings."""
+    limiters = {}
+    for command_class, limit in RATE_LIMITS.items():
+        capacity, period = limit.split("/")
+        limiters[command_class] = TokenBucketLimiter(capacity=int(capacity), period=float(period))
+    return limiters
+
 
 @dataclass(slots=True)
 class SpamMiddleware(BaseMiddleware):
@@ -21,30 +46,10 @@ class SpamMiddleware(BaseMiddleware):
 
     # Bot instance.
     bot: TeleBot
-    # The time limit between messages.
-    limit: int
     # Chat update types to look for.
     update_types = ["message"]
-    # Dict["user_id": "last date msg was sent"].
-    last_time: dict[str, str] = field(default_factory=dict)
-    # List of users in the block list database.
-    _blocked_users: list = field(default_factory=list)
-
-    @property
-    def get_blocked_users(self) -> list:
-        """_summary_: This property updates and returns back a list of strings of the blocked users.
-
-        Returns
-        -------
-        _type_ : list
-            _description_ : A list of strings of the blocked users.
-        """
-        # Querying the database for users.
-        users = GetUserCommand().execute()
-        # Extracting the users id's from the query result and returning it.
-        self._blocked_users = [user[0] for user in users]
-        # Returning back an updated list of the users in the database.
-        return self._blocked_users
+    # Dict["commands class": its limiter], the buckets are per (user, chat).
+    limiters: dict[str, TokenBucketLimiter] = field(default_factory=limiters_factory)
 
     @staticmethod
     def not_owner(msg: Message) -> bool:
@@ -58,27 +63,23 @@ class SpamMiddleware(BaseMiddleware):
         # True if not Owner, False if Owner.
         return msg.from_user.username != OWNER
 
-    def set_last_time(self, msg: Message) -> None:
-        """_summary_ : This method sets user's message date to his id in last_time dict => dict['user_id': 'date of last message sent'].
+    def is_spamming(self, msg: Message, command: str) -> bool:
+        """_summary_ : Takes a token from the user's bucket in this chat for the command's class.
 
         Parameters
         ----------
         msg : Message
             _description_ : TeleBot Message Object.
-        """
-        # Setting the last message date for the user.
-        self.last_time[msg.from_user.id] = msg.date
-
-    def is_spamming(self, msg: Message) -> bool:
-        """_summary_ : Checks if the time between the last two sent messages by the user exceeds the limit.
+        command : str
+            _description_ : The command sent, without the '/' and the bot's username.
 
         Returns
         -------
         _type_ : bool
-            _description_ : Returns True if user is spamming above the limit, False if user is not spamming.
+            _description_ : Returns True if user is over the limit of the command's class, False if not.
         """
-        # True if more than the limit, False if less than the limit.
-        return (msg.date - self.last_time[msg.from_user.id]) < self.limit
+        limiter = self.limiters[COMMAND_CLASSES.get(command, "command")]
+        return not limiter.allow((msg.from_user.id, msg.chat.id))
 
     def pre_process(self, msg: Message, data):
         """_summary_ : This method handles update requests in chat.
@@ -88,38 +89,29 @@ class SpamMiddleware(BaseMiddleware):
         msg : Message
             _description_ : TeleBot Message Object.
         """
-        # If the user is in the blocked users list from the database handler will skip.
-        if str(msg.from_user.id) in self.get_blocked_users:
+        # If the user is in the blocked users snapshot the handler will skip.
+        if IsBlockedUserCommand(user_id=msg.from_user.id).execute():
 
             # Cancelling handler
             return CancelUpdate()
 
-        # If the user message starts with '/' AKA. command eg. /tip | /help.
-        if msg.text[0] == "/":
+        # Only limiting the commands eg. /tip | /help, the other messages (and the non-text ones) pass.
+        if not util.is_command(msg.text or ""):
+            return
 
-            # If the user id is not in the last time dict; then add them.
-            if msg.from_user.id not in self.last_time:
-                # User is not in a dict, so lets add and cancel this condition.
-                self.set_last_time(msg)
-                # Exiting the conditional statement
-                return
+        # If the user is over the limit of the command's class, user gets a warning and gets blocked.
+        if self.not_owner(msg) and self.is_spamming(msg, util.extract_command(msg.text).lower()):
 
-            # If the time between commands user's sent is more than the limit, user gets a warning and gets blocked.
-            if self.is_spamming(msg) and self.not_owner(msg):
+            # User is flooding, so sending a warning.
+            self.bot.reply_to(
+                msg, "You have been blocked for an hour, for spamming too often."
+            )
 
-                # User is flooding, so sending a warning.
-                self.bot.reply_to(
-                    msg, "You have been blocked for an hour, for spamming too often."
-                )
+            # Adding the user to the database with a 'temp' block type.
+            AddUserCommand(user_id=msg.from_user.id, block_type="temp").execute()
 
-                # Adding the user to the database with a 'temp' block type.
-                AddUserCommand(user_id=msg.from_user.id, block_type="temp").execute()
-
-                # Canceling the update
-                return CancelUpdate()
-
-        # Adding the last time message data to the last_time dict.
-        self.set_last_time(msg)
+            # Canceling the update
+            return CancelUpdate()
 
     def post_process(self, msg: Message, data, exception):
         pass
@@ -13,10 +13,16 @@ msgs = {
         "• /check - _Verify bot activity_.\n"
         "• /ljobs - _Default job search_.\n"
         "• /ljobs \[Job Title, Location] - _Search LinkedIn for a job title in specified location_.\n"
+        "• /subscribe \[Job Title, Location] - _Sends this chat the new matching jobs on a schedule_.\n"
+        "• /subscriptions - _Lists this chat's saved searches_.\n"
+        "• /unsubscribe \[Number] - _Removes one of this chat's saved searches_.\n"
         "• /echo \[Message] - _Bot repeats your message._\n"
-        "• /addgroup \[Group Id] - _Adds group to allow list_.\n"
-        "• /rmgroup \[Group Id] - _Removes group from allow list_.\n"
+        "• /addgroup \[Group Ids] - _Adds groups to allow list_.\n"
+        "• /rmgroup \[Group Ids] - _Removes groups from allow list_.\n"
         "• /getgroup - _Returns a list of all allowed Group Ids in the allow list_.\n"
-        "• /getgroup \[Group Id] - _Returns a Group Id if it exists in the allow list_."
+        "• /getgroup \[Group Id] - _Returns a Group Id if it exists in the allow list_.\n"
+        "• /jobscache - _Returns the jobs search cache hit rate and counters_.\n"
+        "• /runs \[channel | prepare | trickle | subscriptions | ljobs] - _Returns the latest pipeline runs, their percentiles and regressions_.\n"
+        "• /schedule \[Job] \[HH:MM | Minutes m | now] - _Lists the scheduled jobs, or reschedules one until a restart_."
     ),
 }
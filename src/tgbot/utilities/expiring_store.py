@@ -0,0 +1,82 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing time to stamp and expire the stored entries.
+import time
+
+# Importing Lock to share the store between the bot worker threads.
+from threading import Lock
+
+# Importing Any & Hashable for type hinting.
+from typing import Any, Hashable
+
+
+class ExpiringStore:
+    """This class keeps values in memory for a limited time (TTL) and a limited number of entries."""
+
+    def __init__(self, ttl: int, max_size: int = 1000) -> None:
+        """_summary_ : This method initiates the store.
+
+        Parameters
+        ----------
+        ttl : int
+            _description_ : The number of seconds an entry stays available after being stored.
+        max_size : int, optional
+            _description_, by default 1000 : The maximum number of entries, the oldest entries are dropped first.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        # Dict[key: (expiry timestamp, value)], dicts keep insertion order so the first key is the oldest.
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = Lock()
+
+    def _purge(self, now: float) -> None:
+        """Drops the expired entries and the oldest ones above max_size, must be called with the lock held."""
+        # Entries are stored in insertion order, and all share the same TTL, so expired ones are at the front.
+        for key in list(self._entries):
+            if self._entries[key][0] > now and len(self._entries) <= self.max_size:
+                break
+            del self._entries[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """_summary_ : This method stores a value under the given key, replacing any previous value.
+
+        Parameters
+        ----------
+        key : Hashable
+            _description_ : The key to store the value under.
+        value : Any
+            _description_ : The value to store.
+        """
+        now = time.monotonic()
+        with self._lock:
+            # Popping first so a replaced key moves to the end of the insertion order.
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl, value)
+            self._purge(now)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """_summary_ : This method returns the value stored under the given key if it didn't expire yet.
+
+        Parameters
+        ----------
+        key : Hashable
+            _description_ : The key to look up.
+        default : Any, optional
+            _description_, by default None : The value to return if the key is missing or expired.
+
+        Returns
+        -------
+        Any
+            _description_ : The stored value or the default.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                return default
+            return entry[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge(time.monotonic())
+            return len(self._entries)
@@ -0,0 +1,148 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing os to exit right away on a second signal.
+import os
+
+# Importing signal to stop the bot on SIGTERM and SIGINT.
+import signal
+
+# Importing threading and time to run the shutdown on its own thread, within its deadline.
+import threading
+import time
+
+# Importing datetime to log the shutdown steps.
+from datetime import datetime
+
+# Importing Callable for type hinting.
+from typing import Callable
+
+
+# The shutdown phases in order, each one's hooks run once the previous phase is over.
+## 'intake' stops receiving updates and starting jobs, 'drain' waits for the running work until the deadline,
+## 'abort' cancels the work still running so it checkpoints, and 'close' releases the resources (eg. the database).
+PHASES = ("intake", "drain", "abort", "close")
+
+
+class Lifecycle:
+    """_summary_ : This class coordinates the bot's graceful shutdown, on SIGTERM/SIGINT or on request.
+
+    The modules register their shutdown hooks with on_shutdown(), and the hooks run phase by phase on a shutdown
+    thread. The 'drain' hooks get the shutdown deadline, 'timeout' seconds after the signal, then 'expired' is set:
+    the senders checkpoint the posts they didn't send instead of sending them, and the 'abort' hooks get 'grace'
+    more seconds for the cancelled work to stop. A second signal exits right away.
+
+    Example
+    -------
+        >>> lifecycle.on_shutdown("drain", "search queue", search_queue.drain)
+        >>> lifecycle.install_signal_handlers(timeout=60, grace=10)
+    """
+
+    def __init__(self) -> None:
+        # Set once the shutdown started, no new work is accepted.
+        self.stopping = threading.Event()
+        # Set once the drain deadline passed, the running work checkpoints instead of finishing.
+        self.expired = threading.Event()
+        self.timeout = 60.0
+        self.grace = 10.0
+        # Dict[phase: list of (hook name, hook)].
+        self._hooks: dict[str, list[tuple[str, Callable[[float], bool]]]] = {phase: [] for phase in PHASES}
+        self._done = threading.Event()
+        self._clean = True
+
+    def on_shutdown(self, phase: str, name: str, hook: Callable[[float], bool]) -> None:
+        """_summary_ : This method registers a shutdown hook, the hooks of a phase run in their registration order.
+
+        Parameters
+        ----------
+        phase : str
+            _description_ : One of PHASES.
+        name : str
+            _description_ : The hook name, logged if it fails.
+        hook : Callable[[float], bool]
+            _description_ : Called with the phase deadline (a time.monotonic() time), it must return by then, False if
+                its work didn't stop in time.
+
+        Raises
+        ------
+        ValueError
+            _description_ : If the phase isn't one of PHASES.
+        """
+        if phase not in PHASES:
+            raise ValueError(f"phase must be one of {PHASES}, got '{phase}'")
+        self._hooks[phase].append((name, hook))
+
+    def install_signal_handlers(self, timeout: float = 60, grace: float = 10) -> None:
+        """_summary_ : This method shuts the bot down on SIGTERM and SIGINT, it must be called from the main thread.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            _description_, by default 60 : The number of seconds the running work has to finish.
+        grace : float, optional
+            _description_, by default 10 : The number of seconds the work cancelled past the timeout has to checkpoint.
+        """
+        self.timeout = timeout
+        self.grace = grace
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._handle_signal)
+
+    def _handle_signal(self, signum: int, frame) -> None:
+        if self.stopping.is_set():
+            print(datetime.now(), "Received a second stop signal, exiting right away.")
+            os._exit(1)
+        print(datetime.now(), f"Received {signal.Signals(signum).name}, shutting down.")
+        self.request_shutdown()
+
+    def request_shutdown(self) -> None:
+        """This method starts the shutdown on its own thread, once, the caller isn't blocked."""
+        if self.stopping.is_set():
+            return
+        self.stopping.set()
+        threading.Thread(target=self._shutdown, name="shutdown").start()
+
+    def _run_phase(self, phase: str, deadline: float) -> None:
+        """Runs a phase's hooks, a failing hook doesn't stop the shutdown."""
+        for name, hook in self._hooks[phase]:
+            try:
+                if hook(deadline) is not False:
+                    continue
+                # The work left by the drain is aborted next, only the work that doesn't stop then is a problem.
+                if phase == "drain":
+                    print(datetime.now(), f"The {name} work didn't finish by the shutdown deadline, it's aborted.")
+                else:
+                    print(datetime.now(), f"The {name} work didn't stop within the shutdown, it's still running.")
+                    self._clean = False
+            except Exception as e:
+                self._clean = False
+                print(datetime.now(), f"The shutdown hook {name} failed: {e}")
+
+    def _shutdown(self) -> None:
+        """Runs the shutdown phases in order."""
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        self._run_phase("intake", deadline)
+        self._run_phase("drain", deadline)
+
+        # Past the deadline, the senders checkpoint and the jobs still running are cancelled.
+        self.expired.set()
+        self._run_phase("abort", time.monotonic() + self.grace)
+
+        self._run_phase("close", time.monotonic() + self.grace)
+        print(datetime.now(), f"Shut down in {time.monotonic() - started:.1f}s.")
+        self._done.set()
+
+    def wait(self) -> bool:
+        """_summary_ : This method blocks until the shutdown is over.
+
+        Returns
+        -------
+        bool
+            _description_ : True if all the work stopped in time, False if some threads may still be running.
+        """
+        self._done.wait()
+        return self._clean
+
+
+# The bot's lifecycle, shared by the modules registering shutdown hooks.
+lifecycle = Lifecycle()
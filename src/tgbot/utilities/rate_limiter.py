@@ -0,0 +1,89 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing time to refill the buckets.
+import time
+
+# Importing Lock to share the limiter between the bot worker threads.
+from threading import Lock
+
+# Importing Hashable for type hinting.
+from typing import Hashable
+
+
+class TokenBucketLimiter:
+    """_summary_ : This class limits how often each key (eg. a user in a chat) can act, with a token bucket per key.
+
+    A bucket holds up to 'capacity' tokens and refills at 'capacity' tokens per 'period' seconds, each action takes
+    a token, so a key can burst 'capacity' actions then keeps going at the refill rate.
+
+    A bucket idle for a whole period is full again, which is the same as having no bucket, so idle buckets are
+    evicted and the memory stays bounded by the keys active within the last period (and by 'max_size').
+
+    Example
+    -------
+        >>> limiter = TokenBucketLimiter(capacity=2, period=300)
+        >>> limiter.allow((user_id, chat_id))
+        True
+    """
+
+    def __init__(self, capacity: int, period: float, max_size: int = 10000) -> None:
+        """_summary_ : This method initiates the limiter.
+
+        Parameters
+        ----------
+        capacity : int
+            _description_ : The number of actions a key can burst.
+        period : float
+            _description_ : The number of seconds a bucket takes to refill completely.
+        max_size : int, optional
+            _description_, by default 10000 : The maximum number of buckets, the least recently used are evicted first.
+        """
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.max_size = max_size
+        # Dict[key: (tokens, last update timestamp)], dicts keep insertion order so the first key is the least recently used.
+        self._buckets: dict[Hashable, tuple[float, float]] = {}
+        self._lock = Lock()
+
+    def _evict(self, now: float) -> None:
+        """Drops the buckets idle for a whole period, and the least recently used above max_size, must be called with the lock held."""
+        for key in list(self._buckets):
+            if now - self._buckets[key][1] < self.period and len(self._buckets) <= self.max_size:
+                break
+            del self._buckets[key]
+
+    def allow(self, key: Hashable, cost: float = 1) -> bool:
+        """_summary_ : This method takes tokens from the key's bucket if it has enough.
+
+        Parameters
+        ----------
+        key : Hashable
+            _description_ : The limited key.
+        cost : float, optional
+            _description_, by default 1 : The number of tokens the action takes.
+
+        Returns
+        -------
+        bool
+            _description_ : True if the action is allowed, False if the key is over its limit.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            # Refilling the tokens for the time passed since the last action.
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+
+            # Re-inserting the bucket at the end, as the most recently used.
+            self._buckets[key] = (tokens, now)
+            self._evict(now)
+            return allowed
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict(time.monotonic())
+            return len(self._buckets)
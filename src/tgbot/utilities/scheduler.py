@@ -1,24 +1,282 @@
 # ----- IMPORTING REQUIRED MODULES ----- #
 
+# Importing asyncio to run the async scheduled jobs on an event loop.
+import asyncio
+
 # Importing time and threading to run the scheduled tasks on a different thread.
 import threading
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Importing ThreadPoolExecutor to run the scheduled jobs on a worker pool.
+from concurrent.futures import ThreadPoolExecutor
+
+# Importing heapq and itertools to keep the scheduled jobs ordered by their next due time.
+import heapq
+import itertools
 
 # Importing Callable to type hinting.
 from typing import Callable
 
-# Importing the schedule package.
-import schedule
+# Importing ContextVar to track the current scheduled run, of each worker thread and each async job task.
+from contextvars import ContextVar
+
+# Importing decouple to get the worker pool size from the .env file.
+from decouple import config
+
+# Importing the scheduler commands to persist the scheduled jobs last runs.
+from database import RecordScheduledRunCommand, RegisterScheduledJobCommand
+
+
+# Getting the number of scheduled jobs running at the same time.
+SCHEDULER_WORKERS = config("SCHEDULER_WORKERS", default=4, cast=int)
+
+# The missed runs catch up policies, 'skip' ignores them, 'once' runs the job once right away for all of them.
+CATCH_UP_POLICIES = ("skip", "once")
+
+# The current scheduled run of each worker thread and each async job task.
+_current_run: ContextVar["ScheduledRun"] = ContextVar("scheduled_run", default=None)
+
+
+class ScheduledRun:
+    """_summary_ : This class holds a running instance of a scheduled job, and lets the job be cancelled on timeout.
+
+    Threads can't be killed, so a timed out job is asked to stop: the callbacks it registered with on_cancel()
+    are called, eg. to cancel the scrape it waits for.
+    """
+
+    def __init__(self, name: str, due_at: float = None) -> None:
+        self.name = name
+        # The time the run was due at, None for the runs started on demand, and the time it actually started at.
+        self.due_at = due_at
+        self.started_at = time.time()
+        self.timed_out = False
+        # Set when the shutdown cancelled the run, a run aborted before finishing is caught up on the next start.
+        self.aborted = False
+        # Set when the aborted run checkpointed its work instead (eg. the posts it didn't send), it's not caught up.
+        self.checkpointed = False
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: list[Callable[[], None]] = []
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Registers a callback stopping the job, called right away if the run was already cancelled."""
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def cancel(self) -> None:
+        """Cancels the run, calling the registered callbacks once."""
+        with self._lock:
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(datetime.now(), f"Cancelling the scheduled job {self.name} failed: {e}")
+
+
+def current_scheduled_run() -> ScheduledRun:
+    """Returns the scheduled run of the current thread or task, None if it isn't running a scheduled job."""
+    return _current_run.get()
+
+
+class SchedulerCore:
+    """_summary_ : This class keeps the scheduled jobs in a heap ordered by their next due time, and runs them on time.
+
+    Its thread sleeps exactly until the earliest due job, and is woken through a condition variable when a job is
+    added, removed or rescheduled, so the jobs start on the second with no polling. A due job is handed to its
+    Scheduler's dispatch() and pushed back with its following due time.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        # Heap[(due unix time, entry sequence, scheduler)], the entries not matching _entries are stale and skipped.
+        self._heap: list[tuple[float, int, "Scheduler"]] = []
+        # Dict[name: (entry sequence, scheduler)] of the scheduled jobs.
+        self._entries: dict[str, tuple[int, "Scheduler"]] = {}
+        self._sequence = itertools.count()
+        self._started = False
+        # Set by stop(), the due jobs aren't dispatched anymore.
+        self.stopped = False
+
+    def _push(self, scheduler: "Scheduler", due: float) -> None:
+        """Pushes a job's next run, replacing its previous one, must be called with the lock held."""
+        sequence = next(self._sequence)
+        self._entries[scheduler.key] = (sequence, scheduler)
+        heapq.heappush(self._heap, (due, sequence, scheduler))
+
+    def add(self, scheduler: "Scheduler") -> None:
+        """_summary_ : This method schedules a job, or reschedules it if it's already scheduled.
+
+        Parameters
+        ----------
+        scheduler : Scheduler
+            _description_ : The job, its next run is computed from its current schedule.
+        """
+        with self._cond:
+            self._push(scheduler, scheduler.next_due(time.time()))
+            if not self._started:
+                self._start()
+                self._started = True
+            self._wake()
+
+    def remove(self, scheduler: "Scheduler") -> None:
+        """Unschedules a job, its heap entry is dropped when it reaches the top."""
+        with self._cond:
+            self._entries.pop(scheduler.key, None)
+            self._wake()
+
+    def get(self, name: str) -> "Scheduler":
+        """Returns the scheduled job with the given name, None if there's none."""
+        with self._cond:
+            entry = self._entries.get(name)
+            return entry[1] if entry else None
+
+    def jobs(self) -> list[tuple[float, "Scheduler"]]:
+        """Returns the scheduled jobs with their next due time, the earliest first."""
+        with self._cond:
+            valid = {sequence for sequence, _ in self._entries.values()}
+            entries = [(due, scheduler) for due, sequence, scheduler in self._heap if sequence in valid]
+            return sorted(entries, key=lambda entry: entry[0])
+
+    def stop(self) -> None:
+        """This method stops dispatching the due jobs, the running ones aren't affected."""
+        with self._cond:
+            self.stopped = True
+            self._wake()
+
+    def _start(self) -> None:
+        """Starts the core's thread, must be called with the lock held."""
+        threading.Thread(target=self._loop, name="scheduler-core", daemon=True).start()
+
+    def _wake(self) -> None:
+        """Wakes up the core to check the earliest due job again, must be called with the lock held."""
+        self._cond.notify_all()
+
+    def _due_job(self) -> tuple[float, "Scheduler", float]:
+        """_summary_ : This method pops the earliest job if it's due, and pushes its following run, must be called with the lock held.
+
+        Returns
+        -------
+        tuple[float, Scheduler, float]
+            _description_ : The (due time, job, None) if a job is due, else (None, None, the seconds until the
+                earliest job is due, None if there's no job).
+        """
+        # Dropping the stale entries of the removed and rescheduled jobs.
+        while self._heap and self._entries.get(self._heap[0][2].key, (None,))[0] != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None, None, None
+        if (timeout := self._heap[0][0] - time.time()) > 0:
+            return None, None, timeout
+
+        due, _, scheduler = heapq.heappop(self._heap)
+        self._push(scheduler, scheduler.following_due(due, time.time()))
+        return due, scheduler, None
+
+    def _loop(self) -> None:
+        """Sleeps until the earliest due job, hands it to its scheduler, and pushes its following run."""
+        while True:
+            with self._cond:
+                while True:
+                    if self.stopped:
+                        return
+                    due, scheduler, timeout = self._due_job()
+                    if scheduler:
+                        break
+                    self._cond.wait(timeout)
+
+            scheduler.dispatch(due_at=due)
+
+
+class AsyncSchedulerCore(SchedulerCore):
+    """_summary_ : This class runs the async scheduled jobs like SchedulerCore, on an asyncio event loop instead of a thread.
+
+    The jobs can still be added, removed and rescheduled from any thread (eg. an owner command), the loop is woken
+    up thread-safely.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.loop: asyncio.AbstractEventLoop = None
+        self._event: asyncio.Event = None
+        # The tasks of the running jobs, the core waits for them once stopped.
+        self.tasks: set[asyncio.Task] = set()
+
+    def start(self) -> asyncio.Task:
+        """This method starts the core on the running event loop, it must be called before adding the jobs."""
+        self.loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        return self.loop.create_task(self._run())
+
+    def _start(self) -> None:
+        """The core runs on the event loop, started by start()."""
+
+    def _wake(self) -> None:
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._event.set)
+
+    async def _run(self) -> None:
+        """Sleeps until the earliest due job, hands it to its scheduler, and pushes its following run, until stopped."""
+        while not self.stopped:
+            # Clearing before checking, so a job added meanwhile wakes the wait right away.
+            self._event.clear()
+            with self._cond:
+                due, scheduler, timeout = self._due_job()
+            if scheduler:
+                scheduler.dispatch(due_at=due)
+                continue
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        # Letting the running jobs finish, the event loop would cancel them right away once the core returns.
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+# The scheduler core running every scheduled job.
+scheduler_core = SchedulerCore()
+
+# The scheduler core running every async scheduled job, in the asyncio runtime.
+async_scheduler_core = AsyncSchedulerCore()
 
 
 class Scheduler:
-    """This class creates schedules for updating channel content and cleaning the spammers list."""
+    """This class creates schedules for updating channel content and cleaning the spammers list.
 
-    _runner_started = False
+    The scheduler core only dispatches the due jobs to a worker pool, so a job running for minutes doesn't delay the
+    others. Each job runs at most 'max_instances' times at once (a trigger finding it running is skipped), a run
+    longer than 'timeout' seconds is cancelled, and a named job's last run is stored so a restart catches up the
+    runs it missed according to the 'catch_up' policy.
+    """
+
+    # The worker pool shared by all the scheduled jobs.
+    _executor = ThreadPoolExecutor(max_workers=SCHEDULER_WORKERS, thread_name_prefix="scheduler")
+
+    # The scheduler core running the job.
+    _core: SchedulerCore = scheduler_core
+
+    # The runs in progress of all the scheduled jobs, drained and aborted by the shutdown.
+    _active: set[ScheduledRun] = set()
+    _active_cond = threading.Condition()
 
     def __init__(
-        self, hour: str = None, days_skipped: int = None, minutes: int = None
+        self,
+        hour: str = None,
+        days_skipped: int = None,
+        minutes: int = None,
+        name: str = None,
+        max_instances: int = 1,
+        timeout: float = None,
+        catch_up: str = "once",
+        catch_up_grace: float = None,
+        lead: float = 0,
     ) -> None:
         """_summary_ : This function initiates the scheduler object.
 
@@ -30,10 +288,41 @@ class Scheduler:
             _description_, by default None : Number of days to skip before executing the job 'function'.
         minutes : int, optional
             _description_, by default None : Run the job every ?? minutes.
+        name : str, optional
+            _description_, by default None : The job name its last run is stored under, no catch up if not provided.
+        max_instances : int, optional
+            _description_, by default 1 : The number of runs of the job at the same time.
+        timeout : float, optional
+            _description_, by default None : The number of seconds after which a run is cancelled, no limit if not provided.
+        catch_up : str, optional
+            _description_, by default 'once' : What to do with the runs missed while the bot was down, one of CATCH_UP_POLICIES.
+        catch_up_grace : float, optional
+            _description_, by default None : The number of seconds a missed run can be late and still be caught up, no limit if not provided.
+        lead : float, optional
+            _description_, by default 0 : Run the job this number of seconds before each time of its schedule.
         """
-        self.days_skipped = days_skipped
-        self.minutes = minutes
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"catch_up must be one of {CATCH_UP_POLICIES}, got '{catch_up}'")
+
+        # The .env values are strings.
+        self.days_skipped = int(days_skipped) if days_skipped else None
+        self.minutes = int(minutes) if minutes else None
         self.hour = hour
+        self.name = name
+        self.max_instances = max_instances
+        self.timeout = timeout
+        self.catch_up = catch_up
+        self.catch_up_grace = catch_up_grace
+        self.lead = lead
+
+        self.func: Callable = None
+        self._running = 0
+        self._lock = threading.Lock()
+
+    @property
+    def key(self) -> str:
+        """The name the job is scheduled under in the scheduler core."""
+        return self.name or str(id(self))
 
     def set_schedule(self, func: Callable) -> None:
         """_summary_ : This Method set the callable function to execute on schedule.
@@ -42,38 +331,339 @@ class Scheduler:
         ----------
         func : Callable
             _description_ : The function 'job' to execute.
-        mints : bool, optional
-            _description_, by default False : optional argument for executing every x minutes 'for spam list cleaning'.
         """
+        self.func = func
+
+    def at_time(self, day: datetime) -> datetime:
+        """Returns the day at the job's hour ('HH:MM' or 'HH:MM:SS'), in local time."""
+        hour = datetime.strptime(self.hour, "%H:%M:%S" if self.hour.count(":") == 2 else "%H:%M").time()
+        return datetime.combine(day.date(), hour)
+
+    def next_due(self, now: float) -> float:
+        """_summary_ : This Method returns the job's first due time after now.
+
+        Parameters
+        ----------
+        now : float
+            _description_ : The current unix time.
+
+        Returns
+        -------
+        float
+            _description_ : An interval after now for the interval jobs, the next time at the hour for the daily jobs.
         """
-        Change before deployment to desired schedule time frame
-        For more info check doc: https://schedule.readthedocs.io/en/stable/examples.html
+        if self.minutes:
+            return now + self.minutes * 60 - self.lead
+        # Finding the next hour the run is ahead of by its lead.
+        due = self.at_time(datetime.fromtimestamp(now + self.lead))
+        if due.timestamp() <= now + self.lead:
+            due += timedelta(days=1)
+        return due.timestamp() - self.lead
+
+    def following_due(self, due: float, now: float) -> float:
+        """_summary_ : This Method returns the job's due time following a run due at 'due'.
+
+        The runs stay anchored to their due times, so they don't drift by the time they took to start, and the
+        daily jobs keep their local hour across the daylight saving changes. The runs that would already be past
+        (eg. after the machine slept) are skipped.
+
+        Parameters
+        ----------
+        due : float
+            _description_ : The unix time the last run was due at.
+        now : float
+            _description_ : The current unix time.
+
+        Returns
+        -------
+        float
+            _description_ : The next due unix time, after now.
         """
-        # Checks if mints Arg is provided or not
+        while due <= now:
+            if self.minutes:
+                due += self.minutes * 60
+            else:
+                day = datetime.fromtimestamp(due + self.lead) + timedelta(days=self.days_skipped or 1)
+                due = self.at_time(day).timestamp() - self.lead
+        return due
+
+    def previous_due(self, now: float) -> float:
+        """Returns the time the job was last due at, a period before its next due time."""
         if self.minutes:
-            # If self._minutes is not None, set job to be executed every x minute
-            schedule.every(self.minutes).minutes.do(func)
+            return self.next_due(now) - self.minutes * 60
+        day = datetime.fromtimestamp(self.next_due(now) + self.lead) - timedelta(days=self.days_skipped or 1)
+        return self.at_time(day).timestamp() - self.lead
+
+    def reschedule(self, hour: str = None, minutes: int = None) -> float:
+        """_summary_ : This Method changes the job's schedule at runtime, the scheduler core is woken up right away.
+
+        Parameters
+        ----------
+        hour : str, optional
+            _description_, by default None : Run the job every 'days_skipped' days at this hour ('HH:MM').
+        minutes : int, optional
+            _description_, by default None : Run the job every ?? minutes.
+
+        Returns
+        -------
+        float
+            _description_ : The job's next due unix time.
+
+        Raises
+        ------
+        ValueError
+            _description_ : If neither or both are provided, or the hour isn't a valid 'HH:MM'.
+        """
+        if (hour is None) == (minutes is None):
+            raise ValueError("Provide either an hour or a number of minutes.")
+        if hour is not None:
+            # Validating the hour before changing anything.
+            datetime.strptime(hour, "%H:%M:%S" if hour.count(":") == 2 else "%H:%M")
+            self.hour, self.minutes = hour, None
+            self.days_skipped = self.days_skipped or 1
         else:
-            # If it's None execute the normal schedule for chanel job update
-            schedule.every(self.days_skipped).days.at(self.hour).do(func)
+            if int(minutes) <= 0:
+                raise ValueError("The number of minutes must be positive.")
+            self.minutes = int(minutes)
 
-    @staticmethod
-    def runner() -> None:
-        """This Method checks if there is a pending job jobs every 5 seconds."""
-        # A while loop to keep checking for pending schedule jobs
-        while True:
-            # Running pending schedule jobs
-            schedule.run_pending()
-            # Sleeping for 5 seconds
-            time.sleep(5)
+        self._core.add(self)
+        return self.next_due(time.time())
+
+    @classmethod
+    def _track(cls, run: ScheduledRun) -> None:
+        with cls._active_cond:
+            cls._active.add(run)
+
+    @classmethod
+    def _untrack(cls, run: ScheduledRun) -> None:
+        with cls._active_cond:
+            cls._active.discard(run)
+            cls._active_cond.notify_all()
+
+    @classmethod
+    def drain(cls, deadline: float) -> bool:
+        """_summary_ : This Method waits for the runs in progress to finish, the scheduler cores must be stopped first.
+
+        Parameters
+        ----------
+        deadline : float
+            _description_ : The time.monotonic() time to stop waiting at.
+
+        Returns
+        -------
+        bool
+            _description_ : True if no run is in progress anymore.
+        """
+        with cls._active_cond:
+            return cls._active_cond.wait_for(lambda: not cls._active, timeout=max(0, deadline - time.monotonic()))
+
+    @classmethod
+    def abort(cls, deadline: float) -> bool:
+        """_summary_ : This Method cancels the runs still in progress, and waits for them to stop.
+
+        The cancelled jobs stop their scrapes, and their senders checkpoint the posts they didn't send. A run that
+        doesn't finish is recorded as 'aborted', so it's caught up on the next start.
+
+        Parameters
+        ----------
+        deadline : float
+            _description_ : The time.monotonic() time to stop waiting at.
+
+        Returns
+        -------
+        bool
+            _description_ : True if every run stopped, the worker pool is then shut down.
+        """
+        with cls._active_cond:
+            runs = list(cls._active)
+        for run in runs:
+            print(datetime.now(), f"Aborting the scheduled job {run.name}, it's still running.")
+            run.aborted = True
+            run.cancel()
+
+        if not cls.drain(deadline):
+            return False
+        cls._executor.shutdown(wait=False, cancel_futures=True)
+        return True
+
+    def dispatch(self, due_at: float = None) -> None:
+        """This Method hands a run of the job to the worker pool, unless it already runs 'max_instances' times."""
+        if self._core.stopped:
+            print(datetime.now(), f"Skipping the scheduled job {self.name or self.func}, the bot is shutting down.")
+            return
+        with self._lock:
+            if self._running >= self.max_instances:
+                print(datetime.now(), f"Skipping the scheduled job {self.name or self.func}, it's still running.")
+                return
+            self._running += 1
+        self._executor.submit(self._run, due_at)
+
+    def _run(self, due_at: float = None) -> None:
+        """Runs the job on a worker thread, with its timeout, and stores its last run."""
+        run = ScheduledRun(self.name, due_at)
+        token = _current_run.set(run)
+        self._track(run)
+        timer = None
+        if self.timeout:
+            timer = threading.Timer(self.timeout, self._time_out, args=(run,))
+            timer.daemon = True
+            timer.start()
+
+        # Logging the runs starting late, eg. because the worker pool was busy.
+        if due_at and (late := run.started_at - due_at) > 1:
+            print(datetime.now(), f"The scheduled job {self.name or self.func} started {late:.1f}s late.")
+
+        self._record(run, "running")
+        status = "ok"
+        try:
+            self.func()
+        except Exception as e:
+            status = type(e).__name__
+            print(datetime.now(), f"The scheduled job {self.name or self.func} failed: {e}")
+        finally:
+            if timer:
+                timer.cancel()
+            _current_run.reset(token)
+            with self._lock:
+                self._running -= 1
+            self._record(run, self._final_status(run, status), finished_at=time.time())
+            self._untrack(run)
+
+    def _final_status(self, run: ScheduledRun, status: str) -> str:
+        """Returns the status a run is recorded with, an aborted run that didn't finish or checkpoint its work isn't 'ok'."""
+        if run.aborted and status != "ok":
+            return "checkpointed" if run.checkpointed else "aborted"
+        return "timeout" if run.timed_out else status
+
+    def _time_out(self, run: ScheduledRun) -> None:
+        """Cancels a run lasting longer than the timeout."""
+        print(datetime.now(), f"The scheduled job {self.name or self.func} timed out after {self.timeout}s, cancelling it.")
+        run.timed_out = True
+        self._record(run, "timeout")
+        run.cancel()
+
+    def _record(self, run: ScheduledRun, status: str, finished_at: float = None) -> None:
+        """Stores the job's last run, a failing store must not fail the job."""
+        if not self.name:
+            return
+        try:
+            RecordScheduledRunCommand(
+                name=self.name, status=status, started_at=run.started_at, finished_at=finished_at, due_at=run.due_at
+            ).execute()
+        except Exception as e:
+            print(datetime.now(), f"Recording the scheduled job {self.name} run failed: {e}")
+
+    def missed_run(self, state: dict, now: float = None) -> float:
+        """_summary_ : This Method finds the last run the job missed, while the bot was down or because it crashed.
+
+        Parameters
+        ----------
+        state : dict
+            _description_ : The job's stored state, as returned by RegisterScheduledJobCommand.
+        now : float, optional
+            _description_, by default the current time : The unix time to check at.
+
+        Returns
+        -------
+        float
+            _description_ : The unix time the missed run was due at, None if the job didn't miss a run.
+        """
+        now = now or time.time()
+        # A run still 'running' at startup died with the bot, and an 'aborted' one was stopped by the shutdown,
+        # neither completed.
+        completed = state["last_started"] if state["last_status"] not in ("running", "aborted") else None
+
+        if self.minutes:
+            # The interval jobs are due an interval after their last run, or after their registration.
+            due = (state["last_started"] or state["registered_at"]) + self.minutes * 60
+            if completed is None and state["last_started"]:
+                due = state["last_started"]
+            return due if due <= now else None
+
+        # The daily jobs were last due a period before their next run.
+        due = self.previous_due(now)
+        if due < state["registered_at"] or (completed and completed >= due):
+            return None
+        return due
+
+    def catch_up_missed_run(self) -> None:
+        """This Method registers the job, and runs it right away if it missed a run, according to its catch up policy."""
+        if not self.name:
+            return
+        try:
+            state = RegisterScheduledJobCommand(name=self.name).execute()
+        except Exception as e:
+            print(datetime.now(), f"Registering the scheduled job {self.name} failed: {e}")
+            return
+
+        if (due := self.missed_run(state)) is None:
+            return
+        late = time.time() - due
+        if self.catch_up == "skip" or (self.catch_up_grace is not None and late > self.catch_up_grace):
+            print(datetime.now(), f"Skipping the missed run of {self.name}, due {timedelta(seconds=int(late))} ago.")
+            return
+
+        print(datetime.now(), f"Catching up the missed run of {self.name}, due {timedelta(seconds=int(late))} ago.")
+        self.dispatch()
 
     def run(self) -> None:
-        """This Method runs the scheduler on a new thread."""
-        if not Scheduler._runner_started:
-            # Running the schedule runner on a separate thread
-            t1 = threading.Thread(target=Scheduler.runner)
-            # Starting the thread
-            t1.start()
-            Scheduler._runner_started = True
-        else:
-            print(datetime.now(), "Runner is already running.")
+        """This Method catches up the job's missed run, and schedules it on the scheduler core."""
+        self.catch_up_missed_run()
+        self._core.add(self)
+
+
+class AsyncScheduler(Scheduler):
+    """_summary_ : This class schedules an async job (a coroutine function) like Scheduler, on the async scheduler core.
+
+    The runs are tasks on the event loop instead of worker threads, so they're only bounded by 'max_instances', and
+    a run longer than 'timeout' is really cancelled rather than asked to stop.
+    """
+
+    _core: SchedulerCore = async_scheduler_core
+
+    def dispatch(self, due_at: float = None) -> None:
+        """This Method starts a run of the job on the event loop, unless it already runs 'max_instances' times."""
+        if self._core.stopped:
+            print(datetime.now(), f"Skipping the scheduled job {self.name or self.func}, the bot is shutting down.")
+            return
+        with self._lock:
+            if self._running >= self.max_instances:
+                print(datetime.now(), f"Skipping the scheduled job {self.name or self.func}, it's still running.")
+                return
+            self._running += 1
+        # Dispatching from any thread, eg. the '/schedule <job> now' owner command.
+        asyncio.run_coroutine_threadsafe(self._run_async(due_at), self._core.loop)
+
+    async def _run_async(self, due_at: float = None) -> None:
+        """Runs the job on the event loop, with its timeout, and stores its last run."""
+        run = ScheduledRun(self.name, due_at)
+        # The task runs in its own context, the run doesn't leak to the other tasks.
+        _current_run.set(run)
+        task = asyncio.current_task()
+        self._core.tasks.add(task)
+        self._track(run)
+        # Aborting the run cancels its task, from the shutdown thread.
+        run.on_cancel(lambda: self._core.loop.call_soon_threadsafe(task.cancel))
+        # Logging the runs starting late, eg. because the event loop was blocked.
+        if due_at and (late := run.started_at - due_at) > 1:
+            print(datetime.now(), f"The scheduled job {self.name or self.func} started {late:.1f}s late.")
+
+        await asyncio.to_thread(self._record, run, "running")
+        status = "ok"
+        try:
+            await asyncio.wait_for(self.func(), self.timeout)
+        except asyncio.TimeoutError:
+            print(datetime.now(), f"The scheduled job {self.name or self.func} timed out after {self.timeout}s, it was cancelled.")
+            run.timed_out = True
+        except asyncio.CancelledError:
+            # Cancelled by the shutdown, the run is recorded as aborted.
+            status = "CancelledError"
+        except Exception as e:
+            status = type(e).__name__
+            print(datetime.now(), f"The scheduled job {self.name or self.func} failed: {e}")
+        finally:
+            with self._lock:
+                self._running -= 1
+            await asyncio.to_thread(self._record, run, self._final_status(run, status), time.time())
+            self._untrack(run)
+            self._core.tasks.discard(task)
@@ -0,0 +1,396 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing dataclass and field to create the search task dataclass.
+from dataclasses import dataclass, field
+
+# Importing datetime to log the failed tasks.
+from datetime import datetime
+
+# Importing threading and time to run the searches on their own worker threads.
+import threading
+import time
+
+# Importing uuid to create the tasks ids.
+import uuid
+
+# Importing Counter to count the running searches per chat.
+from collections import Counter
+
+# Importing Any & Callable for type hinting.
+from typing import Any, Callable
+
+
+# The queue lanes in priority order, a lane is only served when the lanes before it have no runnable task.
+## 'scheduled' for the scheduled channel run, 'owner' for the bot owner, 'chat' for everyone else.
+LANES = ("scheduled", "owner", "chat")
+
+
+class SearchRejected(Exception):
+    """Raised by SearchQueue.submit when a search isn't admitted, the message is meant for the user."""
+
+
+@dataclass(slots=True, eq=False)
+class SearchTask:
+    """_summary_ : This data class holds a queued search, and the chat message that reports its progress."""
+
+    # The chat the search was requested in.
+    chat_id: int
+    # The user who requested the search.
+    user_id: int
+    # The message reporting the search progress.
+    message_id: int
+    # The (job title, location) to search for, None for the defaults.
+    search_params: tuple[str, str] = None
+    # Any data the runner needs, eg. the bot instance.
+    context: dict[str, Any] = field(default_factory=dict)
+    # The queue lane, one of LANES.
+    lane: str = "chat"
+    # The function running this task, instead of the queue's runner.
+    runner: Callable[["SearchTask"], None] = None
+    # The task id, used by the cancel button.
+    task_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    # 'queued' | 'running' | 'done' | 'cancelled' | 'expired'.
+    status: str = "queued"
+    # The progress of the scrape the task waits for, once joined.
+    progress: Any = None
+    # Set once the task was cancelled.
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    # Set once the task finished, was cancelled or expired.
+    finished: threading.Event = field(default_factory=threading.Event)
+    # The time the task was queued at.
+    queued_at: float = 0.0
+    # The fair queuing virtual (start, finish) tags.
+    tags: tuple[float, float] = (0.0, 0.0)
+    # Held while the message is edited with the progress, and to finalize the task.
+    message_lock: threading.Lock = field(default_factory=threading.Lock)
+    # Set once the message is about to show the task's outcome, the progress isn't reported anymore.
+    finalized: bool = False
+
+    def finalize(self) -> None:
+        """Stops the progress reports, waiting for the one being edited in, so none overwrites the task's outcome."""
+        with self.message_lock:
+            self.finalized = True
+
+
+class SearchQueue:
+    """_summary_ : This class runs the searches on a dedicated worker pool, so they don't block the bot's handler threads.
+
+    - The lanes are served in priority order, and 'reserved_workers' workers are kept for the priority lanes.
+    - The 'chat' lane shares the workers between chats with start-time fair queuing: a chat queueing many searches
+      only gets its weighted share, and each chat runs at most 'max_running_per_chat' searches at once.
+    - Searches beyond 'max_queued_per_chat' or 'max_queued' are rejected right away, and queued searches waiting
+      longer than 'max_wait' seconds expire, so the waiting time stays bounded under load.
+    - A reporter thread calls the reporter function for every running task each 'report_interval' seconds,
+      to update the task's progress message.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[SearchTask], None],
+        reporter: Callable[[SearchTask], None] = None,
+        expirer: Callable[[SearchTask], None] = None,
+        workers: int = 3,
+        reserved_workers: int = 1,
+        max_running_per_chat: int = 1,
+        max_queued_per_chat: int = 2,
+        max_queued: int = 20,
+        max_wait: int = 600,
+        chat_weights: dict[int, float] = None,
+        report_interval: int = 5,
+    ) -> None:
+        """_summary_ : This method initiates the search queue, the threads are started with the first task.
+
+        Parameters
+        ----------
+        runner : Callable[[SearchTask], None]
+            _description_ : The function running a search task.
+        reporter : Callable[[SearchTask], None], optional
+            _description_, by default None : The function reporting a running task's progress.
+        expirer : Callable[[SearchTask], None], optional
+            _description_, by default None : The function notifying a task expired in the queue.
+        workers : int, optional
+            _description_, by default 3 : The number of searches running at the same time.
+        reserved_workers : int, optional
+            _description_, by default 1 : The number of workers the 'chat' lane can't use.
+        max_running_per_chat : int, optional
+            _description_, by default 1 : The number of 'chat' lane searches a chat can run at the same time.
+        max_queued_per_chat : int, optional
+            _description_, by default 2 : The number of 'chat' lane searches a chat can have waiting.
+        max_queued : int, optional
+            _description_, by default 20 : The number of searches that can wait in the 'chat' & 'owner' lanes.
+        max_wait : int, optional
+            _description_, by default 600 : The number of seconds a 'chat' lane search can wait before expiring.
+        chat_weights : dict[int, float], optional
+            _description_, by default None : Dict[chat id: weight], the chats share of the workers, 1 by default.
+        report_interval : int, optional
+            _description_, by default 5 : The number of seconds between two progress reports.
+        """
+        self.runner = runner
+        self.reporter = reporter
+        self.expirer = expirer
+        self.workers = workers
+        self.reserved_workers = max(0, min(reserved_workers, workers - 1))
+        self.max_running_per_chat = max_running_per_chat
+        self.max_queued_per_chat = max_queued_per_chat
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        self.chat_weights = chat_weights or {}
+        self.report_interval = report_interval
+
+        self._cond = threading.Condition()
+        # Dict[lane: queued tasks].
+        self._queued: dict[str, list[SearchTask]] = {lane: [] for lane in LANES}
+        # Dict[task id: task], the queued and running tasks.
+        self._tasks: dict[str, SearchTask] = {}
+        # The running 'chat' lane searches, in total and per chat.
+        self._running_chats = 0
+        self._running_per_chat: Counter = Counter()
+        # The fair queuing virtual time, and each chat's last finish tag.
+        self._virtual_time = 0.0
+        self._last_finish: dict[int, float] = {}
+        self._started = False
+        # Set by close(), the new searches are rejected.
+        self._closed = False
+
+    def _start(self) -> None:
+        """Starts the worker threads and the reporter thread, must be called with the lock held."""
+        for number in range(self.workers):
+            threading.Thread(target=self._work, name=f"search-worker-{number}", daemon=True).start()
+        threading.Thread(target=self._report, name="search-reporter", daemon=True).start()
+        self._started = True
+
+    def submit(self, task: SearchTask) -> int:
+        """_summary_ : This method queues a search task, if admitted.
+
+        Parameters
+        ----------
+        task : SearchTask
+            _description_ : The task to queue.
+
+        Returns
+        -------
+        int
+            _description_ : The number of tasks queued ahead of this one.
+
+        Raises
+        ------
+        SearchRejected
+            _description_ : If the chat or the queue is full, or the queue is closed, the message explains why.
+        """
+        with self._cond:
+            if self._closed:
+                raise SearchRejected("The bot is restarting, please try again in a minute.")
+
+            if task.lane == "chat":
+                chat_queued = sum(queued.chat_id == task.chat_id for queued in self._queued["chat"])
+                if chat_queued >= self.max_queued_per_chat:
+                    raise SearchRejected(
+                        f"This chat already has {chat_queued} searches waiting, please try again once they finish."
+                    )
+
+            if task.lane != "scheduled":
+                if len(self._queued["chat"]) + len(self._queued["owner"]) >= self.max_queued:
+                    raise SearchRejected(
+                        "The bot is busy with other searches right now, please try again in a few minutes."
+                    )
+
+            # Tagging the task, a chat's tasks are spaced by the inverse of its weight in virtual time.
+            start = max(self._virtual_time, self._last_finish.get(task.chat_id, 0.0))
+            finish = start + 1 / self.chat_weights.get(task.chat_id, 1)
+            self._last_finish[task.chat_id] = finish
+            task.tags = (start, finish)
+            task.queued_at = time.monotonic()
+
+            # Counting the tasks queued in this lane and the lanes before it.
+            ahead = sum(len(self._queued[lane]) for lane in LANES[: LANES.index(task.lane) + 1])
+            self._queued[task.lane].append(task)
+            self._tasks[task.task_id] = task
+
+            if not self._started:
+                self._start()
+            self._cond.notify_all()
+        return ahead
+
+    def pending(self) -> int:
+        """Returns the number of queued and running tasks."""
+        with self._cond:
+            return len(self._tasks)
+
+    def get(self, task_id: str) -> SearchTask:
+        """Returns the queued or running task with the given id, None if it finished."""
+        with self._cond:
+            return self._tasks.get(task_id)
+
+    def cancel(self, task_id: str) -> bool:
+        """_summary_ : This method cancels a queued or running task.
+
+        Parameters
+        ----------
+        task_id : str
+            _description_ : The id of the task to cancel.
+
+        Returns
+        -------
+        bool
+            _description_ : True if the task was cancelled, False if it already finished.
+        """
+        with self._cond:
+            task = self._tasks.get(task_id)
+            if task is None or task.cancelled.is_set():
+                return False
+            task.cancelled.set()
+            # Dropping the task right away if it didn't start.
+            if task.status == "queued":
+                self._queued[task.lane].remove(task)
+                self._tasks.pop(task_id)
+                task.finished.set()
+                self._cond.notify_all()
+            # Stopping the scrape if no other search waits for it.
+            elif task.progress is not None:
+                task.progress.cancel()
+            task.status = "cancelled"
+            return True
+
+    def close(self) -> None:
+        """This method rejects the new searches, the queued and running ones still run."""
+        with self._cond:
+            self._closed = True
+
+    def drain(self, deadline: float) -> bool:
+        """_summary_ : This method waits for the queued and running searches to finish, the queue must be closed first.
+
+        Parameters
+        ----------
+        deadline : float
+            _description_ : The time.monotonic() time to stop waiting at.
+
+        Returns
+        -------
+        bool
+            _description_ : True if no search is left.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._tasks, timeout=max(0, deadline - time.monotonic()))
+
+    def abort(self, deadline: float) -> bool:
+        """_summary_ : This method cancels the searches left, and waits for the running ones to stop.
+
+        Parameters
+        ----------
+        deadline : float
+            _description_ : The time.monotonic() time to stop waiting at.
+
+        Returns
+        -------
+        bool
+            _description_ : True if no search is left.
+        """
+        with self._cond:
+            task_ids = list(self._tasks)
+        for task_id in task_ids:
+            self.cancel(task_id)
+        return self.drain(deadline)
+
+    def join_progress(self, task: SearchTask, progress: Any) -> None:
+        """_summary_ : This method attaches a task to the progress of the scrape it waits for.
+
+        Parameters
+        ----------
+        task : SearchTask
+            _description_ : The running task.
+        progress : Any
+            _description_ : The scrape's progress, a task cancelled before joining cancels its part right away.
+        """
+        with self._cond:
+            task.progress = progress
+            if task.cancelled.is_set():
+                progress.cancel()
+
+    def _runnable(self, task: SearchTask) -> bool:
+        """Checks if a 'chat' lane task can start, must be called with the lock held."""
+        return (
+            self._running_chats < self.workers - self.reserved_workers
+            and self._running_per_chat[task.chat_id] < self.max_running_per_chat
+        )
+
+    def _take(self) -> SearchTask:
+        """Takes the next task to run, None if no task is runnable, must be called with the lock held."""
+        for lane in LANES:
+            queued = self._queued[lane]
+            if lane == "chat":
+                queued = [task for task in queued if self._runnable(task)]
+            if not queued:
+                continue
+
+            # Taking the task with the smallest finish tag, min keeps the queuing order on ties.
+            task = min(queued, key=lambda task: task.tags[1])
+            self._queued[lane].remove(task)
+
+            if lane == "chat":
+                self._running_chats += 1
+                self._running_per_chat[task.chat_id] += 1
+                # Advancing the virtual time to the start tag of the task in service.
+                self._virtual_time = max(self._virtual_time, task.tags[0])
+
+            task.status = "running"
+            return task
+        return None
+
+    def _work(self) -> None:
+        """Runs the queued tasks, one at a time."""
+        while True:
+            with self._cond:
+                while (task := self._take()) is None:
+                    self._cond.wait()
+
+            try:
+                (task.runner or self.runner)(task)
+            except Exception as e:
+                print(datetime.now(), f"Search task {task.task_id} failed: {e}")
+            finally:
+                with self._cond:
+                    if not task.cancelled.is_set():
+                        task.status = "done"
+                    if task.lane == "chat":
+                        self._running_chats -= 1
+                        self._running_per_chat[task.chat_id] -= 1
+                    self._tasks.pop(task.task_id, None)
+                    # Waking up the workers, a chat's next task may be runnable now.
+                    self._cond.notify_all()
+                task.finished.set()
+
+    def _expire(self) -> list[SearchTask]:
+        """Drops the 'chat' lane tasks queued for longer than max_wait, and returns them."""
+        deadline = time.monotonic() - self.max_wait
+        with self._cond:
+            expired = [task for task in self._queued["chat"] if task.queued_at < deadline]
+            for task in expired:
+                self._queued["chat"].remove(task)
+                self._tasks.pop(task.task_id)
+                task.status = "expired"
+                task.finished.set()
+            if expired:
+                self._cond.notify_all()
+        return expired
+
+    def _report(self) -> None:
+        """Reports the running tasks progress, and expires the tasks waiting too long, every report_interval seconds."""
+        while True:
+            time.sleep(self.report_interval)
+
+            for task in self._expire():
+                if self.expirer:
+                    try:
+                        self.expirer(task)
+                    except Exception as e:
+                        print(datetime.now(), f"Expiring search task {task.task_id} failed: {e}")
+
+            if not self.reporter:
+                continue
+            with self._cond:
+                running = [task for task in self._tasks.values() if task.status == "running"]
+            for task in running:
+                try:
+                    self.reporter(task)
+                except Exception as e:
+                    print(datetime.now(), f"Reporting search task {task.task_id} failed: {e}")
@@ -0,0 +1,188 @@
+# ----- IMPORTING REQUIRED MODULES ----- #
+
+# Importing hmac to compare the secret tokens in constant time.
+import hmac
+
+# Importing json to parse the posted updates.
+import json
+
+# Importing queue to hand the updates to the workers through a bounded queue.
+import queue
+
+# Importing threading and time to run the HTTP server and the workers on their own threads, and drain them.
+import threading
+import time
+
+# Importing datetime to log the failing updates.
+from datetime import datetime
+
+# Importing the threading HTTP server to receive the updates.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Importing TeleBot for Type hinting.
+from telebot import TeleBot
+
+# Importing telegram API Update object to parse the posted updates.
+from telebot.types import Update
+
+
+class WebhookServer:
+    """_summary_ : This class receives the telegram updates over HTTP, and hands them to the bot's handlers.
+
+    Each POST to the webhook path must carry the secret token in the 'X-Telegram-Bot-Api-Secret-Token' header.
+    The request is answered as soon as the update is queued, and the workers pass the queued updates to
+    bot.process_new_updates. A full queue answers 503, so telegram retries the update later instead of the
+    server buffering without bound.
+
+    Example
+    -------
+        >>> curl -X POST localhost:8443/webhook -H 'X-Telegram-Bot-Api-Secret-Token: <secret>' -d @update.json
+    """
+
+    def __init__(
+        self,
+        bot: TeleBot,
+        secret_token: str,
+        host: str = "0.0.0.0",
+        port: int = 8443,
+        path: str = "/webhook",
+        queue_size: int = 1000,
+        workers: int = 1,
+    ) -> None:
+        """_summary_ : This method creates the server, it's started by start().
+
+        Parameters
+        ----------
+        bot : TeleBot
+            _description_ : bot instance, its handlers process the updates.
+        secret_token : str
+            _description_ : The secret token set with the webhook, the requests without it are refused.
+        host : str, optional
+            _description_, by default '0.0.0.0' : The address to listen on.
+        port : int, optional
+            _description_, by default 8443 : The port to listen on.
+        path : str, optional
+            _description_, by default '/webhook' : The path the updates are posted to.
+        queue_size : int, optional
+            _description_, by default 1000 : The maximum number of updates waiting for a worker.
+        workers : int, optional
+            _description_, by default 1 : The number of threads passing the updates to the bot.
+
+        Raises
+        ------
+        ValueError
+            _description_ : If the secret token is empty.
+        """
+        if not secret_token:
+            raise ValueError("The webhook mode needs a WEBHOOK_SECRET.")
+
+        self.bot = bot
+        self.secret_token = secret_token
+        self.path = path
+        self.workers = workers
+        self.updates: queue.Queue[Update] = queue.Queue(maxsize=queue_size)
+        # Dict[counter name: count].
+        self.stats = {"received": 0, "refused": 0, "dropped": 0, "processed": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._request_handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """The (host, port) the server listens on, the port is chosen by the system when created with 0."""
+        return self._httpd.server_address[:2]
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.stats[counter] += 1
+
+    def _request_handler(self) -> type[BaseHTTPRequestHandler]:
+        """Returns the request handler class bound to this server."""
+        server = self
+
+        class UpdateHandler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                if self.path != server.path:
+                    self.send_error(404)
+                    return
+
+                token = self.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+                if not hmac.compare_digest(token.encode(), server.secret_token.encode()):
+                    server._count("refused")
+                    self.send_error(403)
+                    return
+
+                try:
+                    body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                    update = Update.de_json(json.loads(body))
+                except (ValueError, KeyError, TypeError):
+                    self.send_error(400)
+                    return
+
+                try:
+                    server.updates.put_nowait(update)
+                except queue.Full:
+                    # Telegram retries the refused updates, the workers catch up meanwhile.
+                    server._count("dropped")
+                    self.send_error(503)
+                    return
+
+                server._count("received")
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args) -> None:
+                # Not logging every update, the failures are logged by the workers.
+                pass
+
+        return UpdateHandler
+
+    def _work(self) -> None:
+        """Passes the queued updates to the bot, a failing update doesn't stop the worker."""
+        while True:
+            update = self.updates.get()
+            try:
+                self.bot.process_new_updates([update])
+                self._count("processed")
+            except Exception as e:
+                self._count("failed")
+                print(datetime.now(), f"Processing the webhook update {update.update_id} failed: {e}")
+            finally:
+                self.updates.task_done()
+
+    def start(self) -> None:
+        """This method starts the workers and the HTTP server, each on its own daemon thread."""
+        for index in range(self.workers):
+            threading.Thread(target=self._work, name=f"webhook-worker-{index}", daemon=True).start()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="webhook-server", daemon=True)
+        self._thread.start()
+        print(datetime.now(), f"Receiving the updates on http://{self.address[0]}:{self.address[1]}{self.path}")
+
+    def wait(self) -> None:
+        """This method blocks until the HTTP server is stopped."""
+        self._thread.join()
+
+    def drain(self, deadline: float) -> bool:
+        """_summary_ : This method waits for the workers to process the queued updates, the server must be stopped first.
+
+        Parameters
+        ----------
+        deadline : float
+            _description_ : The time.monotonic() time to stop waiting at.
+
+        Returns
+        -------
+        bool
+            _description_ : True if every received update was processed.
+        """
+        with self.updates.all_tasks_done:
+            return self.updates.all_tasks_done.wait_for(
+                lambda: not self.updates.unfinished_tasks, timeout=max(0, deadline - time.monotonic())
+            )
+
+    def stop(self) -> None:
+        """This method stops the HTTP server, the queued updates are still processed by the workers."""
+        self._httpd.shutdown()
+        self._httpd.server_close()